@@ -0,0 +1 @@
+"""Shared asset tooling for ModelIt Mystery (image generation, analysis, validation)."""
@@ -0,0 +1,319 @@
+"""Concurrent vision analysis of scene images.
+
+Each completed analysis is appended to a JSONL checkpoint before the next
+one finishes, and images whose SHA-256 already appears in
+``scene_analysis.json`` (or the checkpoint) are skipped, so an interrupted
+run only pays for the images it had not reached. The OpenAI client is passed
+in, so anything exposing ``client.responses.create(...)`` returning an object
+with ``output_text`` (and optionally ``usage``) works; when the client also
+has ``responses.with_raw_response``, its status code and retry count go into
+the telemetry.
+Images are downscaled by :mod:`modelit_assets.preprocess` before upload
+unless the caller opts out.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .files import atomic_write_bytes
+from .hashing import sha256_file
+from .paths import IMAGES_DIR
+from .preprocess import PreparedImage, PreprocessOptions, prepare_image
+from .telemetry import Recorder
+
+ANALYSIS_FILE = IMAGES_DIR / "scene_analysis.json"
+CHECKPOINT_FILE = IMAGES_DIR / "scene_analysis.checkpoint.jsonl"
+MODEL = "gpt-4.1-mini"
+
+PROMPT = """You are reviewing concept art frames for an educational science story about Dr. Maya.
+Describe the main character, the scene setting, and overall mood in 2-3 sentences.
+Note any visual elements that support the story's biotech theme.
+Mention if the character appears consistent with a friendly Black female scientist in a white lab coat with teal shirt and curly bun hairstyle.
+Flag any inconsistencies or anything that feels off for a middle school audience."""
+# Flag terms and the whole words that count as each; "off" no longer
+# matches "offers" or "coffee". A term joined to another word by a hyphen
+# ("off-white", "cut-off") is a different word, except for the compounds that
+# name the problem itself ("off-model").
+FLAG_WORDS = ("inconsist", "deviation", "off")
+FLAG_PATTERNS = {
+    "inconsist": re.compile(r"(?<![\w-])inconsisten(?:t|cy|cies)(?![\w-])", re.IGNORECASE),
+    "deviation": re.compile(r"(?<![\w-])deviat(?:e|es|ed|ing|ion|ions)(?![\w-])", re.IGNORECASE),
+    "off": re.compile(r"(?<![\w-])off(?:-(?:model|brand|character|putting))?(?![\w-])", re.IGNORECASE),
+}
+# Clauses end at sentence punctuation and at contrastive conjunctions
+# ("..., but the hair is loose").
+_CLAUSE_BREAK = re.compile(r"(?<!\bDr)(?<!\bMs)\.|[;:!?]|\b(?:but|though|although|however|except|while)\b", re.IGNORECASE)
+# A term is not a finding when a negator governs it: "There are no
+# inconsistencies or elements that feel off". The negator must be within
+# NEGATION_WINDOW words before the term with no comma or new clause between,
+# so "The hair is not in a bun, which feels off" is still a finding.
+_NEGATION = re.compile(r"\b(?:no|not|nothing|none|never|without|neither|nor)\b|n't\b", re.IGNORECASE)
+_NEGATION_SCOPE = re.compile(r",|\b(?:which|because|since|and it)\b", re.IGNORECASE)
+NEGATION_WINDOW = 8
+# Words the analysis quotes or writes in capitals name on-screen labels, like
+# the glowing "ON" and "OFF" indicators, rather than describe the art.
+_QUOTES = "\"'\u2018\u2019\u201c\u201d"
+
+
+def _is_label(text: str, start: int, end: int) -> bool:
+    quoted = 0 < start and end < len(text) and text[start - 1] in _QUOTES and text[end] in _QUOTES
+    return quoted or text[start:end].isupper()
+
+
+def _negated(before: str) -> bool:
+    """Whether a negator governs the term that follows ``before`` (the clause up to it)."""
+    scopes = _NEGATION_SCOPE.split(before)
+    words = scopes[-1].split()[-NEGATION_WINDOW:]
+    return bool(_NEGATION.search(" ".join(words)))
+
+
+def flag_hits(analysis: str) -> list[tuple[str, str]]:
+    """``(term, clause)`` for every flag term the analysis actually asserts."""
+    breaks = [m.end() for m in _CLAUSE_BREAK.finditer(analysis)]
+    hits = []
+    for term, pattern in FLAG_PATTERNS.items():
+        for found in pattern.finditer(analysis):
+            if _is_label(analysis, found.start(), found.end()):
+                continue
+            start = max((end for end in breaks if end <= found.start()), default=0)
+            if _negated(analysis[start : found.start()]):
+                continue
+            stop = next((m.start() for m in _CLAUSE_BREAK.finditer(analysis, found.end())), len(analysis))
+            hits.append((term, " ".join(analysis[start:stop].split()).strip(",")))
+    return hits
+
+
+def flag_terms(analysis: str) -> list[str]:
+    """The :data:`FLAG_WORDS` the analysis asserts, in that order."""
+    found = {term for term, _ in flag_hits(analysis)}
+    return [word for word in FLAG_WORDS if word in found]
+
+
+def analysis_entry(image: str, digest: str, analysis: str) -> dict:
+    """A ``scene_analysis.json`` entry stamped with the current UTC time."""
+    analyzed_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    return {"image": image, "sha256": digest, "analysis": analysis, "analyzed_at": analyzed_at}
+
+
+def request_input(prepared: PreparedImage) -> list[dict]:
+    """The Responses API ``input`` for one image, shared by live and batch requests."""
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "input_text", "text": PROMPT},
+                {"type": "input_image", "image_url": prepared.data_url},
+            ],
+        }
+    ]
+
+
+def analyze_image(
+    client,
+    image_path: Path,
+    digest: str | None = None,
+    model: str = MODEL,
+    prepared: PreparedImage | None = None,
+    telemetry: Recorder | None = None,
+    queued: float = 0.0,
+) -> dict:
+    digest = digest or sha256_file(image_path)
+    prepared = prepared or prepare_image(image_path)
+    sent = time.perf_counter()
+    raw_api = getattr(client.responses, "with_raw_response", None)
+    try:
+        if raw_api is not None:
+            raw = raw_api.create(model=model, input=request_input(prepared))
+            response = raw.parse()
+        else:
+            raw = None
+            response = client.responses.create(model=model, input=request_input(prepared))
+    except Exception as exc:
+        if telemetry:
+            telemetry.record(
+                "analysis",
+                image_path.name,
+                status=getattr(exc, "status_code", None),
+                queue_wait=queued,
+                duration=time.perf_counter() - sent,
+                bytes_sent=len(prepared.data),
+                error=f"{type(exc).__name__}: {exc}",
+            )
+        raise
+    if telemetry:
+        # The client retries internally; the final attempt's number and the
+        # total wall time including those retries are what we can observe.
+        usage = getattr(response, "usage", None)
+        telemetry.record(
+            "analysis",
+            image_path.name,
+            attempt=raw.retries_taken + 1 if raw else 1,
+            status=raw.status_code if raw else 200,
+            queue_wait=queued,
+            duration=time.perf_counter() - sent,
+            bytes_sent=len(prepared.data),
+            bytes_received=len(raw.content) if raw else 0,
+            input_tokens=usage.input_tokens if usage else None,
+            output_tokens=usage.output_tokens if usage else None,
+        )
+
+    return analysis_entry(image_path.name, digest, response.output_text.strip())
+
+
+def load_results(analysis_file: Path = ANALYSIS_FILE, checkpoint_file: Path = CHECKPOINT_FILE) -> dict:
+    """Return ``{image name: entry}`` from the summary file overlaid with the checkpoint."""
+    results = {}
+    if analysis_file.exists():
+        for entry in json.loads(analysis_file.read_text(encoding="utf-8")):
+            results[entry["image"]] = entry
+    if checkpoint_file.exists():
+        with open(checkpoint_file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves at most one partial trailing line.
+                    continue
+                results[entry["image"]] = entry
+    return results
+
+
+def save_results(results: dict, analysis_file: Path = ANALYSIS_FILE) -> None:
+    entries = [results[name] for name in sorted(results)]
+    analysis_file.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(analysis_file, json.dumps(entries, indent=2).encode("utf-8"))
+
+
+class Checkpoint:
+    """Append-only JSONL log; every entry is flushed and fsync'd as it lands."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, entry: dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+
+@dataclass
+class ImageOutcome:
+    entry: dict | None
+    error: Exception | None = None
+    source_bytes: int = 0
+    sent_bytes: int = 0
+
+
+@dataclass
+class AnalysisRun:
+    analyzed: list[dict] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    source_bytes: int = 0
+    sent_bytes: int = 0
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.source_bytes - self.sent_bytes
+
+
+def _analyze(
+    client,
+    path: Path,
+    digest: str,
+    options: PreprocessOptions | None,
+    telemetry: Recorder | None = None,
+    queued_at: float | None = None,
+) -> ImageOutcome:
+    queued = time.perf_counter() - queued_at if queued_at is not None else 0.0
+    prepared = prepare_image(path, options, digest=digest)
+    entry = analyze_image(client, path, digest, prepared=prepared, telemetry=telemetry, queued=queued)
+    return ImageOutcome(entry, None, prepared.source_bytes, len(prepared.data))
+
+
+def select_pending(
+    image_paths: Iterable[Path], results: dict, *, force: bool = False, adopt_unhashed: bool = False
+) -> tuple[list[tuple[Path, str]], list[str], bool]:
+    """Split images into ``(path, digest)`` pairs to analyze and names already current.
+
+    The third value says whether ``results`` was changed by ``adopt_unhashed``.
+    """
+    pending, skipped = [], []
+    adopted = False
+    for path in image_paths:
+        digest = sha256_file(path)
+        entry = results.get(path.name)
+        if entry is not None and adopt_unhashed and "sha256" not in entry:
+            entry["sha256"] = digest
+            adopted = True
+        if not force and entry is not None and entry.get("sha256") == digest:
+            skipped.append(path.name)
+        else:
+            pending.append((path, digest))
+    return pending, skipped, adopted
+
+
+def run_analysis(
+    client,
+    image_paths: Iterable[Path],
+    *,
+    workers: int = 4,
+    preprocess: PreprocessOptions | None = PreprocessOptions(),
+    force: bool = False,
+    adopt_unhashed: bool = False,
+    analysis_file: Path = ANALYSIS_FILE,
+    checkpoint_file: Path = CHECKPOINT_FILE,
+    on_result: Callable[[Path, ImageOutcome], None] | None = None,
+    telemetry: Recorder | None = None,
+) -> AnalysisRun:
+    """Analyze every image whose content hash has no stored result.
+
+    Results are checkpointed one by one and merged into ``analysis_file`` at
+    the end; the checkpoint is removed once the merge succeeds. With
+    ``adopt_unhashed``, entries written before hashes were recorded are
+    stamped with the image's current hash instead of being re-analyzed.
+    ``preprocess=None`` uploads the original PNGs.
+    """
+    results = load_results(analysis_file, checkpoint_file)
+    run = AnalysisRun()
+    pending, run.skipped, adopted = select_pending(image_paths, results, force=force, adopt_unhashed=adopt_unhashed)
+
+    checkpoint = Checkpoint(checkpoint_file)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_analyze, client, path, digest, preprocess, telemetry, time.perf_counter()): path
+                for path, digest in pending
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as exc:
+                    run.failed[path.name] = str(exc)
+                    if on_result:
+                        on_result(path, ImageOutcome(None, exc))
+                    continue
+                checkpoint.append(outcome.entry)
+                results[path.name] = outcome.entry
+                run.analyzed.append(outcome.entry)
+                run.source_bytes += outcome.source_bytes
+                run.sent_bytes += outcome.sent_bytes
+                if on_result:
+                    on_result(path, outcome)
+    finally:
+        if run.analyzed or adopted or checkpoint_file.exists():
+            save_results(results, analysis_file)
+            checkpoint_file.unlink(missing_ok=True)
+    return run
@@ -0,0 +1,296 @@
+"""Bulk vision analysis through the OpenAI Batch API.
+
+A full-library sweep does not need answers within seconds, and batch
+requests cost half the interactive price. :func:`run_batch`:
+
+1. selects the images whose hash has no stored result, as
+   :func:`~modelit_assets.analysis.run_analysis` does;
+2. writes one ``/v1/responses`` request per image to a JSONL job file under
+   ``.cache/analysis-batches/``, with ``custom_id`` set to
+   ``<image>:<hash prefix>``;
+3. uploads the file, creates the batch and polls it with a growing interval;
+4. merges the output into ``images/scene_analysis.json`` by ``custom_id``.
+
+The job ID and request map are saved to ``.cache/analysis-batches/current.json``
+as soon as they exist. A killed process therefore picks up the same job on
+the next run instead of paying for a second one, and ``detach=True``
+submits and returns without waiting.
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .analysis import (
+    ANALYSIS_FILE,
+    CHECKPOINT_FILE,
+    MODEL,
+    analysis_entry,
+    load_results,
+    request_input,
+    save_results,
+    select_pending,
+)
+from .files import atomic_write_bytes
+from .paths import CACHE_DIR
+from .preprocess import PreprocessOptions, prepare_image
+from .telemetry import Recorder
+
+BATCH_DIR = CACHE_DIR / "analysis-batches"
+STATE_FILE = BATCH_DIR / "current.json"
+ENDPOINT = "/v1/responses"
+COMPLETION_WINDOW = "24h"
+# The Batch API rejects input files above 200 MB.
+MAX_JOB_BYTES = 200 * 1024**2
+TERMINAL = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchError(Exception):
+    pass
+
+
+def custom_id(name: str, digest: str) -> str:
+    return f"{name}:{digest[:16]}"
+
+
+def load_state(path: Path = STATE_FILE) -> dict | None:
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return None
+
+
+def save_state(state: dict, path: Path = STATE_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(path, json.dumps(state, indent=2).encode("utf-8"))
+
+
+def write_job_file(
+    pending: list[tuple[Path, str]],
+    job_file: Path,
+    *,
+    model: str = MODEL,
+    preprocess: PreprocessOptions | None = PreprocessOptions(),
+) -> dict[str, dict]:
+    """Write one Batch API request line per image; return ``{custom_id: {image, sha256}}``."""
+    requests = {}
+    lines = []
+    for path, digest in pending:
+        prepared = prepare_image(path, preprocess, digest=digest)
+        request_id = custom_id(path.name, digest)
+        requests[request_id] = {"image": path.name, "sha256": digest}
+        line = {
+            "custom_id": request_id,
+            "method": "POST",
+            "url": ENDPOINT,
+            "body": {"model": model, "input": request_input(prepared)},
+        }
+        lines.append(json.dumps(line, separators=(",", ":")))
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    if len(data) > MAX_JOB_BYTES:
+        raise BatchError(
+            f"Job file would be {len(data) / 1024**2:.0f} MB, over the {MAX_JOB_BYTES // 1024**2} MB limit; "
+            "lower --max-edge or analyze fewer images."
+        )
+    job_file.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(job_file, data)
+    return requests
+
+
+def submit(client, state: dict, state_file: Path = STATE_FILE):
+    """Upload the job file and create the batch, saving progress after each step."""
+    if not state.get("input_file_id"):
+        with open(state["job_file"], "rb") as f:
+            uploaded = client.files.create(file=f, purpose="batch")
+        state["input_file_id"] = uploaded.id
+        save_state(state, state_file)
+    batch = client.batches.create(
+        input_file_id=state["input_file_id"],
+        endpoint=ENDPOINT,
+        completion_window=COMPLETION_WINDOW,
+        metadata={"purpose": "scene-analysis"},
+    )
+    state["batch_id"] = batch.id
+    save_state(state, state_file)
+    return batch
+
+
+def poll(
+    client,
+    batch_id: str,
+    *,
+    interval: float = 10.0,
+    max_interval: float = 300.0,
+    timeout: float | None = None,
+    on_status: Callable[[object], None] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+):
+    """Retrieve the batch until it reaches a terminal status.
+
+    The interval grows by half each time, up to ``max_interval``. It resets
+    whenever the completed count moves, so a batch that is making progress
+    is not polled less and less often. Raises :class:`TimeoutError` after
+    ``timeout`` seconds, leaving the saved state in place for a later resume.
+    """
+    started = time.monotonic()
+    delay = interval
+    completed = None
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if on_status:
+            on_status(batch)
+        if batch.status in TERMINAL:
+            return batch
+        counts = batch.request_counts
+        done = counts.completed + counts.failed if counts else None
+        delay = interval if done != completed else min(max_interval, delay * 1.5)
+        completed = done
+        if timeout is not None and time.monotonic() - started + delay > timeout:
+            raise TimeoutError(f"batch {batch_id} still {batch.status} after {timeout:.0f}s")
+        sleep(delay)
+
+
+def output_text(body: dict) -> str:
+    """``Response.output_text`` for a raw JSON response body."""
+    return "".join(
+        part.get("text", "")
+        for item in body.get("output", [])
+        if item.get("type") == "message"
+        for part in item.get("content", [])
+        if part.get("type") == "output_text"
+    )
+
+
+def _file_lines(client, file_id: str | None) -> list[dict]:
+    if not file_id:
+        return []
+    text = client.files.content(file_id).text
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+@dataclass
+class BatchRun:
+    batch_id: str | None = None
+    status: str | None = None
+    analyzed: list[dict] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    resumed: bool = False
+    detached: bool = False
+
+
+def merge(
+    client,
+    batch,
+    state: dict,
+    run: BatchRun,
+    *,
+    analysis_file: Path = ANALYSIS_FILE,
+    checkpoint_file: Path = CHECKPOINT_FILE,
+    telemetry: Recorder | None = None,
+) -> None:
+    """Fold the batch's output and error files into ``analysis_file`` by ``custom_id``."""
+    requests = state["requests"]
+    results = load_results(analysis_file, checkpoint_file)
+    seen = set()
+    for line in _file_lines(client, batch.output_file_id) + _file_lines(client, batch.error_file_id):
+        request = requests.get(line.get("custom_id"))
+        if request is None:
+            continue
+        seen.add(line["custom_id"])
+        response = line.get("response") or {}
+        body = response.get("body") or {}
+        status = response.get("status_code")
+        error = line.get("error") or (body.get("error") if status != 200 else None)
+        if telemetry:
+            usage = body.get("usage") or {}
+            telemetry.record(
+                "analysis",
+                request["image"],
+                status=status,
+                input_tokens=usage.get("input_tokens"),
+                output_tokens=usage.get("output_tokens"),
+                error=json.dumps(error) if error else "",
+            )
+        if error or status != 200:
+            message = error.get("message") if isinstance(error, dict) else error
+            run.failed[request["image"]] = f"HTTP {status}: {message or 'no response'}"
+            continue
+        entry = analysis_entry(request["image"], request["sha256"], output_text(body).strip())
+        results[request["image"]] = entry
+        run.analyzed.append(entry)
+    for request_id, request in requests.items():
+        if request_id not in seen:
+            run.failed[request["image"]] = f"no result (batch {batch.status})"
+    if run.analyzed or checkpoint_file.exists():
+        save_results(results, analysis_file)
+        checkpoint_file.unlink(missing_ok=True)
+
+
+def run_batch(
+    client,
+    image_paths: Iterable[Path],
+    *,
+    model: str = MODEL,
+    preprocess: PreprocessOptions | None = PreprocessOptions(),
+    force: bool = False,
+    adopt_unhashed: bool = False,
+    detach: bool = False,
+    interval: float = 10.0,
+    max_interval: float = 300.0,
+    timeout: float | None = None,
+    state_file: Path = STATE_FILE,
+    analysis_file: Path = ANALYSIS_FILE,
+    checkpoint_file: Path = CHECKPOINT_FILE,
+    on_status: Callable[[object], None] | None = None,
+    telemetry: Recorder | None = None,
+) -> BatchRun:
+    """Submit (or resume) a batch analysis job and merge its results.
+
+    When ``state_file`` holds an unfinished job, that job is resumed and
+    ``image_paths`` and the selection options are ignored.
+    """
+    run = BatchRun()
+    state = load_state(state_file)
+    if state is not None:
+        run.resumed = True
+    else:
+        results = load_results(analysis_file, checkpoint_file)
+        pending, run.skipped, adopted = select_pending(image_paths, results, force=force, adopt_unhashed=adopt_unhashed)
+        if adopted:
+            save_results(results, analysis_file)
+        if not pending:
+            return run
+        job_file = BATCH_DIR / f"scene-analysis-{time.strftime('%Y%m%d-%H%M%S')}.jsonl"
+        requests = write_job_file(pending, job_file, model=model, preprocess=preprocess)
+        state = {"job_file": str(job_file), "model": model, "submitted_at": time.time(), "requests": requests}
+        save_state(state, state_file)
+
+    if not state.get("batch_id"):
+        submit(client, state, state_file)
+    run.batch_id = state["batch_id"]
+    if detach:
+        run.detached = True
+        return run
+
+    batch = poll(client, run.batch_id, interval=interval, max_interval=max_interval, timeout=timeout, on_status=on_status)
+    run.status = batch.status
+    if batch.status == "failed" and not batch.output_file_id:
+        errors = getattr(batch.errors, "data", None) or []
+        detail = "; ".join(error.message for error in errors if error.message) or "no detail"
+        state_file.unlink(missing_ok=True)
+        raise BatchError(f"Batch {run.batch_id} failed: {detail}")
+
+    merge(
+        client,
+        batch,
+        state,
+        run,
+        analysis_file=analysis_file,
+        checkpoint_file=checkpoint_file,
+        telemetry=telemetry,
+    )
+    state_file.unlink(missing_ok=True)
+    Path(state["job_file"]).unlink(missing_ok=True)
+    return run
@@ -0,0 +1,291 @@
+"""Indexed SQLite store over the vision-analysis results.
+
+``scene_analysis.json`` stays the committed source of truth; this is a local
+index of it in ``.cache/scene-analysis.sqlite3``, so review queries stay
+instant however many analyses and review rounds accumulate. :meth:`sync`
+only re-reads the JSON (and its checkpoint) when their size or mtime
+changed, and keeps every distinct analysis it has seen, so earlier rounds
+remain queryable with ``history=True``.
+
+Tables:
+
+* ``analyses`` - one row per distinct (image, image hash, text), with the
+  chapter parsed from the ``ch<N>_`` file name, ``analyzed_at`` when the
+  entry carries it and ``latest`` marking the row the JSON holds now;
+* ``flags`` - the flag terms each analysis asserts, from
+  :func:`~modelit_assets.analysis.flag_hits`;
+* ``images`` - the current SHA-256 of every scene image, from the shared
+  asset stat cache, so rows can be classed as current, stale (analyzed
+  against different bytes), unhashed or missing;
+* ``analyses_fts`` - an FTS5 index of the text for ``match`` queries, when
+  the SQLite build has FTS5.
+
+Query results are streamed from the cursor rather than collected.
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from .analysis import ANALYSIS_FILE, CHECKPOINT_FILE, FLAG_WORDS, flag_hits, load_results
+from .paths import BASE_DIR, CACHE_DIR, SCENES_DIR
+from .validation import StatCache
+
+STORE_FILE = CACHE_DIR / "scene-analysis.sqlite3"
+SCHEMA_VERSION = 1
+# Bump when flag_hits() changes so stored flags are recomputed.
+FLAG_RULES_VERSION = 3
+STATES = ("current", "stale", "unhashed", "missing")
+_CHAPTER = re.compile(r"^ch(\d+)_")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    image TEXT NOT NULL,
+    chapter INTEGER,
+    sha256 TEXT,
+    analysis TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    analyzed_at TEXT,
+    recorded_at TEXT NOT NULL,
+    latest INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (image, sha256, text_hash)
+);
+CREATE INDEX IF NOT EXISTS analyses_latest ON analyses (latest, image);
+CREATE INDEX IF NOT EXISTS analyses_chapter ON analyses (chapter, latest);
+CREATE TABLE IF NOT EXISTS flags (
+    analysis_id INTEGER NOT NULL REFERENCES analyses (id),
+    term TEXT NOT NULL,
+    clause TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS flags_term ON flags (term, analysis_id);
+CREATE INDEX IF NOT EXISTS flags_analysis ON flags (analysis_id);
+CREATE TABLE IF NOT EXISTS images (
+    image TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS analyses_fts USING fts5(
+    analysis, content='analyses', content_rowid='id', tokenize='porter unicode61'
+);
+"""
+
+
+class StoreError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class AnalysisRow:
+    image: str
+    chapter: int | None
+    sha256: str | None
+    current_sha256: str | None
+    analysis: str
+    analyzed_at: str | None
+    latest: bool
+    flags: list[tuple[str, str]]
+
+    @property
+    def state(self) -> str:
+        if self.current_sha256 is None:
+            return "missing"
+        if self.sha256 is None:
+            return "unhashed"
+        return "current" if self.sha256 == self.current_sha256 else "stale"
+
+
+def chapter_of(image: str) -> int | None:
+    found = _CHAPTER.match(image)
+    return int(found.group(1)) if found else None
+
+
+def _file_stamp(path: Path) -> str:
+    if not path.exists():
+        return "absent"
+    stat = path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class AnalysisStore:
+    def __init__(self, path: Path = STORE_FILE):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        if self.db.execute("PRAGMA user_version").fetchone()[0] not in (0, SCHEMA_VERSION):
+            # A derived index: rebuild it rather than migrate.
+            self.db.close()
+            path.unlink()
+            self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        try:
+            self.db.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+
+    def __enter__(self) -> "AnalysisStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def _meta(self, key: str) -> str | None:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def sync(self, analysis_file: Path = ANALYSIS_FILE, checkpoint_file: Path = CHECKPOINT_FILE) -> int:
+        """Load results that changed since the last sync; return the number of new analyses."""
+        stamp = f"{analysis_file}={_file_stamp(analysis_file)};{checkpoint_file}={_file_stamp(checkpoint_file)}"
+        rules = str(FLAG_RULES_VERSION)
+        if self._meta("source") == stamp and self._meta("flag_rules") == rules:
+            return 0
+        added = 0
+        recorded_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        with self.db:
+            if self._meta("flag_rules") != rules:
+                self.db.execute("DELETE FROM flags")
+                rows = self.db.execute("SELECT id, analysis FROM analyses").fetchall()
+                for analysis_id, text in rows:
+                    self._insert_flags(analysis_id, text)
+            results = load_results(analysis_file, checkpoint_file)
+            latest = []
+            for entry in results.values():
+                text = entry["analysis"]
+                text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+                key = (entry["image"], entry.get("sha256"), text_hash)
+                found = self.db.execute(
+                    "SELECT id FROM analyses WHERE image = ? AND sha256 IS ? AND text_hash = ?", key
+                ).fetchone()
+                if found:
+                    latest.append(found[0])
+                    continue
+                cursor = self.db.execute(
+                    "INSERT INTO analyses (image, chapter, sha256, analysis, text_hash, analyzed_at, recorded_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        entry["image"],
+                        chapter_of(entry["image"]),
+                        entry.get("sha256"),
+                        text,
+                        text_hash,
+                        entry.get("analyzed_at"),
+                        recorded_at,
+                    ),
+                )
+                analysis_id = cursor.lastrowid
+                if self.fts:
+                    self.db.execute("INSERT INTO analyses_fts (rowid, analysis) VALUES (?, ?)", (analysis_id, text))
+                self._insert_flags(analysis_id, text)
+                latest.append(analysis_id)
+                added += 1
+            self.db.execute("UPDATE analyses SET latest = 0 WHERE latest = 1")
+            self.db.executemany("UPDATE analyses SET latest = 1 WHERE id = ?", [(i,) for i in latest])
+            self._set_meta("source", stamp)
+            self._set_meta("flag_rules", rules)
+        return added
+
+    def _insert_flags(self, analysis_id: int, text: str) -> None:
+        self.db.executemany(
+            "INSERT INTO flags (analysis_id, term, clause) VALUES (?, ?, ?)",
+            [(analysis_id, term, clause) for term, clause in flag_hits(text)],
+        )
+
+    def refresh_images(
+        self, scenes_dir: Path = SCENES_DIR, stat_cache: StatCache | None = None, base_dir: Path = BASE_DIR
+    ) -> None:
+        """Record the current hash of every scene image (cheap when nothing was touched)."""
+        stat_cache = stat_cache or StatCache()
+        current = [
+            (path.name, stat_cache.lookup(path.relative_to(base_dir).as_posix(), path)[0])
+            for path in sorted(scenes_dir.glob("*.png"))
+        ]
+        stat_cache.save()
+        with self.db:
+            self.db.execute("DELETE FROM images")
+            self.db.executemany("INSERT INTO images (image, sha256) VALUES (?, ?)", current)
+
+    def query(
+        self,
+        *,
+        terms: list[str] | None = None,
+        flagged: bool = False,
+        chapter: int | None = None,
+        state: str | None = None,
+        match: str | None = None,
+        history: bool = False,
+        limit: int | None = None,
+    ) -> Iterator[AnalysisRow]:
+        """Yield analyses, by image, that satisfy every given filter.
+
+        ``terms`` keeps rows asserting any of those flag terms and
+        ``flagged`` any flag at all. ``match`` is an FTS5 query such as
+        ``NEAR(hairstyle bun)``. Only the latest analysis of each image is
+        considered unless ``history`` is set.
+        """
+        unknown = sorted(set(terms or ()) - set(FLAG_WORDS))
+        if unknown:
+            raise StoreError(f"unknown flag term(s) {', '.join(unknown)}; choose from {', '.join(FLAG_WORDS)}")
+        if state is not None and state not in STATES:
+            raise StoreError(f"unknown state {state!r}; choose from {', '.join(STATES)}")
+        if match and not self.fts:
+            raise StoreError("this SQLite build has no FTS5, so full-text match is unavailable")
+
+        where, params = [], []
+        if not history:
+            where.append("a.latest = 1")
+        if chapter is not None:
+            where.append("a.chapter = ?")
+            params.append(chapter)
+        if terms:
+            where.append(f"a.id IN (SELECT analysis_id FROM flags WHERE term IN ({', '.join('?' * len(terms))}))")
+            params.extend(terms)
+        elif flagged:
+            where.append("a.id IN (SELECT analysis_id FROM flags)")
+        if match:
+            where.append("a.id IN (SELECT rowid FROM analyses_fts WHERE analyses_fts MATCH ?)")
+            params.append(match)
+        if state == "missing":
+            where.append("i.sha256 IS NULL")
+        elif state == "unhashed":
+            where.append("i.sha256 IS NOT NULL AND a.sha256 IS NULL")
+        elif state == "current":
+            where.append("a.sha256 = i.sha256")
+        elif state == "stale":
+            where.append("a.sha256 IS NOT NULL AND i.sha256 IS NOT NULL AND a.sha256 != i.sha256")
+
+        sql = (
+            "SELECT a.id, a.image, a.chapter, a.sha256, i.sha256, a.analysis, a.analyzed_at, a.latest"
+            " FROM analyses a LEFT JOIN images i ON i.image = a.image"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY a.chapter IS NULL, a.chapter, a.image, a.id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        try:
+            cursor = self.db.execute(sql, params)
+        except sqlite3.OperationalError as exc:
+            raise StoreError(f"query failed: {exc} (check the --match syntax)") from exc
+        for analysis_id, image, chapter_id, digest, current, text, analyzed_at, latest in cursor:
+            hits = self.db.execute("SELECT term, clause FROM flags WHERE analysis_id = ?", (analysis_id,)).fetchall()
+            yield AnalysisRow(image, chapter_id, digest, current, text, analyzed_at, bool(latest), hits)
@@ -0,0 +1,180 @@
+"""Opus transcoding, silence trimming and loudness normalization for audio.
+
+Voice clips get a speech profile (mono, 24 kbps Opus, leading/trailing
+silence trimmed, EBU R128 normalized to -16 LUFS); the background music gets
+a stereo music profile without trimming. ffmpeg runs once per file on a
+thread pool, and a manifest of source mtime/size/SHA-256 plus profile means
+unchanged files are skipped on the next run.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from .files import atomic_write_bytes
+from .hashing import sha256_file
+from .paths import AUDIO_DIR
+
+OUTPUT_DIR = AUDIO_DIR / "opus"
+MANIFEST_FILE = OUTPUT_DIR / "manifest.json"
+
+
+class AudioToolError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class AudioProfile:
+    bitrate: str
+    channels: int
+    loudness: float
+    trim_silence: bool
+    application: str
+
+    def filters(self) -> str:
+        chain = []
+        if self.trim_silence:
+            trim = "silenceremove=start_periods=1:start_threshold=-50dB:start_silence=0.05"
+            chain += [trim, "areverse", trim, "areverse"]
+        chain.append(f"loudnorm=I={self.loudness}:TP=-1.5:LRA=11")
+        return ",".join(chain)
+
+
+SPEECH = AudioProfile(bitrate="24k", channels=1, loudness=-16, trim_silence=True, application="voip")
+MUSIC = AudioProfile(bitrate="96k", channels=2, loudness=-20, trim_silence=False, application="audio")
+
+
+@dataclass
+class AudioReport:
+    built: list[dict] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def require_tools() -> None:
+    missing = [tool for tool in ("ffmpeg", "ffprobe") if shutil.which(tool) is None]
+    if missing:
+        raise AudioToolError(f"{' and '.join(missing)} not found on PATH; install ffmpeg to optimize audio.")
+
+
+def probe_duration(path: Path) -> float:
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", str(path)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip() or 0)
+
+
+def transcode(source: Path, target: Path, profile: AudioProfile) -> dict:
+    """Encode ``source`` to Ogg Opus at ``target`` and describe the result."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f".{target.name}.part")
+    command = [
+        "ffmpeg", "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+        "-i", str(source),
+        "-af", profile.filters(),
+        "-ac", str(profile.channels), "-ar", "48000",
+        "-c:a", "libopus", "-b:a", profile.bitrate, "-application", profile.application,
+        "-f", "ogg", str(partial),
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        partial.unlink(missing_ok=True)
+        raise AudioToolError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "ffmpeg failed")
+    os.replace(partial, target)
+    return {
+        "output": target.relative_to(OUTPUT_DIR).as_posix() if target.is_relative_to(OUTPUT_DIR) else str(target),
+        "output_bytes": target.stat().st_size,
+        "duration_in": probe_duration(source),
+        "duration_out": probe_duration(target),
+    }
+
+
+def load_manifest(path: Path = MANIFEST_FILE) -> dict:
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {}
+
+
+def optimize_audio(
+    jobs: list[tuple[Path, Path, AudioProfile]],
+    *,
+    manifest_file: Path = MANIFEST_FILE,
+    workers: int | None = None,
+    force: bool = False,
+    on_built: Callable[[dict], None] | None = None,
+) -> AudioReport:
+    """Transcode each ``(source, target, profile)`` whose inputs changed."""
+    require_tools()
+    manifest = load_manifest(manifest_file)
+    report = AudioReport()
+    pending = []
+
+    for source, target, profile in jobs:
+        name = source.relative_to(AUDIO_DIR).as_posix() if source.is_relative_to(AUDIO_DIR) else str(source)
+        stat = source.stat()
+        entry = manifest.get(name)
+        settings = json.loads(json.dumps(asdict(profile)))
+        current = (
+            not force
+            and entry is not None
+            and entry["profile"] == settings
+            and target.exists()
+            and (
+                (entry["mtime_ns"], entry["size"]) == (stat.st_mtime_ns, stat.st_size)
+                or entry["sha256"] == sha256_file(source)
+            )
+        )
+        if current:
+            manifest[name] = {**entry, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            report.unchanged.append(name)
+        else:
+            pending.append((name, source, target, profile, stat, settings))
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(transcode, source, target, profile): (name, source, stat, settings)
+            for name, source, target, profile, stat, settings in pending
+        }
+        for future in as_completed(futures):
+            name, source, stat, settings = futures[future]
+            try:
+                described = future.result()
+            except (AudioToolError, subprocess.CalledProcessError, ValueError) as exc:
+                report.failed[name] = str(exc)
+                continue
+            entry = {
+                "sha256": sha256_file(source),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "profile": settings,
+                **described,
+            }
+            manifest[name] = entry
+            report.built.append({"source": name, **entry})
+            if on_built:
+                on_built(report.built[-1])
+
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    ordered = {name: manifest[name] for name in sorted(manifest)}
+    atomic_write_bytes(manifest_file, json.dumps(ordered, indent=2).encode("utf-8"))
+    return report
+
+
+def size_report(manifest: dict) -> dict:
+    """Totals across the manifest: bytes and seconds before and after."""
+    totals = {"files": 0, "bytes_in": 0, "bytes_out": 0, "duration_in": 0.0, "duration_out": 0.0}
+    for entry in manifest.values():
+        totals["files"] += 1
+        totals["bytes_in"] += entry["size"]
+        totals["bytes_out"] += entry["output_bytes"]
+        totals["duration_in"] += entry["duration_in"]
+        totals["duration_out"] += entry["duration_out"]
+    return totals
@@ -0,0 +1,325 @@
+"""Reproducible pipeline benchmarks against :class:`FakeOpenRouter`.
+
+A synthetic game is written to a temporary directory: story, mapping,
+scene PNGs, voice MP3 frames and music for ``scenes`` scenes. Four phases
+run over it:
+
+* ``generate`` - the :class:`GenerationEngine` against the fake images
+  endpoint, including the downloads it triggers,
+* ``download`` - bare resumable downloads of every scene,
+* ``analyze`` - :func:`run_analysis` against the fake responses endpoint,
+* ``validate-cold`` / ``validate-warm`` - :func:`validate` with an empty
+  and then a populated stat cache.
+
+Each run is appended to ``.cache/benchmarks/history.jsonl`` together with
+its settings. :func:`compare` flags phases that got slower than the most
+recent run with the same settings, or than a chosen baseline file.
+"""
+
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .fake_openrouter import FakeOpenRouter, make_png
+from .paths import BASE_DIR, CACHE_DIR
+from .telemetry import Recorder, percentile
+
+HISTORY_FILE = CACHE_DIR / "benchmarks" / "history.jsonl"
+PHASES = ("generate", "download", "analyze", "validate")
+SCENES_PER_CHAPTER = 5
+
+
+@dataclass(frozen=True)
+class BenchSettings:
+    latency: float = 0.05
+    error_rate: float = 0.0
+    rate_limit: int = 0
+    drop_rate: float = 0.0
+    workers: int = 8
+    requests_per_second: float = 500.0
+
+
+@dataclass
+class PhaseResult:
+    phase: str
+    scenes: int
+    seconds: float
+    items: int
+    failed: int = 0
+    p50: float | None = None
+    p95: float | None = None
+
+    @property
+    def per_second(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+def synthetic_story(scenes: int) -> tuple[dict, dict]:
+    """A STORY_DATA-shaped dict and scene mapping with ``scenes`` image scenes."""
+    chapters = []
+    mapping = {}
+    chapter_count = -(-scenes // SCENES_PER_CHAPTER)
+    for chapter_id in range(chapter_count):
+        chapter_scenes = []
+        for index in range(min(SCENES_PER_CHAPTER, scenes - chapter_id * SCENES_PER_CHAPTER)):
+            key = f"syn_ch{chapter_id}_scene{index}"
+            image = f"images/scenes/{key}.png"
+            mapping[key] = image
+            chapter_scenes.append({"text": f"Dr. Maya studies sample {chapter_id}.{index}.", "image": image})
+        next_chapter = chapter_id + 1 if chapter_id + 1 < chapter_count else "ending"
+        chapters.append(
+            {
+                "id": chapter_id,
+                "title": f"Chapter {chapter_id}",
+                "scenes": chapter_scenes,
+                "choice": {
+                    "question": "Which node do you test next?",
+                    "options": [
+                        {"text": "The receptor", "feedback": "Correct.", "next": next_chapter},
+                        {"text": "Nothing", "feedback": "The cells spread.", "gameOver": True},
+                    ],
+                },
+            }
+        )
+    return {"chapters": chapters}, mapping
+
+
+def write_synthetic_assets(root: Path, story: dict, mapping: dict) -> list[Path]:
+    """Write every file the synthetic story references; return the scene images."""
+    from .story import voice_lines
+    from .validation import MUSIC_FILE
+    from .voice import MP3_FRAME
+
+    images = []
+    for number, relative in enumerate(sorted(mapping.values())):
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(make_png(64, 64, seed=number))
+        images.append(path)
+    for relative in [line.path for line in voice_lines(story)] + [MUSIC_FILE]:
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(MP3_FRAME * 8)
+    return images
+
+
+def _recorder(workdir: Path, phase: str) -> Recorder:
+    return Recorder(f"bench-{phase}", trace_file=workdir / f"{phase}.jsonl", metrics_file=workdir / f"{phase}.prom")
+
+
+def _spread(recorder: Recorder, kind: str) -> tuple[float | None, float | None]:
+    durations = [span.duration for span in recorder.spans if span.kind == kind]
+    if not durations:
+        return None, None
+    return percentile(durations, 0.5), percentile(durations, 0.95)
+
+
+def _session(settings: BenchSettings):
+    import requests
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(settings.workers, 10))
+    session.mount("http://", adapter)
+    return session
+
+
+def bench_generate(fake: FakeOpenRouter, workdir: Path, scenes: list[Path], settings: BenchSettings) -> PhaseResult:
+    from .engine import GenerationEngine, ImageJob
+
+    recorder = _recorder(workdir, "generate")
+    engine = GenerationEngine(
+        "bench",
+        workdir / "generated",
+        base_url=fake.base_url,
+        max_workers=settings.workers,
+        requests_per_second=settings.requests_per_second,
+        burst=settings.workers,
+        session=_session(settings),
+        telemetry=recorder,
+    )
+    (workdir / "generated").mkdir(exist_ok=True)
+    jobs = [ImageJob(path.name, {"model": "bench/fake", "prompt": path.stem, "n": 1}) for path in scenes]
+    summary = engine.run(jobs)
+    recorder.finish()
+    return PhaseResult("generate", len(scenes), summary.elapsed, summary.succeeded, summary.failed, *_spread(recorder, "generation"))
+
+
+def bench_download(fake: FakeOpenRouter, workdir: Path, scenes: list[Path], settings: BenchSettings) -> PhaseResult:
+    from .download import download
+
+    recorder = _recorder(workdir, "download")
+    session = _session(settings)
+    out = workdir / "downloaded"
+    out.mkdir(exist_ok=True)
+    urls = {path.name: fake.add_image(f"bench-{path.stem}", path.read_bytes()) for path in scenes}
+
+    def fetch(name: str) -> bool:
+        try:
+            download(session, urls[name], out / name, telemetry=recorder, name=name)
+            return True
+        except Exception:
+            return False
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=settings.workers) as pool:
+        ok = sum(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - started
+    recorder.finish()
+    return PhaseResult("download", len(scenes), elapsed, ok, len(urls) - ok, *_spread(recorder, "download"))
+
+
+def bench_analyze(fake: FakeOpenRouter, workdir: Path, scenes: list[Path], settings: BenchSettings) -> PhaseResult:
+    from openai import OpenAI
+
+    from .analysis import run_analysis
+
+    recorder = _recorder(workdir, "analyze")
+    client = OpenAI(api_key="bench", base_url=fake.openai_base_url, max_retries=5)
+    started = time.perf_counter()
+    result = run_analysis(
+        client,
+        scenes,
+        workers=settings.workers,
+        preprocess=None,
+        analysis_file=workdir / "scene_analysis.json",
+        checkpoint_file=workdir / "scene_analysis.checkpoint.jsonl",
+        telemetry=recorder,
+    )
+    elapsed = time.perf_counter() - started
+    recorder.finish()
+    return PhaseResult(
+        "analyze", len(scenes), elapsed, len(result.analyzed), len(result.failed), *_spread(recorder, "analysis")
+    )
+
+
+def bench_validate(workdir: Path, story: dict, mapping: dict) -> list[PhaseResult]:
+    from .validation import StatCache, validate, write_manifest
+
+    manifest = workdir / "asset-manifest.json"
+    stat_file = workdir / "asset-stat-cache.json"
+    results = []
+    for phase in ("validate-cold", "validate-warm"):
+        started = time.perf_counter()
+        report, current = validate(
+            workdir, manifest_file=manifest, stat_cache=StatCache(stat_file), story=story, mapping=mapping
+        )
+        elapsed = time.perf_counter() - started
+        if not manifest.exists():
+            write_manifest(current, manifest)
+        failed = len(report.missing) + len(report.broken)
+        results.append(PhaseResult(phase, len(mapping), elapsed, report.referenced, failed))
+    return results
+
+
+def run_benchmarks(
+    scene_counts: tuple[int, ...] = (49, 1000),
+    phases: tuple[str, ...] = PHASES,
+    settings: BenchSettings = BenchSettings(),
+    on_result=None,
+) -> list[PhaseResult]:
+    results = []
+
+    def add(result: PhaseResult) -> None:
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    for count in scene_counts:
+        story, mapping = synthetic_story(count)
+        with tempfile.TemporaryDirectory(prefix=f"modelit-bench-{count}-") as tmp:
+            workdir = Path(tmp)
+            scenes = write_synthetic_assets(workdir, story, mapping)
+            with FakeOpenRouter(
+                latency=settings.latency,
+                error_rate=settings.error_rate,
+                rate_limit=settings.rate_limit,
+                drop_rate=settings.drop_rate,
+            ) as fake:
+                if "generate" in phases:
+                    add(bench_generate(fake, workdir, scenes, settings))
+                if "download" in phases:
+                    add(bench_download(fake, workdir, scenes, settings))
+                if "analyze" in phases:
+                    add(bench_analyze(fake, workdir, scenes, settings))
+            if "validate" in phases:
+                for result in bench_validate(workdir, story, mapping):
+                    add(result)
+    return results
+
+
+def _revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def make_record(results: list[PhaseResult], settings: BenchSettings) -> dict:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "settings": asdict(settings),
+        "results": [asdict(result) for result in results],
+    }
+
+
+def append_history(record: dict, path: Path = HISTORY_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def _records(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def load_baseline(settings: BenchSettings, path: Path = HISTORY_FILE) -> dict | None:
+    """The most recent record in ``path`` that was run with the same settings."""
+    if not path.exists():
+        return None
+    wanted = asdict(settings)
+    matching = [record for record in _records(path) if record.get("settings") == wanted]
+    return matching[-1] if matching else None
+
+
+def load_record(path: Path) -> dict | None:
+    """The last record in a history file (or a copy of one), whatever its settings."""
+    records = _records(path)
+    return records[-1] if records else None
+
+
+@dataclass
+class Comparison:
+    phase: str
+    scenes: int
+    before: float
+    after: float
+    regressed: bool = False
+
+    @property
+    def change(self) -> float:
+        return (self.after - self.before) / self.before if self.before > 0 else 0.0
+
+
+def compare(results: list[PhaseResult], baseline: dict, threshold: float = 0.1) -> list[Comparison]:
+    """Compare wall time per (phase, scenes) with ``baseline``; flag slowdowns above ``threshold``."""
+    before = {(r["phase"], r["scenes"]): r["seconds"] for r in baseline.get("results", [])}
+    comparisons = []
+    for result in results:
+        old = before.get((result.phase, result.scenes))
+        if old is None:
+            continue
+        comparison = Comparison(result.phase, result.scenes, old, result.seconds)
+        comparison.regressed = comparison.change > threshold
+        comparisons.append(comparison)
+    return comparisons
@@ -0,0 +1,105 @@
+"""Content-addressed on-disk cache of generated images.
+
+Entries are keyed by a SHA-256 of the request fields that determine the
+image (model, full prompt, size, quality), so re-running a batch only pays
+for prompts that have not already succeeded. Entries are re-validated on
+every hit, so a truncated or corrupted file is dropped and regenerated
+instead of being copied into the game. Every hit refreshes the entry's mtime, and :meth:`GenerationCache.evict` drops entries by age and then
+least-recently-used until the cache fits its size budget.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from .files import AssetError, validate_png
+from .paths import CACHE_DIR
+
+DEFAULT_GENERATION_CACHE = CACHE_DIR / "generations"
+
+
+def cache_key(model: str, prompt: str, size: str | None = None, quality: str | None = None) -> str:
+    material = json.dumps([model, prompt, size, quality], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def payload_key(payload: dict) -> str:
+    return cache_key(payload["model"], payload["prompt"], payload.get("size"), payload.get("quality"))
+
+
+class GenerationCache:
+    def __init__(
+        self,
+        root: Path = DEFAULT_GENERATION_CACHE,
+        *,
+        max_bytes: int | None = 2 * 1024**3,
+        max_age_days: float | None = 90,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.png"
+
+    def get(self, key: str) -> Path | None:
+        path = self.path_for(key)
+        try:
+            validate_png(path)
+        except FileNotFoundError:
+            return None
+        except (AssetError, OSError):
+            self.discard(key)
+            return None
+        os.utime(path)
+        return path
+
+    def discard(self, key: str) -> None:
+        path = self.path_for(key)
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+
+    def put(self, key: str, source: Path, meta: dict | None = None) -> Path:
+        """Copy ``source`` into the cache atomically and return the cached path."""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(source, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        if meta is not None:
+            path.with_suffix(".json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        return path
+
+    def evict(self) -> tuple[int, int]:
+        """Apply the age and size limits; return (entries removed, bytes freed)."""
+        if not self.root.exists():
+            return 0, 0
+        entries = []
+        for path in self.root.glob("*/*.png"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        removed = freed = 0
+        cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days is not None else None
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            too_old = cutoff is not None and mtime < cutoff
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            if not (too_old or too_big):
+                continue
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+            total -= size
+            removed += 1
+            freed += size
+        return removed, freed
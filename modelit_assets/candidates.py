@@ -0,0 +1,245 @@
+"""Best-of-N scene generation with local scoring.
+
+``modelit-assets generate PROFILE --candidates N`` requests every stale scene
+N times on the engine's worker pool, bypassing the prompt cache so every run
+draws fresh images. Each run's candidates are written to their own
+``.cache/candidates/<scene key>/<run>/`` directory and, as soon as a scene's
+last one arrives, scored offline with the features from
+:mod:`modelit_assets.consistency`: the ``CHARACTER_REF`` palette shortfall
+against the median existing scene plus the colour-histogram distance from
+the reference image (lower is better). The best candidate is copied over the
+scene's output; the others stay in the run directory next to a
+``selection.json`` that records every score, so earlier runs remain
+available for comparison.
+
+A scene is *ambiguous* when its runner-up scores within ``margin`` of the
+winner, when even the winner scores at or above ``threshold``, or when the
+candidates disagree about whether the character is in the frame at all.
+Only those scenes go to the paid vision analyzer. The contender whose
+analysis contains the fewest flag words wins, with the local score breaking
+ties, and its analysis is stored in ``scene_analysis.json``.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from .analysis import ANALYSIS_FILE, analysis_entry, analyze_image, flag_terms, load_results, save_results
+from .consistency import (
+    REFERENCE_IMAGE,
+    baseline_coverage,
+    build_index,
+    character_palette,
+    character_present,
+    image_features,
+    score,
+)
+from .engine import ImageJob, JobResult
+from .files import atomic_copy, atomic_write_bytes
+from .hashing import sha256_file
+from .paths import BASE_DIR, CACHE_DIR, SCENES_DIR
+from .prompts import ScenePrompt
+
+CANDIDATE_DIR = CACHE_DIR / "candidates"
+SELECTION_FILE = "selection.json"
+MARGIN = 0.05
+THRESHOLD = 0.5
+
+
+@dataclass
+class Candidate:
+    path: Path
+    score: float
+    histogram_distance: float
+    present: bool
+    analysis: str | None = None
+    flags: list[str] | None = None
+
+
+@dataclass
+class Selection:
+    scene: ScenePrompt
+    candidates: list[Candidate] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    ambiguous: str | None = None
+    # The candidates the analyzer should see when the scene is ambiguous.
+    contenders: list[Candidate] = field(default_factory=list)
+    escalated: bool = False
+
+    @property
+    def winner(self) -> Candidate | None:
+        return self.candidates[0] if self.candidates else None
+
+
+def run_id() -> str:
+    """Name of a run's candidate directories, sortable by start time."""
+    return time.strftime("%Y%m%d-%H%M%S")
+
+
+def candidate_jobs(
+    scene: ScenePrompt, count: int, run: str, root: Path = CANDIDATE_DIR, base_dir: Path = BASE_DIR
+) -> list[ImageJob]:
+    """N jobs for ``scene``, written to this run's directory under ``root``."""
+    directory = root / scene.key / run
+    directory.mkdir(parents=True, exist_ok=True)
+    return [
+        ImageJob((directory / f"{number}.png").relative_to(base_dir).as_posix(), scene.payload)
+        for number in range(1, count + 1)
+    ]
+
+
+class Scorer:
+    """Offline off-model score for candidate images, relative to the current scenes."""
+
+    def __init__(self, scenes_dir: Path = SCENES_DIR, reference: str = REFERENCE_IMAGE.name):
+        self.palette = character_palette()
+        index, _ = build_index(sorted(scenes_dir.glob("*.png")), palette=self.palette)
+        ref = index.row(reference)
+        if ref is None:
+            raise ValueError(f"reference image {reference} is not in {scenes_dir}")
+        self.baseline = baseline_coverage(index, ref)
+        self.reference_histogram = index.histograms[ref]
+
+    def score(self, paths: list[Path]) -> list[Candidate]:
+        """Score ``paths``, best (lowest) first."""
+        with ThreadPoolExecutor() as pool:
+            features = list(pool.map(lambda path: image_features(path, self.palette), paths))
+        coverage = np.array([f.coverage for f in features], dtype=np.float32)
+        scores, hist_distance = score(
+            coverage, np.array([f.histogram for f in features]), self.baseline, self.reference_histogram
+        )
+        present = character_present(coverage)
+        candidates = [
+            Candidate(path, float(s), float(h), bool(c)) for path, s, h, c in zip(paths, scores, hist_distance, present)
+        ]
+        return sorted(candidates, key=lambda c: c.score)
+
+
+def ambiguity(
+    candidates: list[Candidate], *, margin: float = MARGIN, threshold: float = THRESHOLD
+) -> tuple[str | None, list[Candidate]]:
+    """Why the local scores cannot pick a winner with confidence, and which candidates are in question."""
+    if not candidates:
+        return None, []
+    best = candidates[0]
+    if len({c.present for c in candidates}) > 1:
+        return "candidates disagree on whether the character is shown", candidates
+    if best.score >= threshold:
+        return f"best score {best.score:.2f} >= {threshold:.2f}", candidates
+    close = [c for c in candidates[1:] if c.score - best.score < margin]
+    if close:
+        return f"{len(close)} candidate(s) within {margin:.2f} of the best score", [best, *close]
+    return None, []
+
+
+class BestOfN:
+    """Collects engine results per scene and selects each scene's winner."""
+
+    def __init__(
+        self,
+        scenes: list[ScenePrompt],
+        count: int,
+        *,
+        scorer: Scorer,
+        run: str | None = None,
+        root: Path = CANDIDATE_DIR,
+        base_dir: Path = BASE_DIR,
+        margin: float = MARGIN,
+        threshold: float = THRESHOLD,
+    ):
+        self.count = count
+        self.scorer = scorer
+        self.run = run or run_id()
+        self.base_dir = base_dir
+        self.margin = margin
+        self.threshold = threshold
+        self.jobs: list[ImageJob] = []
+        self.scene_of: dict[str, ScenePrompt] = {}
+        self.done: dict[str, list[JobResult]] = {}
+        for scene in scenes:
+            for job in candidate_jobs(scene, count, self.run, root, base_dir):
+                self.jobs.append(job)
+                self.scene_of[job.filename] = scene
+
+    def add(self, result: JobResult) -> Selection | None:
+        """Record one finished job; return the scene's selection once all N are in."""
+        scene = self.scene_of[result.job.filename]
+        finished = self.done.setdefault(scene.key, [])
+        finished.append(result)
+        if len(finished) < self.count:
+            return None
+        selection = Selection(scene, failed=[r.job.filename for r in finished if not r.ok])
+        paths = [self.base_dir / r.job.filename for r in finished if r.ok]
+        if paths:
+            selection.candidates = self.scorer.score(paths)
+            selection.ambiguous, selection.contenders = ambiguity(
+                selection.candidates, margin=self.margin, threshold=self.threshold
+            )
+        return selection
+
+
+def escalate(client, selections: list[Selection], *, workers: int = 4) -> dict[str, str]:
+    """Analyze the contenders of ambiguous scenes and re-pick their winners.
+
+    Returns ``{candidate path: error}`` for analyses that failed; a scene
+    whose contenders could not all be analyzed keeps its local winner.
+    """
+    contenders = [(selection, c) for selection in selections for c in selection.contenders]
+    errors = {}
+
+    def analyze(candidate: Candidate) -> None:
+        try:
+            entry = analyze_image(client, candidate.path)
+        except Exception as exc:
+            errors[str(candidate.path)] = f"{type(exc).__name__}: {exc}"
+            return
+        candidate.analysis = entry["analysis"]
+        candidate.flags = flag_terms(candidate.analysis)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(analyze, [c for _, c in contenders]))
+
+    for selection in selections:
+        analyzed = [c for c in selection.contenders if c.flags is not None]
+        if len(analyzed) != len(selection.contenders):
+            continue
+        selection.escalated = True
+        winner = min(analyzed, key=lambda c: (len(c.flags), c.score))
+        selection.candidates.remove(winner)
+        selection.candidates.insert(0, winner)
+    return errors
+
+
+def keep_winner(selection: Selection, base_dir: Path = BASE_DIR, analysis_file: Path = ANALYSIS_FILE) -> Path:
+    """Copy the winner over the scene output and write the candidate directory's selection.json."""
+    winner = selection.winner
+    output = base_dir / selection.scene.output
+    atomic_copy(winner.path, output)
+    if winner.analysis is not None:
+        results = load_results(analysis_file)
+        results[output.name] = analysis_entry(output.name, sha256_file(output), winner.analysis)
+        save_results(results, analysis_file)
+
+    record = {
+        "scene": selection.scene.key,
+        "output": selection.scene.output,
+        "winner": winner.path.name,
+        "ambiguous": selection.ambiguous,
+        "escalated": selection.escalated,
+        "failed": selection.failed,
+        "candidates": [
+            {
+                **asdict(c),
+                "path": c.path.name,
+                "score": round(c.score, 4),
+                "histogram_distance": round(c.histogram_distance, 4),
+            }
+            for c in selection.candidates
+        ],
+    }
+    atomic_write_bytes(winner.path.parent / SELECTION_FILE, json.dumps(record, indent=2).encode("utf-8"))
+    return output
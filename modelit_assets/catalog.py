@@ -0,0 +1,228 @@
+"""Local, indexed copy of the OpenRouter model catalog.
+
+The ``/models`` response is cached in ``.cache/openrouter-models.json``
+together with its ``ETag`` and ``Last-Modified`` headers. Within the TTL the
+cache is used as is. After it expires, a conditional request revalidates
+it, which is normally a bodyless 304. If the network is down, a stale copy
+is still used.
+
+:class:`ModelCatalog` indexes the models by input and output modality, sorted
+by price (per image for image output, per token otherwise), so queries such
+as "cheapest image-output model" need neither the network nor a full scan. Generators call :func:`check_model` before a batch
+so a retired or misspelled model id fails once, up front.
+"""
+
+import difflib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .files import atomic_write_bytes
+from .paths import CACHE_DIR
+
+CATALOG_FILE = CACHE_DIR / "openrouter-models.json"
+DEFAULT_TTL = 24 * 3600
+
+
+class CatalogError(Exception):
+    pass
+
+
+def _price(pricing: dict, key: str) -> float:
+    try:
+        return max(0.0, float(pricing.get(key) or 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass(frozen=True)
+class ModelInfo:
+    id: str
+    name: str
+    input_modalities: tuple[str, ...]
+    output_modalities: tuple[str, ...]
+    context_length: int
+    prompt_price: float
+    completion_price: float
+    image_price: float
+    request_price: float
+
+    @classmethod
+    def from_api(cls, data: dict) -> "ModelInfo":
+        architecture = data.get("architecture") or {}
+        pricing = data.get("pricing") or {}
+        return cls(
+            id=data["id"],
+            name=data.get("name") or data["id"],
+            input_modalities=tuple(architecture.get("input_modalities") or ("text",)),
+            output_modalities=tuple(architecture.get("output_modalities") or ("text",)),
+            context_length=int(data.get("context_length") or 0),
+            prompt_price=_price(pricing, "prompt"),
+            completion_price=_price(pricing, "completion"),
+            image_price=_price(pricing, "image"),
+            request_price=_price(pricing, "request"),
+        )
+
+    @property
+    def unit_price(self) -> float:
+        """USD per prompt plus completion token."""
+        return self.prompt_price + self.completion_price
+
+    @property
+    def free(self) -> bool:
+        return not (self.unit_price or self.image_price or self.request_price)
+
+
+class ModelCatalog:
+    def __init__(self, models: list[ModelInfo], fetched_at: float = 0.0):
+        self.fetched_at = fetched_at
+        self.models = {model.id: model for model in models}
+        ordered = sorted(models, key=lambda m: (m.unit_price, m.request_price, m.image_price, m.id))
+        self.by_output: dict[str, list[ModelInfo]] = {}
+        self.by_input: dict[str, list[ModelInfo]] = {}
+        for model in ordered:
+            for modality in model.output_modalities:
+                self.by_output.setdefault(modality, []).append(model)
+            for modality in model.input_modalities:
+                self.by_input.setdefault(modality, []).append(model)
+        # Image generators are billed per image, not per token.
+        if "image" in self.by_output:
+            self.by_output["image"].sort(key=lambda m: (m.image_price, m.request_price, m.unit_price, m.id))
+        self._ordered = ordered
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "ModelCatalog":
+        models = [ModelInfo.from_api(entry) for entry in payload.get("models", []) if entry.get("id")]
+        return cls(models, payload.get("fetched_at", 0.0))
+
+    def get(self, model_id: str) -> ModelInfo | None:
+        return self.models.get(model_id)
+
+    def query(
+        self,
+        *,
+        output: str | None = None,
+        input: str | None = None,
+        text: str | None = None,
+        max_price: float | None = None,
+        min_context: int = 0,
+        free: bool | None = None,
+    ) -> list[ModelInfo]:
+        """Matching models, cheapest first (per image when ``output="image"``)."""
+        candidates = self._ordered
+        if output:
+            candidates = self.by_output.get(output, [])
+        if input:
+            allowed = {model.id for model in self.by_input.get(input, [])}
+            candidates = [model for model in candidates if model.id in allowed]
+        needle = text.lower() if text else None
+        return [
+            model
+            for model in candidates
+            if (needle is None or needle in model.id.lower() or needle in model.name.lower())
+            and (max_price is None or model.unit_price <= max_price)
+            and model.context_length >= min_context
+            and (free is None or model.free == free)
+        ]
+
+    def cheapest(self, output: str, **filters) -> ModelInfo | None:
+        matches = self.query(output=output, **filters)
+        return matches[0] if matches else None
+
+    def suggestions(self, model_id: str, output: str | None = None, limit: int = 3) -> list[str]:
+        pool = [model.id for model in (self.by_output.get(output, []) if output else self._ordered)]
+        return difflib.get_close_matches(model_id, pool, n=limit, cutoff=0.4)
+
+
+def load_cached(path: Path = CATALOG_FILE) -> dict | None:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return None
+
+
+def _save(payload: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(path, json.dumps(payload).encode("utf-8"))
+
+
+def load_catalog(
+    session=None,
+    *,
+    base_url: str | None = None,
+    api_key: str | None = None,
+    path: Path = CATALOG_FILE,
+    ttl: float = DEFAULT_TTL,
+    force: bool = False,
+    offline: bool = False,
+    timeout: float = 30,
+) -> ModelCatalog:
+    """Return the catalog, revalidating the local copy once it is older than ``ttl``.
+
+    Raises :class:`CatalogError` only when there is neither a usable local
+    copy nor a successful fetch.
+    """
+    cached = load_cached(path)
+    fresh = cached is not None and time.time() - cached.get("fetched_at", 0) < ttl
+    if offline or (fresh and not force):
+        if cached is None:
+            raise CatalogError(f"No cached model catalog at {path}; run without --offline first.")
+        return ModelCatalog.from_payload(cached)
+
+    import requests
+
+    from .engine import DEFAULT_BASE_URL
+    from .http import get_session
+
+    session = session or get_session()
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    if cached and not force:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    try:
+        response = session.get(f"{(base_url or DEFAULT_BASE_URL).rstrip('/')}/models", headers=headers, timeout=timeout)
+    except requests.RequestException as exc:
+        if cached is None:
+            raise CatalogError(f"Could not fetch the model catalog: {exc}") from exc
+        return ModelCatalog.from_payload(cached)
+
+    if response.status_code == 304 and cached is not None:
+        cached["fetched_at"] = time.time()
+        _save(cached, path)
+        return ModelCatalog.from_payload(cached)
+    if response.status_code != 200:
+        if cached is None:
+            raise CatalogError(f"Model catalog request failed: HTTP {response.status_code}")
+        return ModelCatalog.from_payload(cached)
+
+    payload = {
+        "fetched_at": time.time(),
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "models": response.json().get("data", []),
+    }
+    _save(payload, path)
+    return ModelCatalog.from_payload(payload)
+
+
+def check_model(catalog: ModelCatalog, model_id: str, output: str | None = None) -> ModelInfo:
+    """Return ``model_id``'s entry or raise :class:`CatalogError` with alternatives."""
+    model = catalog.get(model_id)
+    if model is None:
+        hint = catalog.suggestions(model_id, output)
+        message = f"Model {model_id!r} is not in the OpenRouter catalog."
+        if hint:
+            message += f" Did you mean: {', '.join(hint)}?"
+        raise CatalogError(message)
+    if output and output not in model.output_modalities:
+        cheapest = catalog.cheapest(output)
+        message = f"Model {model_id!r} does not produce {output} output ({', '.join(model.output_modalities)})."
+        if cheapest:
+            message += f" Cheapest {output}-output model: {cheapest.id}."
+        raise CatalogError(message)
+    return model
@@ -0,0 +1,151 @@
+"""Split ``STORY_DATA`` into one minified JSON chunk per chapter plus an index.
+
+The index is small enough to load up front. It holds every chapter's id,
+title, concept and boss flag, enough for the chapter badges. Each entry
+also names the chapter's chunk file and lists the scene images and voice
+clips that chapter needs, so the game can fetch chapter N+1 and warm its
+assets while the player is still in chapter N. Top-level story keys other
+than ``chapters`` are kept in the index, so :func:`join_story` can rebuild
+the original object exactly; :func:`verify` checks that it does.
+
+Index layout::
+
+    {"version": 1, "story": {...}, "chapters": [
+        {"id": 0, "title": "...", "concept": "...", "boss": false,
+         "file": "story/ch0.json", "bytes": 2817, "sha256": "...",
+         "images": ["images/scenes/..."], "voices": ["audio/voice/..."]}]}
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from .files import atomic_write_bytes
+from .story import is_boss, scene_image, voice_lines
+
+CHUNK_DIR = "story"
+INDEX_FILE = f"{CHUNK_DIR}/index.json"
+INDEX_VERSION = 1
+
+
+def minify(value) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def rewrite_paths(value, renames: dict[str, str]):
+    """``value`` with every string that is a key of ``renames`` replaced."""
+    if isinstance(value, str):
+        return renames.get(value, value)
+    if isinstance(value, list):
+        return [rewrite_paths(item, renames) for item in value]
+    if isinstance(value, dict):
+        return {key: rewrite_paths(item, renames) for key, item in value.items()}
+    return value
+
+
+def chapter_images(chapter: dict) -> list[str]:
+    images = [scene_image(chapter, scene) for scene in chapter["scenes"]]
+    if chapter.get("choice"):
+        images.append(chapter["choice"].get("image"))
+    return list(dict.fromkeys(path for path in images if path))
+
+
+@dataclass
+class StoryChunks:
+    index: dict
+    files: dict[str, bytes]
+    names: dict[str, str]
+
+    @property
+    def index_bytes(self) -> bytes:
+        return minify(self.index)
+
+
+def split_story(
+    story: dict,
+    *,
+    renames: dict[str, str] | None = None,
+    name: Callable[[str, bytes], str] | None = None,
+) -> StoryChunks:
+    """Chunk ``story`` by chapter.
+
+    ``renames`` maps asset paths to the names they should have in the chunks
+    and the index (the hashed names of a dist build). ``name`` picks each
+    chunk's file name from its logical name and bytes.
+    """
+    renames = renames or {}
+    voices: dict[int, list[str]] = {}
+    for line in voice_lines(story):
+        voices.setdefault(line.chapter, []).append(line.path)
+
+    entries, files, names = [], {}, {}
+    for chapter in story["chapters"]:
+        data = minify(rewrite_paths(chapter, renames))
+        logical = f"{CHUNK_DIR}/ch{chapter['id']}.json"
+        target = name(logical, data) if name else logical
+        files[target] = data
+        names[logical] = target
+        entries.append(
+            {
+                "id": chapter["id"],
+                "title": chapter.get("title"),
+                "concept": chapter.get("concept"),
+                "boss": is_boss(chapter),
+                "file": target,
+                "bytes": len(data),
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "images": [renames.get(path, path) for path in chapter_images(chapter)],
+                "voices": [renames.get(path, path) for path in voices.get(chapter["id"], [])],
+            }
+        )
+    rest = {key: value for key, value in story.items() if key != "chapters"}
+    index = {"version": INDEX_VERSION, "story": rest, "chapters": entries}
+    return StoryChunks(index, files, names)
+
+
+def join_story(index: dict, read: Callable[[str], bytes]) -> dict:
+    """Rebuild the story object from an index and a chunk reader."""
+    chapters = []
+    for entry in index["chapters"]:
+        data = read(entry["file"])
+        if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            raise ValueError(f"{entry['file']}: content does not match the index hash")
+        chapters.append(json.loads(data))
+    return {**index["story"], "chapters": chapters}
+
+
+def verify(story: dict, chunks: StoryChunks) -> list[str]:
+    """Differences between ``story`` and what the chunks rebuild; empty if they round-trip.
+
+    Chunks split with ``renames`` round-trip to ``rewrite_paths(story, renames)``.
+    """
+    try:
+        rebuilt = join_story(json.loads(chunks.index_bytes), chunks.files.__getitem__)
+    except (KeyError, ValueError) as exc:
+        return [str(exc)]
+    problems = []
+    if rebuilt.keys() != story.keys():
+        problems.append(f"top-level keys differ: {sorted(rebuilt)} != {sorted(story)}")
+    if len(rebuilt["chapters"]) != len(story["chapters"]):
+        problems.append(f"{len(rebuilt['chapters'])} chapters rebuilt, expected {len(story['chapters'])}")
+    for original, copy in zip(story["chapters"], rebuilt["chapters"]):
+        if original != copy:
+            problems.append(f"chapter {original.get('id')} does not round-trip")
+    if not problems and rebuilt != story:
+        problems.append("rebuilt story differs")
+    return problems
+
+
+def write_chunks(chunks: StoryChunks, out_dir: Path) -> list[Path]:
+    """Write the chunks and index under ``out_dir``; return the files that changed."""
+    changed = []
+    for relative, data in [*chunks.files.items(), (INDEX_FILE, chunks.index_bytes)]:
+        target = out_dir / relative
+        if target.exists() and target.read_bytes() == data:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(target, data)
+        changed.append(target)
+    return changed
@@ -0,0 +1,78 @@
+"""``modelit-assets`` command line.
+
+    modelit-assets validate [--update]
+    modelit-assets generate {characters,nano-banana} [--workers N] [--force] [--candidates N]
+    modelit-assets analyze [--max-edge PX] [--only-suspicious THRESHOLD] [--batch [--detach]]
+    modelit-assets models [--filter TEXT]
+    modelit-assets flags [--term off] [--chapter N] [--state stale] [--match QUERY]
+    modelit-assets bench [--scenes 49 1000] [--latency S] [--error-rate F]
+    modelit-assets build [--out DIR] [--no-compress]
+    modelit-assets serve [--dist] [--port N] [--throttle classroom]
+    modelit-assets voice [--backend openai|google|stub] [--dry-run] [--adopt]
+    modelit-assets chunks [--out DIR]
+    modelit-assets review [--edge PX] [--force]
+    modelit-assets responsive [--widths 480,768,1024] [--avif] [--force]
+    modelit-assets audio [--workers N] [--force]
+    modelit-assets preload [--depth N] [--output FILE]
+    modelit-assets consistency [--threshold SCORE] [--all]
+
+Also runnable as ``python -m modelit_assets``. Building the parser only
+imports the light ``commands`` modules; each subcommand loads its own
+dependencies when it runs.
+"""
+
+import argparse
+import importlib
+import sys
+
+from .config import ConfigError
+
+COMMANDS = (
+    "generate",
+    "analyze",
+    "validate",
+    "models",
+    "flags",
+    "bench",
+    "build",
+    "serve",
+    "voice",
+    "chunks",
+    "review",
+    "responsive",
+    "audio",
+    "preload",
+    "consistency",
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="modelit-assets", description="ModelIt Mystery asset tooling.")
+    subcommands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+    for name in COMMANDS:
+        module = importlib.import_module(f".commands.{name}", __package__)
+        command = subcommands.add_parser(
+            name,
+            help=module.HELP,
+            description=module.__doc__,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+        )
+        module.configure(command)
+        command.set_defaults(run=module.run)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    if sys.platform == "win32":
+        sys.stdout.reconfigure(encoding="utf-8")
+        sys.stderr.reconfigure(encoding="utf-8")
+
+    args = build_parser().parse_args(argv)
+    try:
+        return args.run(args)
+    except ConfigError as exc:
+        raise SystemExit(str(exc))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Subcommands of the ``modelit-assets`` CLI.
+
+Each module exposes ``HELP``, ``configure(parser)`` and ``run(args)``. Only
+argparse work happens at import time; anything that pulls in ``requests``,
+``openai``, Pillow or NumPy is imported inside ``run()``.
+"""
+
+import argparse
+from pathlib import Path
+
+
+def add_telemetry_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--trace", type=Path, metavar="FILE", help="JSONL trace (default: .cache/telemetry/<command>-<run>.jsonl)")
+    parser.add_argument("--metrics", type=Path, metavar="FILE", help="Prometheus textfile (default: .cache/telemetry/modelit_<command>.prom)")
+
+
+def start_recorder(args: argparse.Namespace, command: str):
+    from ..telemetry import Recorder
+
+    return Recorder(command, trace_file=args.trace, metrics_file=args.metrics)
+
+
+def print_telemetry(recorder) -> None:
+    print("\nTELEMETRY")
+    for line in recorder.finish():
+        print(f"  {line}")
+    print(f"  trace: {recorder.trace_file}")
+    print(f"  metrics: {recorder.metrics_file}")
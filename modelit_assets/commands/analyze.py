@@ -0,0 +1,149 @@
+"""Analyze scene images with a vision model.
+
+Results are keyed by content hash in images/scene_analysis.json, so only
+new or changed scenes are sent again. With --batch, the requests go to the
+OpenAI Batch API as one JSONL job at batch pricing. The job ID is saved in
+.cache/analysis-batches/current.json, so an interrupted or --detach'ed run
+resumes the same job when --batch is given again.
+"""
+
+import argparse
+
+from . import add_telemetry_arguments, print_telemetry, start_recorder
+
+HELP = "describe scene images with a vision model"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--workers", type=int, default=4, help="concurrent analysis requests")
+    parser.add_argument("--max-edge", type=int, default=768, help="downscale to this edge before upload (0 = send originals)")
+    parser.add_argument("--format", choices=["jpeg", "webp"], default="jpeg", help="upload encoding")
+    parser.add_argument("--quality", type=int, default=80, help="upload encoding quality")
+    parser.add_argument("--force", action="store_true", help="re-analyze images that already have results")
+    parser.add_argument(
+        "--only-suspicious",
+        type=float,
+        metavar="THRESHOLD",
+        help="only send scenes the offline consistency index scores at or above THRESHOLD",
+    )
+    parser.add_argument(
+        "--adopt-existing",
+        action="store_true",
+        help="treat results saved without a content hash as current instead of re-analyzing them",
+    )
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--batch", action="store_true", help="submit one Batch API job instead of live requests")
+    batch.add_argument("--detach", action="store_true", help="submit (or confirm) the job and exit without waiting")
+    batch.add_argument("--poll-interval", type=float, default=10, help="initial seconds between status checks")
+    batch.add_argument("--max-poll-interval", type=float, default=300, help="cap on the growing poll interval")
+    batch.add_argument("--timeout", type=float, help="stop polling after this many seconds; the job keeps running")
+    add_telemetry_arguments(parser)
+
+
+def run(args: argparse.Namespace) -> int:
+    from ..analysis import ANALYSIS_FILE, run_analysis
+    from ..http import openai_client
+    from ..paths import SCENES_DIR
+    from ..preprocess import PreprocessOptions
+
+    client = openai_client()
+
+    preprocess = None
+    if args.max_edge:
+        preprocess = PreprocessOptions(args.max_edge, args.format, args.quality)
+
+    def report(path, outcome):
+        if outcome.error:
+            print(f"Failed {path.name}: {outcome.error}")
+        else:
+            saved = (outcome.source_bytes - outcome.sent_bytes) // 1024
+            print(f"Analyzed {path.name} (sent {outcome.sent_bytes // 1024} KB, saved {saved} KB)")
+
+    images = sorted(SCENES_DIR.glob("*.png"))
+    if args.only_suspicious is not None:
+        from ..consistency import build_index, rank, suspicious
+
+        index, _ = build_index(images)
+        flagged = {r.name for r in suspicious(rank(index), args.only_suspicious)}
+        print(f"Consistency pre-filter kept {len(flagged)} of {len(images)} scenes.")
+        images = [path for path in images if path.name in flagged]
+
+    recorder = start_recorder(args, "analyze")
+    if args.batch:
+        return run_batch_mode(args, client, images, preprocess, recorder)
+
+    from ..analysis_batch import STATE_FILE
+
+    if STATE_FILE.exists():
+        print(f"NOTE: a batch job is pending in {STATE_FILE}; rerun with --batch to collect it.")
+    result = run_analysis(
+        client,
+        images,
+        workers=args.workers,
+        preprocess=preprocess,
+        force=args.force,
+        adopt_unhashed=args.adopt_existing,
+        on_result=report,
+        telemetry=recorder,
+    )
+
+    print(
+        f"\nAnalysis complete: {len(result.analyzed)} analyzed, "
+        f"{len(result.skipped)} unchanged, {len(result.failed)} failed."
+    )
+    print(
+        f"Uploaded {result.sent_bytes / 1024**2:.1f} MB of {result.source_bytes / 1024**2:.1f} MB "
+        f"({result.saved_bytes / 1024**2:.1f} MB saved)."
+    )
+    print(f"Summary saved to {ANALYSIS_FILE}")
+    print_telemetry(recorder)
+    return 1 if result.failed else 0
+
+
+def run_batch_mode(args: argparse.Namespace, client, images, preprocess, recorder) -> int:
+    from ..analysis import ANALYSIS_FILE
+    from ..analysis_batch import STATE_FILE, BatchError, run_batch
+
+    def report_status(batch) -> None:
+        counts = batch.request_counts
+        progress = f" {counts.completed + counts.failed}/{counts.total}" if counts and counts.total else ""
+        print(f"  {batch.id}: {batch.status}{progress}", flush=True)
+
+    try:
+        result = run_batch(
+            client,
+            images,
+            preprocess=preprocess,
+            force=args.force,
+            adopt_unhashed=args.adopt_existing,
+            detach=args.detach,
+            interval=args.poll_interval,
+            max_interval=args.max_poll_interval,
+            timeout=args.timeout,
+            on_status=report_status,
+            telemetry=recorder,
+        )
+    except TimeoutError as exc:
+        raise SystemExit(f"{exc}. Rerun with --batch to resume; state is in {STATE_FILE}.")
+    except BatchError as exc:
+        raise SystemExit(str(exc))
+
+    if result.batch_id is None:
+        recorder.finish()
+        print(f"\nNothing to analyze: {len(result.skipped)} unchanged.")
+        return 0
+    if result.resumed:
+        print(f"Resumed batch {result.batch_id}.")
+    if result.detached:
+        recorder.finish()
+        print(f"\nSubmitted batch {result.batch_id}. Rerun with --batch to collect the results.")
+        return 0
+    for name, error in sorted(result.failed.items()):
+        print(f"Failed {name}: {error}")
+    print(
+        f"\nBatch {result.batch_id} {result.status}: {len(result.analyzed)} analyzed, "
+        f"{len(result.skipped)} unchanged, {len(result.failed)} failed."
+    )
+    print(f"Summary saved to {ANALYSIS_FILE}")
+    print_telemetry(recorder)
+    return 1 if result.failed else 0
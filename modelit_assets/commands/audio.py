@@ -0,0 +1,49 @@
+"""Transcode the voice clips and background music to trimmed, normalized Opus.
+
+Clips from audio/voice/ and audio/background_music.mp3 are re-encoded with
+ffmpeg into audio/opus/. Speech is trimmed of leading and trailing silence;
+both are loudness-normalized. A manifest of source hashes and settings
+means only new or changed files are encoded again.
+"""
+
+import argparse
+
+HELP = "transcode voice clips and music to Opus"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--workers", type=int, help="parallel ffmpeg processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="re-encode every file")
+
+
+def run(args: argparse.Namespace) -> int:
+    from ..audio import MUSIC, OUTPUT_DIR, SPEECH, AudioToolError, load_manifest, optimize_audio, size_report
+    from ..paths import AUDIO_DIR, VOICE_DIR
+
+    jobs = [(source, OUTPUT_DIR / "voice" / f"{source.stem}.ogg", SPEECH) for source in sorted(VOICE_DIR.glob("*.mp3"))]
+    music = AUDIO_DIR / "background_music.mp3"
+    if music.exists():
+        jobs.append((music, OUTPUT_DIR / "background_music.ogg", MUSIC))
+
+    def report_built(entry: dict) -> None:
+        print(
+            f"[OK] {entry['source']}: {entry['size'] // 1024} KB -> {entry['output_bytes'] // 1024} KB, "
+            f"{entry['duration_in']:.1f}s -> {entry['duration_out']:.1f}s"
+        )
+
+    try:
+        report = optimize_audio(jobs, workers=args.workers, force=args.force, on_built=report_built)
+    except AudioToolError as exc:
+        raise SystemExit(str(exc))
+
+    for name, error in sorted(report.failed.items()):
+        print(f"[FAIL] {name}: {error}")
+    print(f"\nCOMPLETE: {len(report.built)} encoded, {len(report.unchanged)} unchanged, {len(report.failed)} failed")
+    totals = size_report(load_manifest())
+    if totals["files"]:
+        print(
+            f"  {totals['files']} files: {totals['bytes_in'] / 1024**2:.1f} MB -> {totals['bytes_out'] / 1024**2:.1f} MB "
+            f"({100 * totals['bytes_out'] / totals['bytes_in']:.0f}%), "
+            f"{totals['duration_in']:.0f}s -> {totals['duration_out']:.0f}s of audio"
+        )
+    return 1 if report.failed else 0
@@ -0,0 +1,90 @@
+"""Benchmark generation, download, analysis and validation.
+
+Runs against a local fake OpenRouter/OpenAI server over synthetic asset
+sets. Results are appended to .cache/benchmarks/history.jsonl and compared
+with the previous run that used the same settings, or with --baseline.
+"""
+
+import argparse
+from pathlib import Path
+
+HELP = "benchmark the asset pipeline against a local fake provider"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--scenes", type=int, nargs="+", default=[49, 1000], help="synthetic asset set sizes")
+    parser.add_argument(
+        "--phases",
+        default="generate,download,analyze,validate",
+        help="comma-separated subset of generate,download,analyze,validate",
+    )
+    parser.add_argument("--latency", type=float, default=0.05, help="fake provider seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503 responses")
+    parser.add_argument("--rate-limit", type=int, default=0, help="fake provider requests per second (0 = unlimited)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of downloads cut off mid-body")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent requests")
+    parser.add_argument("--rps", type=float, default=500.0, help="client-side token bucket rate")
+    parser.add_argument("--baseline", type=Path, metavar="FILE", help="compare with the last run recorded in this history.jsonl instead of the last matching run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown fraction reported as a regression")
+    parser.add_argument("--no-save", action="store_true", help="do not append this run to the history")
+
+
+def run(args: argparse.Namespace) -> int:
+    from ..benchmark import (
+        PHASES,
+        BenchSettings,
+        append_history,
+        compare,
+        load_baseline,
+        load_record,
+        make_record,
+        run_benchmarks,
+    )
+
+    phases = tuple(name.strip() for name in args.phases.split(",") if name.strip())
+    unknown = set(phases) - set(PHASES)
+    if unknown:
+        raise SystemExit(f"Unknown phases: {', '.join(sorted(unknown))}")
+    settings = BenchSettings(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        drop_rate=args.drop_rate,
+        workers=args.workers,
+        requests_per_second=args.rps,
+    )
+
+    print(f"{'phase':<14} {'scenes':>6} {'seconds':>8} {'items/s':>9} {'p50':>6} {'p95':>6} {'failed':>6}")
+
+    def show(result):
+        p50 = f"{result.p50:.3f}" if result.p50 is not None else "-"
+        p95 = f"{result.p95:.3f}" if result.p95 is not None else "-"
+        print(
+            f"{result.phase:<14} {result.scenes:>6} {result.seconds:>8.3f} {result.per_second:>9.1f} "
+            f"{p50:>6} {p95:>6} {result.failed:>6}"
+        )
+
+    if args.baseline:
+        baseline = load_record(args.baseline)
+        if baseline is None:
+            raise SystemExit(f"{args.baseline} has no benchmark records.")
+    else:
+        baseline = load_baseline(settings)
+    results = run_benchmarks(tuple(args.scenes), phases, settings, on_result=show)
+    record = make_record(results, settings)
+    if not args.no_save:
+        append_history(record)
+
+    if baseline is None:
+        print("\nNo earlier run with these settings to compare against.")
+        return 0
+    print(f"\nCompared with {baseline.get('revision') or 'unknown revision'} ({baseline['timestamp']}):")
+    regressed = False
+    for comparison in compare(results, baseline, args.threshold):
+        marker = "  REGRESSION" if comparison.regressed else ""
+        print(
+            f"  {comparison.phase:<14} {comparison.scenes:>6}  {comparison.before:.3f}s -> "
+            f"{comparison.after:.3f}s ({comparison.change:+.0%}){marker}"
+        )
+        regressed = regressed or comparison.regressed
+    return 1 if regressed else 0
@@ -0,0 +1,65 @@
+"""Build a deployable dist/ tree with content-hashed, precompressed assets.
+
+Assets are copied to name.<hash>.ext and every reference in the HTML pages,
+story-data.js and scene-image-mapping.json is rewritten to match. Text files
+get .gz siblings, plus .br ones when the optional brotli module is
+installed. The story is also split into per-chapter chunks under
+dist/story/. dist/asset-manifest.json maps each logical path to its hashed
+file. Reruns only touch files whose content changed and prune the rest.
+
+The review grid's thumbnails under images/scenes/thumbs/ are generated
+files, not committed ones, so the build also brings them and
+image-review-grid.html up to date (skip with --no-review).
+"""
+
+import argparse
+from pathlib import Path
+
+HELP = "build dist/ with hashed, precompressed assets"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--out", type=Path, help="output directory (default: dist/)")
+    parser.add_argument("--no-compress", action="store_true", help="skip the .gz/.br siblings")
+    parser.add_argument("--no-review", action="store_true", help="do not refresh the review grid thumbnails")
+
+
+def run(args: argparse.Namespace) -> int:
+    import time
+
+    from ..contact_sheet import build_review_grid
+    from ..dist import DIST_DIR, build_dist
+
+    out_dir = args.out or DIST_DIR
+    review = None
+    if not args.no_review:
+        review = build_review_grid()
+        for name, error in sorted(review.failed.items()):
+            print(f"[FAIL] thumbnail {name}: {error}")
+        print(f"REVIEW: {len(review.built)} thumbnails rendered, {review.unchanged} cached, {len(review.pruned)} pruned")
+
+    started = time.perf_counter()
+    manifest, report = build_dist(out_dir=out_dir, compress=not args.no_compress)
+    elapsed = time.perf_counter() - started
+
+    for relative in report.written:
+        print(f"[WRITE] {relative}")
+    for relative in report.pruned:
+        print(f"[PRUNE] {relative}")
+    for relative in report.missing:
+        print(f"[MISS] {relative}")
+    for problem in report.chunk_problems:
+        print(f"[FAIL] story chunks: {problem}")
+
+    print(
+        f"\nBUILD: {len(manifest)} assets -> {out_dir}; {len(report.written)} written, "
+        f"{report.unchanged} unchanged, {len(report.pruned)} pruned in {elapsed:.2f}s"
+    )
+    if report.raw_bytes:
+        line = f"COMPRESSION: text {report.raw_bytes / 1024:.0f} KB, gzip {report.gzip_bytes / 1024:.0f} KB"
+        if report.brotli:
+            line += f", brotli {report.brotli_bytes / 1024:.0f} KB"
+        else:
+            line += " (install brotli for .br variants)"
+        print(line)
+    return 1 if report.missing or report.chunk_problems or (review and review.failed) else 0
@@ -0,0 +1,52 @@
+"""Split story-data.js into per-chapter JSON chunks and check the round trip.
+
+Each chapter becomes one minified chunk, story/ch<N>.json. A small
+story/index.json lists every chapter's title, chunk file and the images and
+voice clips it needs, so the game can prefetch chapter N+1 during chapter N.
+Without --out this only verifies that the chunks rebuild STORY_DATA exactly
+and prints their sizes. modelit-assets build writes hashed chunks into dist/.
+"""
+
+import argparse
+from pathlib import Path
+
+HELP = "split the story into per-chapter chunks and verify them"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--out", type=Path, metavar="DIR", help="write story/ch<N>.json and story/index.json under DIR")
+
+
+def run(args: argparse.Namespace) -> int:
+    import gzip
+
+    from ..chunks import split_story, verify, write_chunks
+    from ..story import STORY_FILE, load_story
+
+    story = load_story()
+    chunks = split_story(story)
+    problems = verify(story, chunks)
+
+    index_bytes = chunks.index_bytes
+    for entry in chunks.index["chapters"]:
+        data = chunks.files[entry["file"]]
+        print(
+            f"  {entry['file']:<18} {len(data) / 1024:6.1f} KB ({len(gzip.compress(data)) / 1024:5.1f} KB gz)  "
+            f"{len(entry['images'])} images, {len(entry['voices'])} voices  {entry['title']}"
+        )
+    largest = max(len(data) for data in chunks.files.values())
+    print(
+        f"\nCHUNKS: {len(chunks.files)} chapters, index {len(index_bytes) / 1024:.1f} KB, largest chunk "
+        f"{largest / 1024:.1f} KB (story-data.js is {STORY_FILE.stat().st_size / 1024:.1f} KB)"
+    )
+
+    for problem in problems:
+        print(f"[FAIL] {problem}")
+    if problems:
+        return 1
+    print("ROUND TRIP: chunks rebuild STORY_DATA exactly")
+
+    if args.out:
+        changed = write_chunks(chunks, args.out)
+        print(f"WROTE: {len(changed)} changed files under {args.out}")
+    return 0
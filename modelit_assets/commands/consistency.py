@@ -0,0 +1,44 @@
+"""Rank scene images by likely character inconsistency, offline.
+
+Every scene is scored by how much of each CHARACTER_REF colour it is
+missing compared with the typical scene, plus its colour-histogram distance
+from the reference scene (see modelit_assets.consistency). Features are
+cached in .cache/consistency-index.npz by content hash, so repeat scans
+only decode new or changed images. Scenes without the character are
+reported separately rather than flagged.
+"""
+
+import argparse
+
+HELP = "rank scenes by likely off-model character (no API calls)"
+DEFAULT_THRESHOLD = 0.45
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help=f"score at which a scene is flagged (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--all", action="store_true", help="list every scene, not just flagged ones")
+
+
+def run(args: argparse.Namespace) -> int:
+    import time
+
+    from ..consistency import INDEX_FILE, build_index, rank, suspicious
+    from ..paths import SCENES_DIR
+
+    started = time.perf_counter()
+    index, decoded = build_index(sorted(SCENES_DIR.glob("*.png")))
+    rankings = rank(index)
+    flagged = suspicious(rankings, args.threshold)
+    elapsed = time.perf_counter() - started
+
+    for r in rankings if args.all else flagged:
+        coverage = " ".join(f"{key}={value:.3f}" for key, value in r.coverage.items())
+        print(f"{r.score:.3f}  {r.name:45s} {r.status:13s} {coverage}  hist={r.histogram_distance:.2f} phash={r.phash_distance}")
+
+    absent = sum(1 for r in rankings if r.status == "no character")
+    print(
+        f"\n{len(flagged)} of {len(rankings)} scenes flagged at >= {args.threshold}, "
+        f"{absent} without the character ({decoded} decoded, {elapsed:.2f}s)"
+    )
+    print(f"Index: {INDEX_FILE}")
+    return 0
@@ -0,0 +1,65 @@
+"""Query the vision-analysis results through an indexed local store.
+
+scene_analysis.json is mirrored into .cache/scene-analysis.sqlite3 (only
+when it changed) with each image's hash, chapter and the flag terms its
+analysis asserts. Flag terms match whole words in clauses that are not
+negated, so "offers" and "no inconsistencies or anything that feels off"
+are not findings. By default this lists the analyses with any flag; filter
+by --term, --chapter, --state (stale means the image changed since it was
+analyzed) or an FTS5 --match query, and use --all to drop the flag filter.
+"""
+
+import argparse
+
+HELP = "query analysis results by flag term, chapter, staleness or text"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    # Terms are checked by the store when the query runs, so the parser needs no analysis import.
+    parser.add_argument("--term", action="append", metavar="TERM", help="only this flag term, e.g. off or inconsist (repeatable)")
+    parser.add_argument("--all", action="store_true", help="include analyses without flags")
+    parser.add_argument("--chapter", type=int, metavar="N", help="only images of chapter N")
+    parser.add_argument("--state", choices=("current", "stale", "unhashed", "missing"), help="only analyses in this state relative to the image on disk")
+    parser.add_argument("--match", metavar="QUERY", help='FTS5 full-text query, e.g. "NEAR(hairstyle bun)" or "earring*"')
+    parser.add_argument("--history", action="store_true", help="include analyses from earlier review rounds")
+    parser.add_argument("--limit", type=int, metavar="N", help="stop after N results")
+    parser.add_argument("--full", action="store_true", help="print the whole analysis, not just the flagged clauses")
+
+
+def run(args: argparse.Namespace) -> int:
+    import time
+
+    from ..analysis_store import AnalysisStore, StoreError
+
+    started = time.perf_counter()
+    shown = 0
+    with AnalysisStore() as store:
+        added = store.sync()
+        store.refresh_images()
+        rows = store.query(
+            terms=args.term,
+            flagged=not args.all,
+            chapter=args.chapter,
+            state=args.state,
+            match=args.match,
+            history=args.history,
+            limit=args.limit,
+        )
+        try:
+            for row in rows:
+                shown += 1
+                terms = ", ".join(dict.fromkeys(term for term, _ in row.flags)) or "no flags"
+                when = f", analyzed {row.analyzed_at}" if row.analyzed_at else ""
+                earlier = "" if row.latest else ", earlier round"
+                print(f"\n{row.image} [{row.state}{earlier}{when}] {terms}")
+                if args.full:
+                    print(f"  {row.analysis}")
+                else:
+                    for term, clause in row.flags:
+                        print(f"  {term}: {clause}")
+        except StoreError as exc:
+            raise SystemExit(str(exc))
+
+    elapsed = time.perf_counter() - started
+    print(f"\nFound {shown} {'analyses' if args.all else 'flagged analyses'} ({added} newly indexed, {elapsed * 1000:.0f} ms).")
+    return 0
@@ -0,0 +1,260 @@
+"""Regenerate scene images from scene-prompts.json through OpenRouter.
+
+Only scenes whose prompt inputs changed since scene-prompts.lock.json was
+written are sent. Those inputs are the shared fragments, the template, the
+model request and the scene description. Use --dry-run to see the plan,
+cost and time first. Without a lock file every scene looks stale, so
+generate refuses to run until --adopt has recorded the current images
+(or --force asks for a full regeneration). Results are also cached by prompt, so retrying a
+failed run does not pay again for images that already succeeded.
+
+With --candidates N each scene is generated N times, always fresh rather
+than from the cache, and scenes named with --only are re-rolled even when
+they are up to date. The candidates are scored offline against the
+character palette and the reference scene, the best one replaces the scene
+image and every candidate is archived under .cache/candidates/<scene>/<run>/.
+Only scenes the local score cannot decide are sent to the vision analyzer.
+"""
+
+import argparse
+from pathlib import Path
+
+from . import add_telemetry_arguments, print_telemetry, start_recorder
+
+HELP = "regenerate scene images whose prompts changed"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("profile", help="prompt profile from scene-prompts.json (e.g. nano-banana, characters)")
+    parser.add_argument("--dry-run", action="store_true", help="print the plan, estimated cost and time, then stop")
+    parser.add_argument("--only", action="append", metavar="SCENE", help="limit to this scene key (repeatable)")
+    parser.add_argument("--adopt", action="store_true", help="record the current images as up to date without generating")
+    parser.add_argument("--skip-model-check", action="store_true", help="do not check the model against the catalog")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent generation requests")
+    parser.add_argument("--force", action="store_true", help="regenerate every scene in the profile, bypassing the cache")
+    parser.add_argument("--candidates", type=int, default=1, metavar="N", help="generate N candidates per scene and keep the best")
+    parser.add_argument("--no-escalate", action="store_true", help="with --candidates, never send ambiguous scenes to the vision analyzer")
+    parser.add_argument("--cache-max-mb", type=int, default=2048, help="evict least recently used entries above this size")
+    parser.add_argument("--cache-max-age-days", type=float, default=90, help="evict entries unused for this long")
+    add_telemetry_arguments(parser)
+
+
+def print_plan(plan, workers: int, candidates: int = 1) -> None:
+    for item in plan.build:
+        print(f"  {item.scene.key}: {', '.join(item.reasons)}")
+    minutes = plan.estimated_seconds(workers, candidates=candidates) / 60
+    per_scene = f" x {candidates} candidates" if candidates > 1 else ""
+    print(
+        f"\nPLAN: {len(plan.build)}{per_scene} to generate, {len(plan.current)} up to date; "
+        f"estimated ${plan.cost * candidates:.2f} and {minutes:.1f} min with {workers} workers"
+    )
+
+
+def model_problem(model_id: str) -> str | None:
+    """Why ``model_id`` cannot produce images per the cached catalog, if it cannot."""
+    from .. import config
+    from ..catalog import CatalogError, check_model, load_catalog
+
+    try:
+        catalog = load_catalog(api_key=config.get("OPENROUTER_API_KEY"))
+    except CatalogError as exc:
+        print(f"WARNING: skipping model check ({exc})")
+        return None
+    try:
+        check_model(catalog, model_id, output="image")
+    except CatalogError as exc:
+        return str(exc)
+    return None
+
+
+def run(args: argparse.Namespace) -> int:
+    from .. import config
+    from ..cache import GenerationCache
+    from ..engine import GenerationEngine, ImageJob
+    from ..paths import BASE_DIR
+    from ..prompts import LOCK_FILE, PromptManifest, PromptManifestError, load_lock, plan, record, save_lock
+
+    if args.candidates < 1:
+        raise SystemExit("--candidates must be at least 1")
+    try:
+        manifest = PromptManifest.load()
+        lock = load_lock(LOCK_FILE)
+        build_plan = plan(
+            manifest,
+            args.profile,
+            lock=lock,
+            only=set(args.only) if args.only else None,
+            # Best-of-N on named scenes is a deliberate re-roll.
+            force=args.force or (args.candidates > 1 and bool(args.only)),
+        )
+    except PromptManifestError as exc:
+        raise SystemExit(str(exc))
+    profile = build_plan.profile
+
+    print("=" * 70)
+    print(profile.title)
+    print("=" * 70)
+    print(f"\nModel: {profile.request['model']}")
+    print(f"Workers: {args.workers}\n")
+    print_plan(build_plan, args.workers, args.candidates)
+    print("=" * 70)
+
+    problem = None
+    if build_plan.build and not (args.adopt or args.skip_model_check):
+        problem = model_problem(profile.request["model"])
+    unlocked = None
+    if not LOCK_FILE.exists() and not (args.adopt or args.force):
+        unlocked = (
+            f"{LOCK_FILE.name} is missing, so every scene counts as stale. Record the current images with\n"
+            f"  modelit-assets generate {args.profile} --adopt\n"
+            "or pass --force to regenerate them all."
+        )
+    if args.dry_run:
+        for warning in (problem, unlocked):
+            if warning:
+                print(f"\nWARNING: {warning}")
+        return 0
+    if unlocked:
+        raise SystemExit(unlocked)
+    if problem:
+        raise SystemExit(f"{problem}\nFix scene-prompts.json or pass --skip-model-check.")
+    if args.adopt:
+        adopted = [item.scene for item in build_plan.build if (BASE_DIR / item.scene.output).exists()]
+        for scene in adopted:
+            record(lock, scene)
+        save_lock(lock, LOCK_FILE)
+        print(f"\nRecorded {len(adopted)} existing images as up to date.")
+        return 0
+    if not build_plan.build:
+        print("\nNothing to regenerate.")
+        return 0
+
+    api_key = config.require("OPENROUTER_API_KEY", "generate images")
+    if args.candidates > 1:
+        return run_best_of_n(args, api_key, profile, [item.scene for item in build_plan.build], lock)
+    scenes = {item.scene.output: item.scene for item in build_plan.build}
+    jobs = [ImageJob(output, scene.payload) for output, scene in scenes.items()]
+    done = 0
+
+    def report_result(result):
+        nonlocal done
+        done += 1
+        print(f"\n[{done}/{len(jobs)}] {Path(result.job.filename).name}")
+        if result.cached:
+            print(f"  CACHED ({result.size // 1024}KB)")
+        elif result.ok:
+            print(f"  SUCCESS ({result.size // 1024}KB, {result.attempts} attempt(s), {result.elapsed:.1f}s)")
+        else:
+            print(f"  FAILED: {result.error[:200]}")
+        if result.ok:
+            record(lock, scenes[result.job.filename])
+
+    recorder = start_recorder(args, f"generate-{profile.name}")
+    cache = GenerationCache(max_bytes=args.cache_max_mb * 1024 * 1024, max_age_days=args.cache_max_age_days)
+    engine = GenerationEngine(
+        api_key,
+        BASE_DIR,
+        title=profile.request_title,
+        max_workers=args.workers,
+        cache=cache,
+        force=args.force,
+        telemetry=recorder,
+    )
+    try:
+        summary = engine.run(jobs, report_result)
+    finally:
+        save_lock(lock, LOCK_FILE)
+
+    print("\n" + "=" * 70)
+    print(f"COMPLETE: {summary.succeeded}/{len(jobs)} successful, {summary.failed} failed")
+    print(f"THROUGHPUT: {summary.images_per_minute:.1f} images/min ({summary.elapsed:.1f}s)")
+    print(f"CACHE: {summary.cache_hits} hits, {summary.cache_misses} misses (evicted {evicted}, {freed // 1024}KB freed)")
+    if recorder.billed_cost is not None:
+        print(f"COST: ${recorder.billed_cost:.4f} billed")
+    elif profile.cost_per_image:
+        print(f"COST: ~${summary.cache_misses * profile.cost_per_image:.2f} estimated (cache misses only)")
+    print("=" * 70)
+    print_telemetry(recorder)
+
+    if summary.failed:
+        print("\nRe-run the same command to retry the failed images; cached results are reused.")
+        return 1
+    return 0
+
+
+def run_best_of_n(args: argparse.Namespace, api_key: str, profile, scenes, lock) -> int:
+    from ..candidates import BestOfN, Scorer, escalate, keep_winner
+    from ..engine import GenerationEngine
+    from ..paths import BASE_DIR
+    from ..prompts import LOCK_FILE, record, save_lock
+
+    best_of = BestOfN(scenes, args.candidates, scorer=Scorer())
+    ambiguous, kept, failed = [], [], []
+
+    def keep(selection) -> None:
+        output = keep_winner(selection)
+        record(lock, selection.scene)
+        kept.append(selection)
+        winner = selection.winner
+        how = "analyzer" if selection.escalated else "local score"
+        print(f"  KEPT {output.name}: candidate {winner.path.stem} (score {winner.score:.3f}, {how})")
+
+    def report_result(result):
+        if not result.ok:
+            print(f"  FAILED {result.job.filename}: {result.error[:200]}")
+        selection = best_of.add(result)
+        if selection is None:
+            return
+        scores = ", ".join(f"{c.path.stem}={c.score:.3f}" for c in selection.candidates)
+        print(f"\n[{selection.scene.key}] {len(selection.candidates)}/{args.candidates} candidates: {scores or 'none'}")
+        if not selection.candidates:
+            failed.append(selection)
+        elif selection.ambiguous and not args.no_escalate:
+            print(f"  AMBIGUOUS: {selection.ambiguous}; queued for the analyzer")
+            ambiguous.append(selection)
+        else:
+            if selection.ambiguous:
+                print(f"  AMBIGUOUS: {selection.ambiguous}; keeping the local winner, review it by hand")
+            keep(selection)
+
+    recorder = start_recorder(args, f"generate-{profile.name}-best-of-{args.candidates}")
+    # No prompt cache: N requests for one prompt must give N different images.
+    engine = GenerationEngine(
+        api_key,
+        BASE_DIR,
+        title=profile.request_title,
+        max_workers=args.workers,
+        telemetry=recorder,
+    )
+    try:
+        summary = engine.run(best_of.jobs, report_result)
+        if ambiguous:
+            from ..http import openai_client
+
+            contenders = sum(len(selection.contenders) for selection in ambiguous)
+            print(f"\nESCALATING: {len(ambiguous)} ambiguous scenes, {contenders} candidates to the analyzer")
+            for path, error in escalate(openai_client(), ambiguous, workers=args.workers).items():
+                print(f"  [FAIL] {Path(path).relative_to(BASE_DIR)}: {error}")
+            for selection in ambiguous:
+                for candidate in selection.contenders:
+                    if candidate.flags is not None:
+                        print(f"  {selection.scene.key}/{candidate.path.stem}: flags {candidate.flags or 'none'}")
+                keep(selection)
+    finally:
+        save_lock(lock, LOCK_FILE)
+
+    print("\n" + "=" * 70)
+    print(
+        f"COMPLETE: {len(kept)}/{len(scenes)} scenes replaced from {summary.succeeded} candidates, "
+        f"{len(failed)} scenes with no usable candidate"
+    )
+    unsure = [selection for selection in kept if selection.ambiguous]
+    if unsure:
+        print(
+            f"AMBIGUOUS: {len(unsure)} scenes, {sum(s.escalated for s in unsure)} decided by the analyzer; "
+            f"see selection.json under .cache/candidates/<scene>/{best_of.run}/ for the scores"
+        )
+    print(f"THROUGHPUT: {summary.images_per_minute:.1f} images/min ({summary.elapsed:.1f}s)")
+    print("=" * 70)
+    print_telemetry(recorder)
+    return 1 if failed or summary.failed else 0
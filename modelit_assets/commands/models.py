@@ -0,0 +1,60 @@
+"""Query the OpenRouter model catalog.
+
+The catalog is cached in .cache/openrouter-models.json and revalidated with
+ETag/If-Modified-Since once it is older than --ttl-hours, so repeated
+queries run offline. Prices are USD per million tokens.
+"""
+
+import argparse
+
+HELP = "query the cached OpenRouter model catalog"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--filter", help="case-insensitive substring of the model id or name")
+    parser.add_argument("--output", metavar="MODALITY", help="only models that produce this modality (text, image, audio)")
+    parser.add_argument("--input", metavar="MODALITY", help="only models that accept this modality (text, image, file)")
+    parser.add_argument("--max-price", type=float, metavar="USD", help="max prompt+completion price per million tokens")
+    parser.add_argument("--min-context", type=int, default=0, help="minimum context length in tokens")
+    parser.add_argument("--free", action="store_true", help="only free models")
+    parser.add_argument("--cheapest", action="store_true", help="print only the cheapest match")
+    parser.add_argument("--refresh", action="store_true", help="download the full catalog now")
+    parser.add_argument("--offline", action="store_true", help="never touch the network")
+    parser.add_argument("--ttl-hours", type=float, default=24, help="revalidate the cache after this long")
+
+
+def run(args: argparse.Namespace) -> int:
+    import time
+
+    from .. import config
+    from ..catalog import CatalogError, load_catalog
+
+    try:
+        catalog = load_catalog(
+            api_key=config.get("OPENROUTER_API_KEY"),
+            ttl=args.ttl_hours * 3600,
+            force=args.refresh,
+            offline=args.offline,
+        )
+    except CatalogError as exc:
+        raise SystemExit(str(exc))
+
+    matches = catalog.query(
+        output=args.output,
+        input=args.input,
+        text=args.filter,
+        max_price=args.max_price / 1e6 if args.max_price is not None else None,
+        min_context=args.min_context,
+        free=True if args.free else None,
+    )
+    if args.cheapest:
+        matches = matches[:1]
+    for model in matches:
+        print(
+            f"{model.id:<55} {model.context_length:>9,} ctx  "
+            f"${model.prompt_price * 1e6:>7.2f} in  ${model.completion_price * 1e6:>7.2f} out  "
+            f"{'+'.join(model.input_modalities)} -> {'+'.join(model.output_modalities)}"
+        )
+    age = (time.time() - catalog.fetched_at) / 3600
+    print(f"\n{len(matches)} of {len(catalog.models)} models (catalog fetched {age:.1f} h ago)")
+    return 0 if matches else 1
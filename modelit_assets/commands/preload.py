@@ -0,0 +1,38 @@
+"""Compute per-screen prefetch lists from story-data.js.
+
+For every screen the story can show, preload-manifest.json lists the images
+and voice clips the player may need within --depth steps, most likely first
+and with their sizes, so the game can fetch them before they are needed.
+"""
+
+import argparse
+from pathlib import Path
+
+HELP = "write the per-screen asset preload manifest"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--depth", type=int, default=3, help="how many screens ahead to look (default: 3)")
+    parser.add_argument("--output", type=Path, metavar="FILE", help="manifest path (default: preload-manifest.json)")
+
+
+def run(args: argparse.Namespace) -> int:
+    import json
+
+    from ..files import atomic_write_bytes
+    from ..preload import PRELOAD_FILE, preload_manifest
+    from ..story import load_mapping, load_story
+
+    output = args.output or PRELOAD_FILE
+    manifest = preload_manifest(load_story(), args.depth, mapping=load_mapping())
+    atomic_write_bytes(output, (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+
+    nodes = manifest["nodes"]
+    missing = sorted({e["url"] for entries in nodes.values() for e in entries if e["bytes"] is None})
+    largest = max(nodes.items(), key=lambda item: sum(e["bytes"] or 0 for e in item[1]))
+    for url in missing:
+        print(f"WARNING: referenced asset not found: {url}")
+    print(f"PRELOAD: {len(nodes)} screens, looking {args.depth} steps ahead")
+    print(f"  largest prefetch set: {largest[0]} ({sum(e['bytes'] or 0 for e in largest[1]) / 1024**2:.1f} MB)")
+    print(f"  manifest: {output}")
+    return 0
@@ -0,0 +1,60 @@
+"""Build responsive WebP (and optionally AVIF) derivatives of the scene images.
+
+Each scene PNG under images/scenes/ is resized to every --widths entry and
+written to images/scenes/responsive/. A manifest of source hashes and
+settings means only new or changed scenes are re-encoded. scene-image-srcset.json maps every scene key to its
+srcset for the game to load.
+"""
+
+import argparse
+
+HELP = "build responsive WebP/AVIF scene images and the srcset mapping"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--widths", default="480,768,1024", help="comma-separated output widths (default: 480,768,1024)")
+    parser.add_argument("--quality", type=int, default=78, help="encoder quality (default: 78)")
+    parser.add_argument("--avif", action="store_true", help="also emit AVIF (needs Pillow with AVIF support)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="rebuild every source")
+
+
+def run(args: argparse.Namespace) -> int:
+    import json
+
+    from ..derivatives import SRCSET_FILE, DerivativeSettings, avif_supported, build_derivatives, srcset_mapping
+    from ..files import atomic_write_bytes
+    from ..paths import SCENES_DIR
+    from ..story import load_mapping
+
+    formats = ("webp",)
+    if args.avif:
+        if not avif_supported():
+            raise SystemExit("This Pillow build cannot write AVIF; install Pillow >= 11.3 or drop --avif.")
+        formats = ("avif", "webp")
+    try:
+        widths = tuple(int(width) for width in args.widths.split(","))
+    except ValueError:
+        raise SystemExit(f"--widths must be comma-separated integers, got {args.widths!r}")
+
+    settings = DerivativeSettings(widths=widths, formats=formats, quality=args.quality)
+    manifest, report = build_derivatives(
+        sorted(SCENES_DIR.glob("*.png")),
+        settings,
+        workers=args.workers,
+        force=args.force,
+        on_built=lambda name: print(f"[OK] {name}"),
+    )
+    srcset = srcset_mapping(manifest, load_mapping())
+    atomic_write_bytes(SRCSET_FILE, (json.dumps(srcset, indent=2) + "\n").encode("utf-8"))
+
+    for name, error in sorted(report.failed.items()):
+        print(f"[FAIL] {name}: {error}")
+    print(
+        f"\nCOMPLETE: {len(report.built)} built, {len(report.unchanged)} unchanged, "
+        f"{len(report.removed)} removed, {len(report.failed)} failed"
+    )
+    if report.built:
+        print(f"  sources {report.bytes_in / 1024**2:.1f} MB -> derivatives {report.bytes_out / 1024**2:.1f} MB")
+    print(f"  srcset mapping: {SRCSET_FILE.name}")
+    return 1 if report.failed else 0
@@ -0,0 +1,48 @@
+"""Regenerate image-review-grid.html with cached thumbnails.
+
+Every scene PNG gets a small WebP thumbnail under images/scenes/thumbs/,
+named by the source's content hash so unchanged images are never
+re-rendered. The page shows the thumbnails lazily, with each image's
+mapping keys and the flag words from scene_analysis.json, and only loads
+a full-size PNG when its tile is clicked.
+"""
+
+import argparse
+
+HELP = "rebuild the image review grid with cached thumbnails"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--edge", type=int, default=320, help="longest thumbnail side in pixels (default: 320)")
+    parser.add_argument("--workers", type=int, help="thumbnail worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="re-render every thumbnail")
+
+
+def run(args: argparse.Namespace) -> int:
+    import time
+
+    from ..contact_sheet import REVIEW_PAGE, THUMB_DIR, build_review_grid
+
+    started = time.perf_counter()
+    report = build_review_grid(
+        edge=args.edge,
+        workers=args.workers,
+        force=args.force,
+        on_built=lambda label: print(f"[THUMB] {label}"),
+    )
+    elapsed = time.perf_counter() - started
+
+    for name in report.pruned:
+        print(f"[PRUNE] {name}")
+    for name, error in sorted(report.failed.items()):
+        print(f"[FAIL] {name}: {error}")
+    size = sum(path.stat().st_size for path in THUMB_DIR.glob("*.webp"))
+    print(
+        f"\nTHUMBNAILS: {len(report.built)} rendered, {report.unchanged} cached, {len(report.pruned)} pruned "
+        f"({size / 1024:.0f} KB total) in {elapsed:.1f}s"
+    )
+    print(
+        f"REVIEW: {report.images} images, {report.flagged} flagged, {report.unanalyzed} not analyzed, "
+        f"{report.stale} stale; {REVIEW_PAGE.name} {'updated' if report.page_changed else 'unchanged'}"
+    )
+    return 1 if report.failed else 0
@@ -0,0 +1,65 @@
+"""Serve the game (or the dist/ build) over HTTP on localhost.
+
+Supports Range requests, strong ETags with 304s and precompressed .br/.gz
+siblings. Cache-Control is set by path and every request is logged with
+its time to headers and total time. --throttle simulates a classroom
+connection: classroom, 3g, slow, or KBITS[:LATENCY_MS]. --trace and
+--metrics also record every request as telemetry.
+"""
+
+import argparse
+from pathlib import Path
+
+from . import add_telemetry_arguments
+
+HELP = "serve the game locally with caching, Range and throttling"
+
+
+def _throttle(value: str):
+    from ..server import parse_throttle
+
+    return parse_throttle(value)
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    root = parser.add_mutually_exclusive_group()
+    root.add_argument("--root", type=Path, help="directory to serve (default: the game root)")
+    root.add_argument("--dist", action="store_true", help="serve dist/ from modelit-assets build")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="default: 8000")
+    parser.add_argument("--throttle", type=_throttle, metavar="PROFILE", help="simulate a slower connection")
+    add_telemetry_arguments(parser)
+
+
+def run(args: argparse.Namespace) -> int:
+    import asyncio
+
+    from ..dist import DIST_DIR
+    from ..paths import BASE_DIR
+    from ..server import DEFAULT_PORT, StaticServer
+    from . import print_telemetry, start_recorder
+
+    root = DIST_DIR if args.dist else args.root or BASE_DIR
+    if not root.is_dir():
+        hint = " Run modelit-assets build first." if args.dist else ""
+        raise SystemExit(f"{root} is not a directory.{hint}")
+
+    recorder = start_recorder(args, "serve") if args.trace or args.metrics else None
+    server = StaticServer(root, host=args.host, port=args.port or DEFAULT_PORT, throttle=args.throttle, telemetry=recorder)
+
+    async def serve() -> None:
+        await server.start()
+        throttle = ""
+        if args.throttle:
+            throttle = f" (throttled to {args.throttle.bits_per_second / 1000:.0f} kbit/s, {args.throttle.latency * 1000:.0f} ms)"
+        print(f"Serving {root} at http://{server.host}:{server.port}/{throttle}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if recorder is not None:
+            print_telemetry(recorder)
+    return 0
@@ -0,0 +1,78 @@
+"""Validate all game assets are present, decode, and match asset-manifest.json.
+
+Every path referenced by story-data.js, scene-image-mapping.json and the
+getVoiceFile() naming scheme is checked. Exits non-zero on any difference;
+run with --update after intentionally changing assets.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from ..paths import BASE_DIR
+
+HELP = "check referenced assets against asset-manifest.json"
+GAME_FILE = BASE_DIR / "modelit-story.html"
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--update", action="store_true", help="rewrite asset-manifest.json from the current files")
+
+
+def check_game_file(game_file: Path) -> None:
+    if not game_file.exists():
+        print(f"[MISS] Main game file not found: {game_file.name}")
+        return
+
+    size_kb = game_file.stat().st_size / 1024
+    print(f"[OK] Main game file: {size_kb:.1f} KB")
+
+    content = game_file.read_text(encoding="utf-8")
+    if "puter.com" in content:
+        print("  WARNING: Puter.js references still present")
+    if "audio/background_music.mp3" not in content:
+        print("  WARNING: Background music might not be integrated")
+    if "audio/voice/" not in content:
+        print("  WARNING: Voice system might not be integrated")
+
+
+def run(args: argparse.Namespace) -> int:
+    from ..validation import MANIFEST_FILE, validate, write_manifest
+
+    started = time.perf_counter()
+    print("=== ModelIt Mystery - Asset Validation ===\n")
+
+    report, current = validate()
+
+    for path, referrers in report.missing.items():
+        print(f"[MISS] {path} (referenced by {', '.join(referrers)})")
+    for path, error in report.broken.items():
+        print(f"[BAD]  {path}: {error}")
+
+    if args.update:
+        write_manifest(current)
+        print(f"[OK] Wrote {MANIFEST_FILE.name} with {len(current)} entries")
+    else:
+        for path, (old, new) in report.changed.items():
+            print(f"[DIFF] {path}: sha256 {old[:12]} -> {new[:12]}")
+        for path in report.added:
+            print(f"[NEW]  {path} is referenced but not in {MANIFEST_FILE.name}")
+        for path in report.removed:
+            print(f"[GONE] {path} is in {MANIFEST_FILE.name} but no longer referenced")
+
+    for path in report.unreferenced:
+        print(f"  WARNING: {path} is not referenced by the game")
+
+    check_game_file(GAME_FILE)
+
+    elapsed = (time.perf_counter() - started) * 1000
+    print(
+        f"\n{report.referenced} referenced assets, {report.hashed} re-hashed, "
+        f"{len(report.missing)} missing, {len(report.broken)} undecodable ({elapsed:.0f} ms)"
+    )
+    print("=== Validation Complete ===")
+
+    failed = report.missing or report.broken
+    if not args.update:
+        failed = failed or not report.ok
+    return 1 if failed else 0
@@ -0,0 +1,111 @@
+"""Synthesize voice clips for story lines whose text changed.
+
+Every narrated line in story-data.js is hashed. audio/voice/voice-manifest.json
+records the text hash and voice of each clip, and only lines whose hash or
+voice differ (or whose clip is missing) go to the TTS backend. Without a
+manifest every clip looks stale, so the command refuses to run until
+--adopt has recorded the existing clips as current (or --force asks for a
+full re-synthesis). Use --backend stub to
+exercise the pipeline offline.
+"""
+
+import argparse
+from pathlib import Path
+
+HELP = "regenerate voice clips whose story text changed"
+# The keys of voice.BACKENDS, spelled out so building the parser stays import-free.
+BACKEND_NAMES = ("google", "openai", "stub")
+
+
+def configure(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--backend", choices=BACKEND_NAMES, default="openai", help="TTS service (default: openai)")
+    parser.add_argument("--voice", help="backend voice name (default: OPENAI_VOICE or nova; en-US-Neural2-F for google)")
+    parser.add_argument("--dry-run", action="store_true", help="print the plan and stop")
+    parser.add_argument("--only", action="append", metavar="VOICE_ID", help="limit to this clip, e.g. ch3_scene1 (repeatable)")
+    parser.add_argument("--adopt", action="store_true", help="record the existing clips as current without synthesizing")
+    parser.add_argument("--force", action="store_true", help="synthesize every selected line")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent TTS requests")
+    parser.add_argument("--out", type=Path, help="clip directory (default: audio/voice)")
+
+
+def run(args: argparse.Namespace) -> int:
+    import time
+
+    from ..paths import VOICE_DIR
+    from ..story import load_story, voice_lines
+    from ..voice import BACKENDS, MANIFEST_FILE, load_manifest, plan, record, save_manifest, synthesize_lines
+
+    out_dir = args.out or VOICE_DIR
+    manifest_file = out_dir / MANIFEST_FILE.name
+    backend = BACKENDS[args.backend](args.voice) if args.voice else BACKENDS[args.backend]()
+    lines = voice_lines(load_story())
+    manifest = load_manifest(manifest_file)
+    known = {line.voice_id for line in lines}
+    unknown = sorted(set(args.only or ()) - known)
+    if unknown:
+        raise SystemExit(f"Unknown voice id(s): {', '.join(unknown)}")
+
+    voice_plan = plan(
+        lines,
+        manifest,
+        voice=backend.voice,
+        out_dir=out_dir,
+        only=set(args.only) if args.only else None,
+        force=args.force,
+    )
+    print("=" * 70)
+    print(f"VOICE CLIPS ({backend.voice})")
+    print("=" * 70)
+    for line, reasons in voice_plan.build:
+        print(f"  {line.voice_id}: {', '.join(reasons)}")
+    for voice_id in voice_plan.orphans:
+        print(f"  {voice_id}: not referenced by the story")
+    words = sum(len(line.text.split()) for line, _ in voice_plan.build)
+    print(f"\nPLAN: {len(voice_plan.build)} to synthesize ({words} words), {len(voice_plan.current)} up to date")
+
+    unrecorded = None
+    if not manifest_file.exists() and not (args.adopt or args.force):
+        unrecorded = (
+            f"{manifest_file.name} is missing, so every existing clip would be synthesized again. "
+            "Record the current clips with\n"
+            f"  modelit-assets voice --backend {args.backend} --adopt\n"
+            "or pass --force to re-synthesize them all."
+        )
+    if args.dry_run:
+        if unrecorded:
+            print(f"\nWARNING: {unrecorded}")
+        print("\nWARNING: --dry-run, nothing synthesized")
+        return 0
+    if unrecorded:
+        raise SystemExit(unrecorded)
+
+    if args.adopt:
+        adopted = 0
+        for line, _ in voice_plan.build:
+            clip = out_dir / f"{line.voice_id}.mp3"
+            if clip.exists():
+                record(manifest, line, backend.voice, clip)
+                adopted += 1
+        save_manifest(manifest, manifest_file)
+        print(f"\nADOPTED: {adopted} existing clips recorded in {manifest_file.name}")
+        return 0
+
+    def report_built(line, size: int) -> None:
+        print(f"  [OK] {line.voice_id} ({size // 1024} KB)")
+
+    started = time.perf_counter()
+    report = synthesize_lines(
+        backend,
+        [line for line, _ in voice_plan.build],
+        manifest,
+        out_dir=out_dir,
+        manifest_file=manifest_file,
+        workers=args.workers,
+        on_built=report_built,
+    )
+    elapsed = time.perf_counter() - started
+
+    for voice_id, error in sorted(report.failed.items()):
+        print(f"  [FAIL] {voice_id}: {error}")
+    print(f"\nCOMPLETE: {len(report.built)} synthesized, {len(report.failed)} failed in {elapsed:.1f}s")
+    return 1 if report.failed else 0
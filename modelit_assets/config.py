@@ -0,0 +1,53 @@
+"""Settings from the environment and the repository's ``.env`` file.
+
+``.env`` is read once per process. Variables that are already exported win
+over the file, so CI and shells can override it without editing it.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from .paths import BASE_DIR
+
+ENV_FILE = BASE_DIR / ".env"
+
+
+class ConfigError(RuntimeError):
+    pass
+
+
+def parse_env(text: str) -> dict[str, str]:
+    """Parse ``KEY=value`` lines, allowing ``export``, comments and quotes."""
+    values = {}
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        key = key.strip().removeprefix("export ").strip()
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        elif " #" in value:
+            value = value.split(" #", 1)[0].rstrip()
+        values[key] = value
+    return values
+
+
+@lru_cache(maxsize=None)
+def load_env(path: Path = ENV_FILE) -> dict[str, str]:
+    if not path.exists():
+        return {}
+    return parse_env(path.read_text(encoding="utf-8"))
+
+
+def get(name: str, default: str | None = None) -> str | None:
+    return os.environ.get(name) or load_env().get(name) or default
+
+
+def require(name: str, purpose: str) -> str:
+    value = get(name)
+    if not value:
+        raise ConfigError(f"{name} is required to {purpose}. Export it or add it to {ENV_FILE.name}.")
+    return value
@@ -0,0 +1,298 @@
+"""Offline character-consistency pre-filter for the scene images.
+
+For each scene a 256px thumbnail is reduced to a 64-bit DCT perceptual hash,
+a 64-bit difference hash, a 512-bin RGB histogram and the fraction of pixels
+that fall inside each hex range spelled out in the ``character_ref`` prompt
+fragment (skin, hair, shirt; see :data:`PALETTE_KEYS` for why the lab coat is
+not one of them). Everything is computed with vectorized NumPy
+and stored in a compact ``.npz`` index keyed by content hash, so only new or
+changed images are decoded again. The index also records a fingerprint of
+the palette and feature settings and is rebuilt when they change.
+
+Images are ranked by how much of each character colour they are missing
+compared with the typical scene and by their histogram distance from the
+reference scene; scenes without enough skin-tone pixels are reported as
+having no character rather than as off-model.
+"""
+
+import hashlib
+import io
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .files import atomic_write_bytes
+from .hashing import sha256_file
+from .paths import CACHE_DIR, SCENES_DIR
+from .prompts import PromptManifest
+
+INDEX_FILE = CACHE_DIR / "consistency-index.npz"
+REFERENCE_IMAGE = SCENES_DIR / "ch0_scene1_maya_intro.png"
+THUMBNAIL = 256
+HIST_BINS = 8
+TOLERANCE = 16
+PALETTE_FRAGMENT = "character_ref"
+# The white lab coat is left out on purpose: character_ref gives it no hex
+# range, and near-white also covers the lab lighting, screens and highlights
+# in most scenes, so its coverage would not tell an off-model coat apart from
+# a bright background.
+PALETTE_KEYS = ("skin", "hair", "shirt")
+# Below this skin-tone coverage the scene is treated as having no character.
+PRESENCE_THRESHOLD = 0.01
+
+
+def character_palette(description: str | None = None) -> dict[str, np.ndarray]:
+    """Return ``{name: [[r, g, b] low, [r, g, b] high]}`` from the ``character_ref`` fragment.
+
+    Each ``#XXXXXX-#XXXXXX`` range is named after the closest preceding
+    palette keyword in the description.
+    """
+    if description is None:
+        description = PromptManifest.load().fragments[PALETTE_FRAGMENT]
+    palette = {}
+    for found in re.finditer(r"#([0-9A-Fa-f]{6})\s*-\s*#([0-9A-Fa-f]{6})", description):
+        before = description[: found.start()].lower()
+        name = max(PALETTE_KEYS, key=before.rfind)
+        ends = np.array([[int(h[i : i + 2], 16) for i in (0, 2, 4)] for h in found.groups()])
+        palette[name] = np.stack([ends.min(axis=0), ends.max(axis=0)])
+    return palette
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT32 = _dct_matrix(32)
+
+
+def _bits_to_int(bits: np.ndarray) -> np.uint64:
+    return np.packbits(bits.astype(np.uint8)).view(">u8")[0].astype(np.uint64)
+
+
+def _grid_mean(gray: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    h, w = gray.shape
+    cropped = gray[: h - h % rows, : w - w % cols]
+    return cropped.reshape(rows, h // rows, cols, w // cols).mean(axis=(1, 3))
+
+
+def phash(gray: np.ndarray) -> np.uint64:
+    coeffs = _DCT32 @ _grid_mean(gray, 32, 32) @ _DCT32.T
+    low = coeffs[:8, :8].ravel()
+    return _bits_to_int(low > np.median(low[1:]))
+
+
+def dhash(gray: np.ndarray) -> np.uint64:
+    grid = _grid_mean(gray, 8, 9)
+    return _bits_to_int(grid[:, 1:] > grid[:, :-1])
+
+
+def hamming(a, b) -> np.ndarray:
+    x = np.bitwise_xor(np.asarray(a, dtype=np.uint64), np.asarray(b, dtype=np.uint64))
+    return np.unpackbits(x.view(np.uint8).reshape(*x.shape, 8), axis=-1).sum(axis=-1)
+
+
+def color_histogram(rgb: np.ndarray) -> np.ndarray:
+    quantized = (rgb // (256 // HIST_BINS)).astype(np.int64)
+    codes = (quantized[..., 0] * HIST_BINS + quantized[..., 1]) * HIST_BINS + quantized[..., 2]
+    hist = np.bincount(codes.ravel(), minlength=HIST_BINS**3).astype(np.float32)
+    return hist / hist.sum()
+
+
+def palette_coverage(rgb: np.ndarray, palette: dict[str, np.ndarray]) -> np.ndarray:
+    pixels = rgb.reshape(-1, 3).astype(np.int16)
+    coverage = []
+    for name in PALETTE_KEYS:
+        if name not in palette:
+            coverage.append(np.nan)
+            continue
+        low, high = palette[name][0] - TOLERANCE, palette[name][1] + TOLERANCE
+        inside = np.all((pixels >= low) & (pixels <= high), axis=1)
+        coverage.append(inside.mean())
+    return np.array(coverage, dtype=np.float32)
+
+
+@dataclass
+class Features:
+    phash: np.uint64
+    dhash: np.uint64
+    histogram: np.ndarray
+    coverage: np.ndarray
+
+
+def image_features(path: Path, palette: dict[str, np.ndarray]) -> Features:
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image = image.convert("RGB")
+        image.thumbnail((THUMBNAIL, THUMBNAIL), Image.Resampling.BILINEAR, reducing_gap=2.0)
+        rgb = np.asarray(image)
+    gray = rgb @ np.array([0.299, 0.587, 0.114])
+    return Features(phash(gray), dhash(gray), color_histogram(rgb), palette_coverage(rgb, palette))
+
+
+def settings_fingerprint(palette: dict[str, np.ndarray]) -> str:
+    """Hash of everything that shapes the stored features; an index built with other settings is discarded."""
+    settings = {
+        "palette": {name: np.asarray(value).tolist() for name, value in sorted(palette.items())},
+        "palette_keys": PALETTE_KEYS,
+        "tolerance": TOLERANCE,
+        "thumbnail": THUMBNAIL,
+        "hist_bins": HIST_BINS,
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class ConsistencyIndex:
+    """Column arrays for every indexed image, persisted as one ``.npz``."""
+
+    def __init__(self, names, digests, phashes, dhashes, histograms, coverage, settings: str = ""):
+        self.settings = settings
+        self.names = np.asarray(names, dtype=str)
+        self.digests = np.asarray(digests, dtype=str)
+        self.phashes = np.asarray(phashes, dtype=np.uint64)
+        self.dhashes = np.asarray(dhashes, dtype=np.uint64)
+        self.histograms = np.asarray(histograms, dtype=np.float16).reshape(-1, HIST_BINS**3)
+        self.coverage = np.asarray(coverage, dtype=np.float32).reshape(-1, len(PALETTE_KEYS))
+
+    @classmethod
+    def empty(cls) -> "ConsistencyIndex":
+        return cls([], [], [], [], [], [])
+
+    @classmethod
+    def load(cls, path: Path = INDEX_FILE, settings: str | None = None) -> "ConsistencyIndex":
+        """Read the index; it is empty when missing or built with settings other than ``settings``."""
+        if not path.exists():
+            return cls.empty()
+        with np.load(path) as data:
+            stored = str(data["settings"]) if "settings" in data.files else ""
+            if settings is not None and stored != settings:
+                return cls.empty()
+            columns = (data[key] for key in ("names", "digests", "phashes", "dhashes", "histograms", "coverage"))
+            return cls(*columns, settings=stored)
+
+    def save(self, path: Path = INDEX_FILE) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            names=self.names,
+            digests=self.digests,
+            phashes=self.phashes,
+            dhashes=self.dhashes,
+            histograms=self.histograms,
+            coverage=self.coverage,
+            settings=np.array(self.settings),
+        )
+        atomic_write_bytes(path, buffer.getvalue())
+
+    def row(self, name: str) -> int | None:
+        hits = np.flatnonzero(self.names == name)
+        return int(hits[0]) if hits.size else None
+
+
+def build_index(
+    paths: list[Path],
+    *,
+    index_file: Path = INDEX_FILE,
+    palette: dict[str, np.ndarray] | None = None,
+) -> tuple[ConsistencyIndex, int]:
+    """Update the on-disk index for ``paths``; return it and the number of images decoded."""
+    palette = palette if palette is not None else character_palette()
+    settings = settings_fingerprint(palette)
+    previous = ConsistencyIndex.load(index_file, settings)
+    known = {(name, digest): i for i, (name, digest) in enumerate(zip(previous.names, previous.digests))}
+    columns = {key: [] for key in ("names", "digests", "phashes", "dhashes", "histograms", "coverage")}
+    digests = [sha256_file(path) for path in paths]
+    stale = [path for path, digest in zip(paths, digests) if (path.name, digest) not in known]
+    # PNG decoding releases the GIL, so threads overlap the expensive part.
+    with ThreadPoolExecutor() as pool:
+        fresh = dict(zip(stale, pool.map(lambda path: image_features(path, palette), stale)))
+
+    for path, digest in zip(paths, digests):
+        i = known.get((path.name, digest))
+        if i is not None:
+            row = (previous.phashes[i], previous.dhashes[i], previous.histograms[i], previous.coverage[i])
+        else:
+            features = fresh[path]
+            row = (features.phash, features.dhash, features.histogram, features.coverage)
+        columns["names"].append(path.name)
+        columns["digests"].append(digest)
+        for key, value in zip(("phashes", "dhashes", "histograms", "coverage"), row):
+            columns[key].append(value)
+    index = ConsistencyIndex(*columns.values(), settings=settings)
+    index.save(index_file)
+    return index, len(stale)
+
+
+@dataclass
+class Ranking:
+    name: str
+    score: float
+    status: str
+    coverage: dict[str, float]
+    histogram_distance: float
+    phash_distance: int
+
+
+def character_present(coverage: np.ndarray) -> np.ndarray:
+    return coverage[..., PALETTE_KEYS.index("skin")] >= PRESENCE_THRESHOLD
+
+
+def baseline_coverage(index: ConsistencyIndex, ref: int) -> np.ndarray:
+    """Median palette coverage of the indexed scenes that show the character."""
+    present = character_present(index.coverage)
+    return np.median(index.coverage[present | (np.arange(len(index.names)) == ref)], axis=0)
+
+
+def score(
+    coverage: np.ndarray, histograms: np.ndarray, baseline: np.ndarray, reference_histogram: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Off-model scores (higher is worse) and histogram distances for rows of features."""
+    histograms = np.asarray(histograms, dtype=np.float32)
+    # Histogram intersection: 1 - overlap, so 0 means an identical colour distribution.
+    hist_distance = 1.0 - np.minimum(histograms, np.asarray(reference_histogram, dtype=np.float32)).sum(axis=1)
+    shortfall = np.clip(1.0 - coverage / np.maximum(baseline, 1e-6), 0.0, 1.0)
+    shortfall = np.nan_to_num(shortfall, nan=0.0)
+    return shortfall.mean(axis=1) * 0.7 + hist_distance * 0.3, hist_distance
+
+
+def rank(index: ConsistencyIndex, reference: str = REFERENCE_IMAGE.name) -> list[Ranking]:
+    """Rank indexed images from most to least likely off-model.
+
+    The score combines how much of each ``CHARACTER_REF`` colour is missing
+    relative to the median scene that shows the character, with the
+    histogram distance from the reference scene.
+    """
+    ref = index.row(reference)
+    if ref is None:
+        raise ValueError(f"reference image {reference} is not in the index")
+    present = character_present(index.coverage)
+    baseline = baseline_coverage(index, ref)
+    scores, hist_distance = score(index.coverage, index.histograms, baseline, index.histograms[ref])
+    phash_distance = hamming(index.phashes, index.phashes[ref])
+
+    rankings = []
+    for i in np.argsort(-scores):
+        rankings.append(
+            Ranking(
+                name=str(index.names[i]),
+                score=float(scores[i]),
+                status="reference" if i == ref else ("checked" if present[i] else "no character"),
+                coverage={key: float(index.coverage[i, k]) for k, key in enumerate(PALETTE_KEYS)},
+                histogram_distance=float(hist_distance[i]),
+                phash_distance=int(phash_distance[i]),
+            )
+        )
+    return rankings
+
+
+def suspicious(rankings: list[Ranking], threshold: float) -> list[Ranking]:
+    return [r for r in rankings if r.status == "checked" and r.score >= threshold]
@@ -0,0 +1,380 @@
+"""Thumbnail contact sheet for reviewing the scene images.
+
+``image-review-grid.html`` used to point straight at the scene PNGs (about
+1.2 MB each), so opening it pulled the whole library before the grid was
+usable. :func:`build_review_grid` renders small WebP thumbnails into
+``images/scenes/thumbs/`` on a process pool and regenerates the page from
+``scene-image-mapping.json`` and ``scene_analysis.json``:
+
+* thumbnails are named ``<sha256 prefix>-<edge>.webp``, so a source is only
+  re-rendered when its content (or the thumbnail size) changes, and stale
+  ones are pruned;
+* source hashes come from the shared asset stat cache, so an unchanged tree
+  is not re-read at all;
+* tiles load lazily and link to the full-size PNG, which is only fetched
+  on click;
+* each tile lists its mapping keys and the flag words found in its
+  analysis, and marks analyses recorded for a different version of the file.
+"""
+
+import io
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from html import escape
+from pathlib import Path
+from typing import Callable
+
+from .analysis import ANALYSIS_FILE, flag_terms, load_results
+from .files import atomic_write_bytes
+from .paths import BASE_DIR, SCENES_DIR
+from .story import MAPPING_FILE, load_mapping
+from .validation import StatCache
+
+THUMB_DIR = SCENES_DIR / "thumbs"
+REVIEW_PAGE = BASE_DIR / "image-review-grid.html"
+REFERENCE_IMAGE = "ch0_scene1_maya_intro.png"
+THUMB_EDGE = 320
+REFERENCE_EDGE = 640
+THUMB_QUALITY = 72
+
+
+@dataclass(frozen=True)
+class Thumbnail:
+    path: str
+    width: int
+    height: int
+
+
+@dataclass
+class ReviewReport:
+    built: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    pruned: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    images: int = 0
+    flagged: int = 0
+    unanalyzed: int = 0
+    stale: int = 0
+    page_changed: bool = False
+
+
+def thumb_name(digest: str, edge: int) -> str:
+    return f"{digest[:16]}-{edge}.webp"
+
+
+def render_thumbnail(source: str, target: str, edge: int, quality: int = THUMB_QUALITY) -> None:
+    """Write a WebP no larger than ``edge`` on either side; runs in a worker process."""
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="WEBP", quality=quality, method=6)
+    atomic_write_bytes(Path(target), buffer.getvalue())
+
+
+def build_thumbnails(
+    wanted: list[tuple[Path, str, int]],
+    report: ReviewReport,
+    *,
+    thumb_dir: Path = THUMB_DIR,
+    workers: int | None = None,
+    force: bool = False,
+    on_built: Callable[[str], None] | None = None,
+) -> dict[tuple[str, int], Thumbnail]:
+    """Render the ``(source, sha256, edge)`` thumbnails that do not exist yet.
+
+    Returns ``{(source name, edge): Thumbnail}`` for every one that exists
+    afterwards and prunes any other file in ``thumb_dir``.
+    """
+    from PIL import Image
+
+    thumb_dir.mkdir(parents=True, exist_ok=True)
+    targets = {(source.name, edge): (source, thumb_dir / thumb_name(digest, edge)) for source, digest, edge in wanted}
+    pending = {key: value for key, value in targets.items() if force or not value[1].exists()}
+    report.unchanged += len(targets) - len(pending)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(render_thumbnail, str(source), str(target), edge): (source, target)
+                for (_, edge), (source, target) in pending.items()
+            }
+            for future in as_completed(futures):
+                source, target = futures[future]
+                try:
+                    future.result()
+                except Exception as exc:
+                    report.failed[source.name] = str(exc)
+                    continue
+                report.built.append(target.name)
+                if on_built:
+                    on_built(f"{source.name} -> {target.name}")
+
+    prefix = thumb_dir.relative_to(BASE_DIR).as_posix()
+    thumbs = {}
+    for key, (_, target) in targets.items():
+        if target.exists():
+            with Image.open(target) as image:
+                thumbs[key] = Thumbnail(f"{prefix}/{target.name}", *image.size)
+
+    keep = {target.name for _, target in targets.values()}
+    for thumb in sorted(thumb_dir.glob("*.webp")):
+        if thumb.name not in keep:
+            thumb.unlink()
+            report.pruned.append(thumb.name)
+    return thumbs
+
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Dr. Maya Images Review</title>
+    <!-- Generated by `modelit-assets review`; edit contact_sheet.py instead. -->
+    <style>
+        body {
+            background: #0a1e28;
+            color: white;
+            font-family: Arial, sans-serif;
+            padding: 20px;
+            margin: 0;
+        }
+        .reference-section {
+            background: #1a3a4a;
+            padding: 20px;
+            margin-bottom: 30px;
+            border: 4px solid #00ff88;
+            border-radius: 10px;
+        }
+        .reference-section h1 {
+            color: #00ff88;
+            margin: 0 0 15px 0;
+            text-align: center;
+        }
+        .reference-image {
+            display: block;
+            max-width: 500px;
+            width: 100%;
+            height: auto;
+            margin: 0 auto;
+            border: 3px solid #00ff88;
+            border-radius: 8px;
+        }
+        .reference-notes {
+            margin-top: 15px;
+            padding: 15px;
+            background: rgba(0, 255, 136, 0.1);
+            border-radius: 8px;
+        }
+        .reference-notes h3 {
+            color: #00ff88;
+            margin-top: 0;
+        }
+        .reference-notes li {
+            color: #00ff88;
+            margin: 8px 0;
+        }
+        .summary {
+            color: #9fd8e8;
+            text-align: center;
+            margin: -10px 0 20px 0;
+        }
+        .grid {
+            display: grid;
+            grid-template-columns: repeat(4, 1fr);
+            gap: 15px;
+        }
+        .image-card {
+            background: #1a3a4a;
+            padding: 10px;
+            border-radius: 8px;
+            border: 2px solid #00d4ff;
+        }
+        .image-card.flagged {
+            border-color: #ffb020;
+        }
+        .image-card img {
+            display: block;
+            width: 100%;
+            height: 200px;
+            object-fit: cover;
+            border-radius: 5px;
+            margin-bottom: 8px;
+        }
+        .image-name {
+            color: #00d4ff;
+            font-size: 11px;
+            word-break: break-all;
+            text-align: center;
+        }
+        .image-keys {
+            color: #9fd8e8;
+            font-size: 10px;
+            text-align: center;
+            margin-top: 4px;
+        }
+        .flags {
+            margin-top: 6px;
+            text-align: center;
+        }
+        .flag {
+            display: inline-block;
+            background: #ffb020;
+            color: #0a1e28;
+            font-size: 10px;
+            font-weight: bold;
+            padding: 2px 6px;
+            margin: 2px;
+            border-radius: 8px;
+        }
+        .flag.stale, .flag.missing {
+            background: #667788;
+            color: white;
+        }
+        .image-card details {
+            font-size: 11px;
+            color: #cfe8ef;
+            margin-top: 6px;
+        }
+        .image-card summary {
+            cursor: pointer;
+            color: #00d4ff;
+        }
+    </style>
+</head>
+<body>
+    <div class="reference-section">
+        <h1>✅ REFERENCE: This is the correct Dr. Maya!</h1>
+        {reference}
+        <div class="reference-notes">
+            <h3>Dr. Maya's Key Features (must be consistent):</h3>
+            <ul>
+                <li>✓ Natural curly/coily hair in a bun</li>
+                <li>✓ Warm brown skin tone (African American)</li>
+                <li>✓ Big, expressive brown eyes</li>
+                <li>✓ Cyan/teal colored clothing (shirt/scrubs)</li>
+                <li>✓ White lab coat</li>
+                <li>✓ Friendly, welcoming expression</li>
+                <li>✓ Cartoon anime art style</li>
+            </ul>
+        </div>
+    </div>
+
+    <h2 style="color: #00d4ff; text-align: center; margin-bottom: 20px;">All Generated Images ({count} total)</h2>
+    <p class="summary">{summary}</p>
+
+    <div class="grid">
+{cards}
+    </div>
+</body>
+</html>
+"""
+
+
+def _image(thumb: Thumbnail, alt: str, css_class: str | None = None, lazy: bool = True) -> str:
+    attrs = [
+        f'src="{escape(thumb.path)}"',
+        f'width="{thumb.width}"',
+        f'height="{thumb.height}"',
+        f'alt="{escape(alt)}"',
+    ]
+    if css_class:
+        attrs.append(f'class="{css_class}"')
+    if lazy:
+        attrs += ['loading="lazy"', 'decoding="async"']
+    return f"<img {' '.join(attrs)}>"
+
+
+def render_card(href: str, name: str, thumb: Thumbnail | None, keys: list[str], entry: dict | None, stale: bool) -> str:
+    flags = flag_terms(entry["analysis"]) if entry else []
+    badges = [f'<span class="flag">{escape(word)}</span>' for word in flags]
+    if entry is None:
+        badges.append('<span class="flag missing">not analyzed</span>')
+    elif stale:
+        badges.append('<span class="flag stale">analysis predates this file</span>')
+    image = _image(thumb, name) if thumb else escape(name)
+    lines = [
+        f'            <div class="image-card{" flagged" if flags else ""}">',
+        f'                <a href="{escape(href)}" target="_blank">{image}</a>',
+        f'                <div class="image-name">{escape(name)}</div>',
+        f'                <div class="image-keys">{escape(", ".join(keys)) if keys else "unmapped"}</div>',
+    ]
+    if badges:
+        lines.append(f'                <div class="flags">{"".join(badges)}</div>')
+    if entry:
+        lines.append(f"                <details><summary>Analysis</summary>{escape(entry['analysis'])}</details>")
+    lines.append("            </div>")
+    return "\n".join(lines)
+
+
+def build_review_grid(
+    *,
+    scenes_dir: Path = SCENES_DIR,
+    page: Path = REVIEW_PAGE,
+    mapping_file: Path = MAPPING_FILE,
+    analysis_file: Path = ANALYSIS_FILE,
+    thumb_dir: Path = THUMB_DIR,
+    edge: int = THUMB_EDGE,
+    stat_cache: StatCache | None = None,
+    workers: int | None = None,
+    force: bool = False,
+    on_built: Callable[[str], None] | None = None,
+) -> ReviewReport:
+    """Refresh the thumbnails and rewrite ``page`` if its content changed."""
+    stat_cache = stat_cache or StatCache()
+    report = ReviewReport()
+    sources = sorted(scenes_dir.glob("*.png"))
+    digests = {
+        source.name: stat_cache.lookup(source.relative_to(BASE_DIR).as_posix(), source)[0] for source in sources
+    }
+    stat_cache.save()
+
+    wanted = [(source, digests[source.name], edge) for source in sources]
+    reference = scenes_dir / REFERENCE_IMAGE
+    if reference.name in digests:
+        wanted.append((reference, digests[reference.name], REFERENCE_EDGE))
+    thumbs = build_thumbnails(wanted, report, thumb_dir=thumb_dir, workers=workers, force=force, on_built=on_built)
+
+    keys: dict[str, list[str]] = {}
+    for key, path in load_mapping(mapping_file).items():
+        keys.setdefault(Path(path).name, []).append(key)
+    results = load_results(analysis_file)
+
+    cards = []
+    for source in sources:
+        entry = results.get(source.name)
+        recorded = entry.get("sha256") if entry else None
+        stale = bool(recorded) and recorded != digests[source.name]
+        report.images += 1
+        report.unanalyzed += entry is None
+        report.stale += stale
+        report.flagged += bool(entry and flag_terms(entry["analysis"]))
+        href = source.relative_to(BASE_DIR).as_posix()
+        thumb = thumbs.get((source.name, edge))
+        cards.append(render_card(href, source.name, thumb, keys.get(source.name, []), entry, stale))
+
+    reference_thumb = thumbs.get((REFERENCE_IMAGE, REFERENCE_EDGE))
+    reference_href = (scenes_dir / REFERENCE_IMAGE).relative_to(BASE_DIR).as_posix()
+    reference_html = (
+        f'<a href="{escape(reference_href)}" target="_blank">'
+        f"{_image(reference_thumb, 'Reference Dr. Maya', 'reference-image', lazy=False)}</a>"
+        if reference_thumb
+        else f'<p>{escape(REFERENCE_IMAGE)} is missing.</p>'
+    )
+    summary = (
+        f"{report.flagged} with flag words, {report.unanalyzed} not analyzed, {report.stale} with stale analysis. "
+        "Click a thumbnail for the full-size image."
+    )
+    html = (
+        PAGE.replace("{reference}", reference_html)
+        .replace("{count}", str(report.images))
+        .replace("{summary}", escape(summary))
+        .replace("{cards}", "\n\n".join(cards))
+    )
+    data = html.encode("utf-8")
+    if not page.exists() or page.read_bytes() != data:
+        atomic_write_bytes(page, data)
+        report.page_changed = True
+    return report
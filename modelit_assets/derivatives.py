@@ -0,0 +1,199 @@
+"""Responsive WebP/AVIF derivatives of the scene PNGs.
+
+Every ``images/scenes/*.png`` is rendered at several widths into
+``images/scenes/responsive/`` on a process pool. A manifest records each
+source's mtime, size and SHA-256 together with the build settings, so a rerun
+only touches sources that actually changed. Each derivative is encoded in
+memory and swapped in atomically, so an interrupted build never leaves a
+truncated file behind for the game to serve. :func:`srcset_mapping` turns the
+manifest into the ``scene-image-srcset.json`` the game loads.
+"""
+
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from .files import atomic_write_bytes
+from .hashing import sha256_file
+from .paths import BASE_DIR, SCENES_DIR
+
+DERIVED_DIR = SCENES_DIR / "responsive"
+MANIFEST_FILE = DERIVED_DIR / "manifest.json"
+SRCSET_FILE = BASE_DIR / "scene-image-srcset.json"
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+
+@dataclass(frozen=True)
+class DerivativeSettings:
+    widths: tuple[int, ...] = (480, 768, 1024)
+    formats: tuple[str, ...] = ("webp",)
+    quality: int = 78
+
+
+@dataclass
+class BuildReport:
+    built: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+
+def avif_supported() -> bool:
+    from PIL import features
+
+    try:
+        return bool(features.check("avif"))
+    except ValueError:
+        return False
+
+
+def render_derivatives(source: str, output_dir: str, settings: DerivativeSettings) -> dict:
+    """Render one source at every width/format; runs in a worker process."""
+    from PIL import Image
+
+    source_path = Path(source)
+    outputs = []
+    with Image.open(source_path) as image:
+        image = image.convert("RGB")
+        original_width, original_height = image.size
+        widths = sorted({min(width, original_width) for width in settings.widths})
+        for width in widths:
+            height = round(original_height * width / original_width)
+            resized = image if width == original_width else image.resize((width, height), Image.Resampling.LANCZOS)
+            for fmt in settings.formats:
+                target = Path(output_dir) / f"{source_path.stem}-{width}.{fmt}"
+                buffer = io.BytesIO()
+                resized.save(buffer, format=fmt.upper(), quality=settings.quality, method=4)
+                atomic_write_bytes(target, buffer.getvalue())
+                outputs.append(
+                    {
+                        "path": target.name,
+                        "width": width,
+                        "height": height,
+                        "format": fmt,
+                        "bytes": buffer.tell(),
+                    }
+                )
+    return {"width": original_width, "height": original_height, "outputs": outputs}
+
+
+def load_manifest(path: Path = MANIFEST_FILE) -> dict:
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {"settings": None, "sources": {}}
+
+
+def _outputs_exist(entry: dict, output_dir: Path) -> bool:
+    return all((output_dir / output["path"]).exists() for output in entry["outputs"])
+
+
+def _is_current(entry: dict | None, stat: os.stat_result, output_dir: Path) -> bool:
+    if not entry or not _outputs_exist(entry, output_dir):
+        return False
+    return entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size
+
+
+def build_derivatives(
+    sources: list[Path],
+    settings: DerivativeSettings = DerivativeSettings(),
+    *,
+    output_dir: Path = DERIVED_DIR,
+    manifest_file: Path = MANIFEST_FILE,
+    workers: int | None = None,
+    force: bool = False,
+    on_built: Callable[[str], None] | None = None,
+) -> tuple[dict, BuildReport]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(manifest_file)
+    settings_record = json.loads(json.dumps(asdict(settings)))
+    if manifest.get("settings") != settings_record:
+        force = True
+    previous = manifest.get("sources", {})
+    current = {}
+    report = BuildReport()
+    pending = []
+
+    for source in sources:
+        stat = source.stat()
+        entry = previous.get(source.name)
+        if not force and _is_current(entry, stat, output_dir):
+            current[source.name] = entry
+            report.unchanged.append(source.name)
+            continue
+        digest = sha256_file(source)
+        if not force and entry and entry["sha256"] == digest and _outputs_exist(entry, output_dir):
+            # Touched but not modified: refresh the stat fields only.
+            current[source.name] = {**entry, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            report.unchanged.append(source.name)
+            continue
+        pending.append((source, stat, digest))
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(render_derivatives, str(source), str(output_dir), settings): (source, stat, digest)
+                for source, stat, digest in pending
+            }
+            for future in as_completed(futures):
+                source, stat, digest = futures[future]
+                try:
+                    rendered = future.result()
+                except Exception as exc:
+                    report.failed[source.name] = str(exc)
+                    if source.name in previous:
+                        current[source.name] = previous[source.name]
+                    continue
+                current[source.name] = {
+                    "sha256": digest,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    **rendered,
+                }
+                report.built.append(source.name)
+                report.bytes_in += stat.st_size
+                report.bytes_out += sum(output["bytes"] for output in rendered["outputs"])
+                if on_built:
+                    on_built(source.name)
+
+    for name, entry in previous.items():
+        if name in current:
+            continue
+        for output in entry["outputs"]:
+            (output_dir / output["path"]).unlink(missing_ok=True)
+        report.removed.append(name)
+
+    manifest = {"settings": settings_record, "sources": {name: current[name] for name in sorted(current)}}
+    atomic_write_bytes(manifest_file, json.dumps(manifest, indent=2).encode("utf-8"))
+    return manifest, report
+
+
+def srcset_mapping(manifest: dict, mapping: dict, output_dir: Path = DERIVED_DIR) -> dict:
+    """Build ``{scene key: {src, width, height, sources: [{type, srcset}]}}``.
+
+    ``mapping`` is ``scene-image-mapping.json`` (key -> PNG path); scenes that
+    are not in it are keyed by file stem so every built image is reachable.
+    """
+    prefix = output_dir.relative_to(BASE_DIR).as_posix()
+    keys = {Path(path).name: key for key, path in mapping.items()}
+    result = {}
+    for name, entry in manifest["sources"].items():
+        key = keys.get(name, Path(name).stem)
+        sources = []
+        for fmt in ("avif", "webp"):
+            outputs = sorted((o for o in entry["outputs"] if o["format"] == fmt), key=lambda o: o["width"])
+            if outputs:
+                srcset = ", ".join(f"{prefix}/{o['path']} {o['width']}w" for o in outputs)
+                sources.append({"type": MIME_TYPES[fmt], "srcset": srcset})
+        result[key] = {
+            "src": mapping.get(key, f"{SCENES_DIR.relative_to(BASE_DIR).as_posix()}/{name}"),
+            "width": entry["width"],
+            "height": entry["height"],
+            "sources": sources,
+        }
+    return {key: result[key] for key in sorted(result)}
@@ -0,0 +1,262 @@
+"""Content-hashed, precompressed static build of the game in ``dist/``.
+
+Every asset the game can request is copied to ``name.<hash>.ext``. Those
+assets are the reference index from :mod:`modelit_assets.validation` plus
+any quoted path in the pages that exists on disk. References are then
+rewritten to the hashed names:
+
+* quoted literals in the HTML pages, story-data.js and the values of
+  scene-image-mapping.json are replaced directly;
+* template literals that build a path at runtime (the ``getVoiceFile()``
+  voice clips) are wrapped in ``assetUrl()``, backed by a small
+  ``ASSET_MANIFEST`` injected ahead of the first script.
+
+The story is also split into per-chapter chunks under ``story/`` (see
+:mod:`modelit_assets.chunks`), and the build fails if they do not round-trip.
+
+The HTML entry points keep their names, so they can be served with
+``no-cache`` while everything else is immutable. Text files get ``.gz`` and,
+when the optional ``brotli`` module is installed, ``.br`` siblings.
+
+Rebuilds are incremental. Source hashes come from a stat cache, outputs
+whose content is unchanged are left untouched, and files no longer produced
+are pruned.
+"""
+
+import gzip
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .chunks import INDEX_FILE, rewrite_paths, split_story, verify
+from .files import atomic_copy, atomic_write_bytes
+from .paths import BASE_DIR, CACHE_DIR
+from .story import load_mapping, load_story
+from .validation import StatCache, reference_index
+
+DIST_DIR = BASE_DIR / "dist"
+STAT_CACHE_FILE = CACHE_DIR / "dist-stat-cache.json"
+MANIFEST_NAME = "asset-manifest.json"
+PAGES = ("index.html", "modelit-story.html")
+STORY_SCRIPT = "story-data.js"
+MAPPING_JSON = "scene-image-mapping.json"
+TEXT_SUFFIXES = {".html", ".js", ".json", ".css", ".svg", ".txt"}
+ASSET_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp", ".avif", ".svg", ".mp3", ".ogg", ".js", ".json", ".css"}
+HASH_LENGTH = 10
+
+_QUOTED = re.compile(r"""(?P<quote>['"])(?P<path>[^'"\s<>()]+?)(?P=quote)""")
+_DYNAMIC = re.compile(r"`(?P<path>(?:images|audio)/[^`]*)`")
+_RUNTIME = """<script>
+window.ASSET_MANIFEST = {manifest};
+function assetUrl(path) {{ return window.ASSET_MANIFEST[path] || path; }}
+</script>
+"""
+
+
+def hashed_name(relative: str, digest: str) -> str:
+    path = Path(relative)
+    return path.with_name(f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}").as_posix()
+
+
+def rewrite_quoted(text: str, mapping: dict[str, str]) -> str:
+    def replace(match: re.Match) -> str:
+        target = mapping.get(match.group("path"))
+        return f"{match.group('quote')}{target}{match.group('quote')}" if target else match.group(0)
+
+    return _QUOTED.sub(replace, text)
+
+
+def rewrite_dynamic(text: str) -> tuple[str, set[str]]:
+    """Wrap runtime-built asset paths in ``assetUrl()``; return the directories they use."""
+    prefixes = set()
+
+    def replace(match: re.Match) -> str:
+        path = match.group("path")
+        prefixes.add(path.split("${", 1)[0].rsplit("/", 1)[0] + "/")
+        return f"assetUrl(`{path}`)"
+
+    return _DYNAMIC.sub(replace, text), prefixes
+
+
+def inject_runtime(html: str, manifest: dict[str, str]) -> str:
+    script = _RUNTIME.format(manifest=json.dumps(manifest, separators=(",", ":"), sort_keys=True))
+    index = html.find("<script")
+    if index == -1:
+        index = html.find("</head>")
+    return html[:index] + script + "    " + html[index:] if index != -1 else script + html
+
+
+def page_references(text: str, base_dir: Path) -> set[str]:
+    """Quoted relative paths in ``text`` that name an existing asset file."""
+    found = set()
+    for match in _QUOTED.finditer(text):
+        path = match.group("path")
+        if "://" in path or path.startswith(("/", "#", "data:")) or Path(path).suffix.lower() not in ASSET_SUFFIXES:
+            continue
+        if (base_dir / path).is_file():
+            found.add(path)
+    return found
+
+
+@dataclass
+class BuildReport:
+    written: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    pruned: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    chunk_problems: list[str] = field(default_factory=list)
+    raw_bytes: int = 0
+    gzip_bytes: int = 0
+    brotli_bytes: int = 0
+    brotli: bool = False
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+class _Writer:
+    """Writes outputs only when their bytes differ and tracks what was produced."""
+
+    def __init__(self, out_dir: Path, report: BuildReport, compress: bool):
+        self.out_dir = out_dir
+        self.report = report
+        self.produced: set[str] = set()
+        self.compress = compress
+        self.brotli = _brotli() if compress else None
+        report.brotli = self.brotli is not None
+
+    def _put(self, relative: str, data: bytes) -> None:
+        self.produced.add(relative)
+        target = self.out_dir / relative
+        if target.exists() and target.stat().st_size == len(data) and target.read_bytes() == data:
+            self.report.unchanged += 1
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(target, data)
+        self.report.written.append(relative)
+
+    def text(self, relative: str, data: bytes) -> None:
+        self._put(relative, data)
+        if not self.compress or Path(relative).suffix not in TEXT_SUFFIXES:
+            return
+        self.report.raw_bytes += len(data)
+        packed = gzip.compress(data, compresslevel=9, mtime=0)
+        self.report.gzip_bytes += len(packed)
+        self._put(relative + ".gz", packed)
+        if self.brotli:
+            packed = self.brotli.compress(data, quality=11)
+            self.report.brotli_bytes += len(packed)
+            self._put(relative + ".br", packed)
+
+    def copy(self, source: Path, relative: str) -> None:
+        self.produced.add(relative)
+        target = self.out_dir / relative
+        if target.exists() and target.stat().st_size == source.stat().st_size:
+            # The name carries the content hash, so an existing file is current.
+            self.report.unchanged += 1
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        atomic_copy(source, target)
+        self.report.written.append(relative)
+
+    def prune(self) -> None:
+        keep = self.produced | {MANIFEST_NAME}
+        for path in sorted(self.out_dir.rglob("*")):
+            relative = path.relative_to(self.out_dir).as_posix()
+            if path.is_file() and relative not in keep:
+                path.unlink()
+                self.report.pruned.append(relative)
+        for path in sorted(self.out_dir.rglob("*"), reverse=True):
+            if path.is_dir() and not any(path.iterdir()):
+                path.rmdir()
+
+
+def build_dist(
+    base_dir: Path = BASE_DIR,
+    out_dir: Path = DIST_DIR,
+    *,
+    stat_cache: StatCache | None = None,
+    compress: bool = True,
+) -> tuple[dict, BuildReport]:
+    """Build ``out_dir``; return the asset manifest and a report."""
+    stat_cache = stat_cache or StatCache(STAT_CACHE_FILE)
+    report = BuildReport()
+    writer = _Writer(out_dir, report, compress)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    pages = {name: (base_dir / name).read_text(encoding="utf-8") for name in PAGES if (base_dir / name).is_file()}
+    story_source = (base_dir / STORY_SCRIPT).read_text(encoding="utf-8")
+    mapping = load_mapping(base_dir / MAPPING_JSON)
+    story = load_story(base_dir / STORY_SCRIPT)
+    wanted = set(reference_index(story, mapping))
+    for text in [story_source, *pages.values()]:
+        wanted |= page_references(text, base_dir)
+    wanted -= {STORY_SCRIPT, MAPPING_JSON}
+
+    manifest: dict[str, dict] = {}
+    renames: dict[str, str] = {}
+    for relative in sorted(wanted):
+        source = base_dir / relative
+        if not source.is_file():
+            report.missing.append(relative)
+            continue
+        digest, size, _ = stat_cache.lookup(relative, source)
+        target = hashed_name(relative, digest)
+        writer.copy(source, target)
+        renames[relative] = target
+        manifest[relative] = {"file": target, "sha256": digest, "size": size}
+
+    def emit(relative: str, data: bytes) -> None:
+        digest = hashlib.sha256(data).hexdigest()
+        target = hashed_name(relative, digest)
+        writer.text(target, data)
+        renames[relative] = target
+        manifest[relative] = {"file": target, "sha256": digest, "size": len(data)}
+
+    emit(STORY_SCRIPT, rewrite_quoted(story_source, renames).encode("utf-8"))
+    hashed_mapping = {key: renames.get(path, path) for key, path in mapping.items()}
+    emit(MAPPING_JSON, (json.dumps(hashed_mapping, indent=2) + "\n").encode("utf-8"))
+
+    asset_renames = {path: target for path, target in renames.items() if path in wanted}
+    chunks = split_story(
+        story, renames=asset_renames, name=lambda relative, data: hashed_name(relative, hashlib.sha256(data).hexdigest())
+    )
+    report.chunk_problems = verify(rewrite_paths(story, asset_renames), chunks)
+    for logical, target in chunks.names.items():
+        data = chunks.files[target]
+        writer.text(target, data)
+        manifest[logical] = {"file": target, "sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+    index_bytes = chunks.index_bytes
+    writer.text(INDEX_FILE, index_bytes)
+    manifest[INDEX_FILE] = {"file": INDEX_FILE, "sha256": hashlib.sha256(index_bytes).hexdigest(), "size": len(index_bytes)}
+
+    for name, html in pages.items():
+        html, prefixes = rewrite_dynamic(rewrite_quoted(html, renames))
+        if prefixes:
+            runtime = {path: target for path, target in renames.items() if path.startswith(tuple(prefixes))}
+            html = inject_runtime(html, runtime)
+        data = html.encode("utf-8")
+        writer.text(name, data)
+        manifest[name] = {"file": name, "sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+    for entry in manifest.values():
+        suffix = Path(entry["file"]).suffix
+        if compress and suffix in TEXT_SUFFIXES:
+            entry["encodings"] = ["br", "gzip"] if report.brotli else ["gzip"]
+
+    stat_cache.save()
+    writer.prune()
+    ordered = {name: manifest[name] for name in sorted(manifest)}
+    manifest_bytes = (json.dumps(ordered, indent=2) + "\n").encode("utf-8")
+    manifest_file = out_dir / MANIFEST_NAME
+    if not manifest_file.exists() or manifest_file.read_bytes() != manifest_bytes:
+        atomic_write_bytes(manifest_file, manifest_bytes)
+        report.written.append(MANIFEST_NAME)
+    return ordered, report
@@ -0,0 +1,120 @@
+"""Streaming, resumable, atomic downloads of generated images.
+
+Downloads stream in chunks to a hidden ``.part`` file next to the
+destination, named after the URL, and resume with an HTTP ``Range`` request
+when the connection drops. The ``.part`` file outlives the call, so a
+download interrupted by a killed process resumes on the next call for the
+same URL. Files are validated (PNG signature and per-chunk CRC) before an
+fsync'd ``os.replace`` swaps them in; resumed bytes that fail validation
+are discarded and fetched again. A crash at any point leaves the existing
+asset untouched.
+"""
+
+import hashlib
+import time
+from pathlib import Path
+
+import requests
+
+from .files import CHUNK_SIZE, AssetError, commit, validate_for
+
+
+class DownloadError(AssetError):
+    pass
+
+
+def partial_path(url: str, destination: Path) -> Path:
+    """Where the bytes of ``url`` collect until they are complete."""
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+    return destination.with_name(f".{destination.name}.{key}.part")
+
+
+def _expected_size(response: requests.Response, offset: int) -> int | None:
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    length = response.headers.get("Content-Length")
+    if length is None:
+        return None
+    return int(length) + (offset if response.status_code == 206 else 0)
+
+
+def download(
+    session: requests.Session,
+    url: str,
+    destination: Path,
+    *,
+    timeout: float = 60,
+    max_attempts: int = 4,
+    telemetry=None,
+    name: str = "",
+) -> int:
+    """Stream ``url`` into ``destination``; return the final size in bytes.
+
+    Interrupted transfers and 5xx responses are retried, resuming from the
+    bytes already on disk (from this call or an earlier one) when the
+    server honours ``Range``. With a
+    :class:`~modelit_assets.telemetry.Recorder`, every attempt is recorded
+    as a ``download`` span.
+    """
+    destination = Path(destination)
+    partial = partial_path(url, destination)
+
+    for attempt in range(max_attempts):
+        offset = partial.stat().st_size if partial.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        span = {"attempt": attempt + 1}
+        sent = time.perf_counter()
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                span["status"] = response.status_code
+                span["ttfb"] = response.elapsed.total_seconds()
+                expected = _expected_size(response, offset)
+                if response.status_code == 416:
+                    # Nothing left to send: the partial is either complete or not this file.
+                    if expected != offset:
+                        partial.unlink(missing_ok=True)
+                        continue
+                elif response.status_code >= 500:
+                    raise requests.ConnectionError(f"HTTP {response.status_code}")
+                elif response.status_code not in (200, 206):
+                    raise DownloadError(f"Download failed: {response.status_code}")
+                else:
+                    if response.status_code == 200:
+                        offset = 0
+                    received = 0
+                    with open(partial, "ab" if offset else "wb") as f:
+                        for block in response.iter_content(CHUNK_SIZE):
+                            f.write(block)
+                            received += len(block)
+                            span["bytes_received"] = received
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as exc:
+            span["error"] = f"{type(exc).__name__}: {exc}"
+            span["duration"] = time.perf_counter() - sent
+            if attempt + 1 < max_attempts:
+                time.sleep(min(2 ** attempt, 10))
+            continue
+        finally:
+            if telemetry:
+                span.setdefault("duration", time.perf_counter() - sent)
+                if "ttfb" in span:
+                    span["transfer"] = max(0.0, span["duration"] - span["ttfb"])
+                telemetry.record("download", name or destination.name, **span)
+
+        size = partial.stat().st_size
+        if expected is not None and size < expected:
+            continue
+        try:
+            validate_for(partial, destination)
+        except AssetError:
+            partial.unlink(missing_ok=True)
+            if not offset:
+                raise
+            # The bytes kept from before did not belong with these; start over.
+            continue
+        commit(partial, destination)
+        # Downloads of earlier URLs for this destination will never be resumed now.
+        for stale in destination.parent.glob(f".{destination.name}.*.part"):
+            stale.unlink(missing_ok=True)
+        return size
+    raise DownloadError(f"Download incomplete after {max_attempts} attempts: {url}")
@@ -0,0 +1,274 @@
+"""Concurrent image generation against the OpenRouter images endpoint.
+
+Callers describe a batch as a list of :class:`ImageJob` (``modelit-assets
+generate`` builds them from scene-prompts.json) and hand it to
+:class:`GenerationEngine`, which runs the jobs on a bounded thread pool
+behind a shared :class:`TokenBucket` and retries 429/5xx responses with
+jittered exponential backoff. With a
+:class:`GenerationCache` attached, prompts that already succeeded are copied
+from the cache instead of being re-billed. Images are streamed to disk by
+:mod:`modelit_assets.download` and only replace the existing asset once they
+validate.
+"""
+
+import base64
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Iterable
+
+import requests
+
+from . import config
+from .cache import GenerationCache, payload_key
+from .download import download
+from .files import AssetError, atomic_copy, atomic_write_bytes
+from .http import get_session
+from .ratelimit import TokenBucket
+from .telemetry import Recorder
+
+DEFAULT_BASE_URL = config.get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class ImageJob:
+    filename: str
+    payload: dict
+
+
+@dataclass
+class JobResult:
+    job: ImageJob
+    ok: bool
+    size: int = 0
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: str = ""
+    cached: bool = False
+
+
+@dataclass
+class RunSummary:
+    results: list[JobResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if r.ok)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    @property
+    def cache_hits(self) -> int:
+        return sum(1 for r in self.results if r.cached)
+
+    @property
+    def cache_misses(self) -> int:
+        return len(self.results) - self.cache_hits
+
+    @property
+    def images_per_minute(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.succeeded * 60.0 / self.elapsed
+
+
+class GenerationError(Exception):
+    pass
+
+
+def retry_after_seconds(headers) -> float | None:
+    """Parse ``Retry-After`` as either delta-seconds or an HTTP date."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def reported_cost(response: requests.Response) -> float | None:
+    """Billed cost from an OpenRouter ``usage`` block, when the response carries one."""
+    if response.status_code != 200 or "json" not in response.headers.get("Content-Type", ""):
+        return None
+    try:
+        usage = response.json().get("usage") or {}
+    except ValueError:
+        return None
+    cost = usage.get("cost")
+    return float(cost) if cost is not None else None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff for retry ``attempt`` (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class GenerationEngine:
+    def __init__(
+        self,
+        api_key: str,
+        output_dir: Path,
+        *,
+        title: str = "ModelIt Mystery",
+        base_url: str = DEFAULT_BASE_URL,
+        max_workers: int = 4,
+        max_retries: int = 5,
+        requests_per_second: float = 1.0,
+        burst: int = 4,
+        timeout: float = 120,
+        session: requests.Session | None = None,
+        cache: GenerationCache | None = None,
+        force: bool = False,
+        telemetry: Recorder | None = None,
+    ):
+        self.cache = cache
+        self.telemetry = telemetry
+        self.force = force
+        self.output_dir = Path(output_dir)
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.session = session or get_session()
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "http://localhost:8000",
+            "X-Title": title,
+        }
+
+    def _record(self, kind: str, name: str, **fields) -> None:
+        if self.telemetry:
+            self.telemetry.record(kind, name, **fields)
+
+    def _request(self, method: str, url: str, *, name: str = "", queued: float = 0.0, **kwargs) -> tuple[requests.Response, int]:
+        """Send a rate-limited request, retrying 429/5xx and connection errors.
+
+        ``queued`` is how long the job already waited for a worker; it is
+        added to the first attempt's queue wait in the telemetry.
+        """
+        attempt = 0
+        while True:
+            waited = self.bucket.acquire() + (queued if attempt == 0 else 0.0)
+            sent = time.perf_counter()
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                self._record(
+                    "generation",
+                    name,
+                    attempt=attempt + 1,
+                    queue_wait=waited,
+                    duration=time.perf_counter() - sent,
+                    error=f"{type(exc).__name__}: {exc}",
+                )
+                if attempt >= self.max_retries:
+                    raise GenerationError(f"{type(exc).__name__}: {exc}") from exc
+                time.sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            duration = time.perf_counter() - sent
+            ttfb = min(response.elapsed.total_seconds(), duration)
+            self._record(
+                "generation",
+                name,
+                attempt=attempt + 1,
+                status=response.status_code,
+                queue_wait=waited,
+                ttfb=ttfb,
+                transfer=duration - ttfb,
+                duration=duration,
+                bytes_sent=len(response.request.body or b""),
+                bytes_received=len(response.content),
+                cost=reported_cost(response),
+            )
+            self.bucket.update_from_headers(response.headers)
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                return response, attempt + 1
+
+            delay = backoff_delay(attempt)
+            retry_after = retry_after_seconds(response.headers)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+                if response.status_code == 429:
+                    self.bucket.pause_until(time.time() + retry_after)
+            time.sleep(delay)
+            attempt += 1
+
+    def _save_image(self, entry: dict, destination: Path, name: str) -> int:
+        if entry.get("b64_json"):
+            data = base64.b64decode(entry["b64_json"])
+            atomic_write_bytes(destination, data)
+            return len(data)
+        return download(self.session, entry["url"], destination, telemetry=self.telemetry, name=name)
+
+    def generate(self, job: ImageJob, queued_at: float | None = None) -> JobResult:
+        started = time.perf_counter()
+        queued = started - queued_at if queued_at is not None else 0.0
+        attempts = 0
+        destination = self.output_dir / job.filename
+        key = payload_key(job.payload) if self.cache else None
+        if key and not self.force:
+            cached = self.cache.get(key)
+            if cached:
+                atomic_copy(cached, destination)
+                size = destination.stat().st_size
+                elapsed = time.perf_counter() - started
+                self._record("cache", job.filename, queue_wait=queued, duration=elapsed, bytes_received=size)
+                return JobResult(job, True, size, 0, elapsed, cached=True)
+        try:
+            response, attempts = self._request(
+                "POST",
+                f"{self.base_url}/images/generations",
+                name=job.filename,
+                queued=queued,
+                headers=self.headers,
+                json=job.payload,
+            )
+            if response.status_code != 200:
+                raise GenerationError(f"API Error: {response.status_code} - {response.text[:150]}")
+            size = self._save_image(response.json()["data"][0], destination, job.filename)
+            if key:
+                self.cache.put(key, destination, {"filename": job.filename, "model": job.payload["model"]})
+            return JobResult(job, True, size, attempts, time.perf_counter() - started)
+        except (
+            GenerationError,
+            AssetError,
+            requests.RequestException,
+            KeyError,
+            IndexError,
+            ValueError,
+        ) as exc:
+            return JobResult(job, False, 0, attempts, time.perf_counter() - started, str(exc))
+
+    def run(
+        self,
+        jobs: Iterable[ImageJob],
+        on_result: Callable[[JobResult], None] | None = None,
+    ) -> RunSummary:
+        """Generate every job concurrently; ``on_result`` runs on the calling thread."""
+        summary = RunSummary()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self.generate, job, time.perf_counter()) for job in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                summary.results.append(result)
+                if on_result:
+                    on_result(result)
+        summary.elapsed = time.perf_counter() - started
+        return summary
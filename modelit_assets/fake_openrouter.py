@@ -0,0 +1,472 @@
+"""Local stand-in for the OpenRouter images and OpenAI responses endpoints.
+
+Serves ``POST /api/v1/images/generations``, the image URLs it hands out,
+``POST /v1/responses`` and a small ``GET /api/v1/models`` catalog with an
+``ETag``. Both POST endpoints share the configurable latency,
+random 5xx errors and a fixed-window rate limit that answers 429 with
+``Retry-After`` and ``X-RateLimit-*`` headers. Image downloads honour
+``Range`` and can be cut off mid-body (``drop_rate``) to exercise resumable
+fetches. A minimal Batch API (``/v1/files``, ``/v1/batches``) runs submitted
+``/v1/responses`` jobs after ``batch_duration`` seconds, failing each line
+with probability ``error_rate``. Run it as a separate process to test
+resuming a batch after the client was killed. Point the generators at it with
+``OPENROUTER_BASE_URL=http://127.0.0.1:8799/api/v1`` and an OpenAI client
+with ``base_url=http://127.0.0.1:8799/v1``.
+
+    python -m modelit_assets.fake_openrouter --port 8799 --rate-limit 10
+"""
+
+import argparse
+import email.parser
+import email.policy
+import json
+import random
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+FAKE_MODELS = [
+    {
+        "id": "google/gemini-2.5-flash-image:free",
+        "name": "Google: Gemini 2.5 Flash Image (free)",
+        "context_length": 32768,
+        "architecture": {"input_modalities": ["text", "image"], "output_modalities": ["image", "text"]},
+        "pricing": {"prompt": "0", "completion": "0", "image": "0", "request": "0"},
+    },
+    {
+        "id": "google/gemini-2.5-flash-image",
+        "name": "Google: Gemini 2.5 Flash Image",
+        "context_length": 32768,
+        "architecture": {"input_modalities": ["text", "image"], "output_modalities": ["image", "text"]},
+        "pricing": {"prompt": "0.0000003", "completion": "0.0000025", "image": "0.001238", "request": "0"},
+    },
+    {
+        "id": "openai/gpt-4.1-mini",
+        "name": "OpenAI: GPT-4.1 Mini",
+        "context_length": 1047576,
+        "architecture": {"input_modalities": ["text", "image", "file"], "output_modalities": ["text"]},
+        "pricing": {"prompt": "0.0000004", "completion": "0.0000016", "image": "0", "request": "0"},
+    },
+]
+
+
+def make_png(width: int = 64, height: int = 64, seed: int = 0) -> bytes:
+    """Build a small valid RGB PNG with a flat random colour."""
+    rng = random.Random(seed)
+    pixel = bytes(rng.randrange(256) for _ in range(3))
+    raw = b"".join(b"\x00" + pixel * width for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+class FakeOpenRouter:
+    """Threaded fake provider; use as a context manager in scripts and benchmarks."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: int = 0,
+        window: float = 1.0,
+        image_size: int = 64,
+        drop_rate: float = 0.0,
+        batch_duration: float = 2.0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.window = window
+        self.image_size = image_size
+        self.drop_rate = drop_rate
+        self.batch_duration = batch_duration
+        self.stats = {
+            "generations": 0,
+            "responses": 0,
+            "downloads": 0,
+            "rate_limited": 0,
+            "errors": 0,
+            "dropped": 0,
+            "batches": 0,
+        }
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._window_count = 0
+        self._images: dict[str, bytes] = {}
+        # Repeat requests for one prompt get different colours, like a real model.
+        self._prompt_counts: dict[str, int] = {}
+        self._files: dict[str, dict] = {}
+        self._batches: dict[str, dict] = {}
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.url}/api/v1"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    def add_image(self, image_id: str, data: bytes) -> str:
+        """Serve ``data`` as a downloadable image and return its URL."""
+        with self._lock:
+            self._images[image_id] = data
+        return f"{self.url}/files/{image_id}.png"
+
+    def _take_slot(self) -> tuple[bool, int, float]:
+        """Return (allowed, remaining, reset_epoch) for the fixed window."""
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= self.window:
+                self._window_start = now
+                self._window_count = 0
+            reset = self._window_start + self.window
+            if self.rate_limit and self._window_count >= self.rate_limit:
+                self.stats["rate_limited"] += 1
+                return False, 0, reset
+            self._window_count += 1
+            remaining = self.rate_limit - self._window_count if self.rate_limit else 1000
+            return True, remaining, reset
+
+    def _response(self, body: dict, request_bytes: int) -> dict:
+        """A minimal Responses API object describing the submitted image."""
+        with self._lock:
+            self.stats["responses"] += 1
+            number = self.stats["responses"]
+        text = (
+            "Dr. Maya appears in a white lab coat over a teal shirt with her curly bun, "
+            "in a cyan-lit laboratory. The mood is curious and upbeat; no inconsistencies noted."
+        )
+        input_tokens = 85 + request_bytes // 1000
+        output_tokens = len(text.split())
+        return {
+            "id": f"resp_{number}",
+            "object": "response",
+            "created_at": int(time.time()),
+            "model": body.get("model", "gpt-4.1-mini"),
+            "status": "completed",
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": [],
+            "output": [
+                {
+                    "type": "message",
+                    "id": f"msg_{number}",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": text, "annotations": []}],
+                }
+            ],
+            "usage": {
+                "input_tokens": input_tokens,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": output_tokens,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": input_tokens + output_tokens,
+            },
+        }
+
+    def _add_file(self, data: bytes, filename: str, purpose: str) -> dict:
+        with self._lock:
+            file_id = f"file-{len(self._files) + 1}"
+            self._files[file_id] = {
+                "id": file_id,
+                "object": "file",
+                "bytes": len(data),
+                "created_at": int(time.time()),
+                "filename": filename,
+                "purpose": purpose,
+                "status": "processed",
+                "data": data,
+            }
+            return self._files[file_id]
+
+    def _create_batch(self, body: dict) -> dict:
+        with self._lock:
+            self.stats["batches"] += 1
+            batch_id = f"batch_{self.stats['batches']}"
+            now = time.time()
+            self._batches[batch_id] = {
+                "id": batch_id,
+                "object": "batch",
+                "endpoint": body["endpoint"],
+                "input_file_id": body["input_file_id"],
+                "completion_window": body.get("completion_window", "24h"),
+                "metadata": body.get("metadata"),
+                "status": "validating",
+                "created_at": int(now),
+                "output_file_id": None,
+                "error_file_id": None,
+                "request_counts": {"total": 0, "completed": 0, "failed": 0},
+                "_ready_at": now + self.batch_duration,
+            }
+        return self._batch(batch_id)
+
+    def _batch(self, batch_id: str) -> dict | None:
+        """The batch as the API shows it now, running it once its time is up."""
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return None
+            source = self._files.get(batch["input_file_id"])
+            lines = source["data"].decode("utf-8").splitlines() if source else []
+            total = len([line for line in lines if line.strip()])
+            batch["request_counts"]["total"] = total
+            now = time.time()
+            run = batch["status"] in ("validating", "in_progress") and now >= batch["_ready_at"]
+            if run:
+                batch["status"] = "finalizing"
+            elif batch["status"] == "validating" and now >= batch["created_at"] + 0.1:
+                batch["status"] = "in_progress"
+        if run:
+            outputs, errors = [], []
+            for number, line in enumerate(line for line in lines if line.strip()):
+                request = json.loads(line)
+                if random.random() < self.error_rate:
+                    errors.append(
+                        {
+                            "id": f"batch_req_{number}",
+                            "custom_id": request["custom_id"],
+                            "response": {"status_code": 500, "body": {"error": {"message": "upstream unavailable"}}},
+                            "error": None,
+                        }
+                    )
+                    continue
+                outputs.append(
+                    {
+                        "id": f"batch_req_{number}",
+                        "custom_id": request["custom_id"],
+                        "response": {"status_code": 200, "body": self._response(request["body"], len(line))},
+                        "error": None,
+                    }
+                )
+            output = self._add_file("\n".join(json.dumps(o) for o in outputs).encode("utf-8"), "output.jsonl", "batch_output")
+            failed = self._add_file("\n".join(json.dumps(e) for e in errors).encode("utf-8"), "errors.jsonl", "batch_output")
+            with self._lock:
+                batch.update(
+                    status="completed",
+                    completed_at=int(time.time()),
+                    output_file_id=output["id"],
+                    error_file_id=failed["id"] if errors else None,
+                    request_counts={"total": total, "completed": len(outputs), "failed": len(errors)},
+                )
+        with self._lock:
+            return {key: value for key, value in batch.items() if not key.startswith("_")}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str, headers: dict | None = None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, status: int, payload: dict, headers: dict | None = None):
+                self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+            def _upload(self, raw: bytes):
+                """``POST /v1/files``: multipart form with ``purpose`` and ``file``."""
+                header = f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode("latin-1")
+                form = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(header + raw)
+                fields, filename = {}, "upload.jsonl"
+                for part in form.iter_parts():
+                    name = part.get_param("name", header="content-disposition")
+                    fields[name] = part.get_payload(decode=True)
+                    if name == "file":
+                        filename = part.get_filename() or filename
+                if "file" not in fields:
+                    self._json(400, {"error": {"message": "missing file"}})
+                    return
+                created = fake._add_file(fields["file"], filename, (fields.get("purpose") or b"batch").decode())
+                self._json(200, {key: value for key, value in created.items() if key != "data"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length)
+                path = self.path.rstrip("/")
+                if path == "/v1/files":
+                    self._upload(raw)
+                    return
+                body = json.loads(raw or b"{}")
+                if path == "/v1/batches":
+                    if body.get("input_file_id") not in fake._files:
+                        self._json(404, {"error": {"message": "input file not found"}})
+                        return
+                    self._json(200, fake._create_batch(body))
+                    return
+                if path not in ("/api/v1/images/generations", "/v1/responses"):
+                    self._json(404, {"error": {"message": "not found"}})
+                    return
+
+                allowed, remaining, reset = fake._take_slot()
+                rate_headers = {
+                    "X-RateLimit-Limit": str(fake.rate_limit or 1000),
+                    "X-RateLimit-Remaining": str(remaining),
+                    "X-RateLimit-Reset": str(int(reset * 1000)),
+                }
+                if not allowed:
+                    rate_headers["Retry-After"] = f"{max(0.0, reset - time.time()):.2f}"
+                    self._json(429, {"error": {"message": "rate limited"}}, rate_headers)
+                    return
+
+                if fake.latency:
+                    time.sleep(fake.latency)
+                if random.random() < fake.error_rate:
+                    with fake._lock:
+                        fake.stats["errors"] += 1
+                    self._json(503, {"error": {"message": "upstream unavailable"}}, rate_headers)
+                    return
+
+                if path == "/v1/responses":
+                    self._json(200, fake._response(body, length), rate_headers)
+                    return
+                with fake._lock:
+                    fake.stats["generations"] += 1
+                    image_id = f"img{fake.stats['generations']}"
+                    prompt = body.get("prompt", "")
+                    repeat = fake._prompt_counts.get(prompt, 0)
+                    fake._prompt_counts[prompt] = repeat + 1
+                    seed = zlib.crc32(prompt.encode("utf-8")) + repeat
+                    fake._images[image_id] = make_png(fake.image_size, fake.image_size, seed)
+                self._json(
+                    200,
+                    {"created": int(time.time()), "data": [{"url": f"{fake.url}/files/{image_id}.png"}]},
+                    rate_headers,
+                )
+
+            def do_GET(self):
+                if self.path.startswith("/v1/batches/"):
+                    batch = fake._batch(self.path.rstrip("/").rsplit("/", 1)[-1])
+                    if batch is None:
+                        self._json(404, {"error": {"message": "batch not found"}})
+                    else:
+                        self._json(200, batch)
+                    return
+                if self.path.startswith("/v1/files/") and self.path.endswith("/content"):
+                    stored = fake._files.get(self.path.split("/")[3])
+                    if stored is None:
+                        self._json(404, {"error": {"message": "file not found"}})
+                    else:
+                        self._send(200, stored["data"], "application/octet-stream")
+                    return
+                if self.path.rstrip("/") == "/api/v1/models":
+                    body = json.dumps({"data": FAKE_MODELS}).encode("utf-8")
+                    etag = f'"{zlib.crc32(body):08x}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self._send(304, b"", "application/json", {"ETag": etag})
+                    else:
+                        self._send(200, body, "application/json", {"ETag": etag})
+                    return
+                image_id = self.path.rsplit("/", 1)[-1].removesuffix(".png")
+                image = fake._images.get(image_id)
+                if not self.path.startswith("/files/") or image is None:
+                    self._json(404, {"error": {"message": "not found"}})
+                    return
+                with fake._lock:
+                    fake.stats["downloads"] += 1
+
+                status, start, headers = 200, 0, {"Accept-Ranges": "bytes"}
+                requested = self.headers.get("Range", "")
+                if requested.startswith("bytes="):
+                    start = int(requested[6:].split("-", 1)[0] or 0)
+                    if start >= len(image):
+                        self._send(416, b"", "image/png", {"Content-Range": f"bytes */{len(image)}"})
+                        return
+                    status = 206
+                    headers["Content-Range"] = f"bytes {start}-{len(image) - 1}/{len(image)}"
+                body = image[start:]
+
+                if random.random() < fake.drop_rate and len(body) > 1:
+                    with fake._lock:
+                        fake.stats["dropped"] += 1
+                    self.send_response(status)
+                    self.send_header("Content-Type", "image/png")
+                    self.send_header("Content-Length", str(len(body)))
+                    for key, value in headers.items():
+                        self.send_header(key, value)
+                    self.end_headers()
+                    self.wfile.write(body[: len(body) // 2])
+                    self.close_connection = True
+                    return
+                self._send(status, body, "image/png", headers)
+
+        return Handler
+
+    def start(self) -> "FakeOpenRouter":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOpenRouter":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per generation or response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503 responses")
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests per window (0 = unlimited)")
+    parser.add_argument("--window", type=float, default=1.0, help="rate-limit window in seconds")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of downloads cut off mid-body")
+    parser.add_argument("--batch-duration", type=float, default=30.0, help="seconds before a submitted batch completes")
+    args = parser.parse_args()
+
+    fake = FakeOpenRouter(
+        args.host,
+        args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        window=args.window,
+        drop_rate=args.drop_rate,
+        batch_duration=args.batch_duration,
+    )
+    print(f"Fake OpenRouter listening on {fake.base_url} (OpenAI responses at {fake.openai_base_url})")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
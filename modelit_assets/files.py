@@ -0,0 +1,144 @@
+"""Atomic file writes and structural checks for binary assets.
+
+Kept free of third-party imports so validators can use it without paying
+for ``requests`` or Pillow at startup.
+"""
+
+import os
+import stat
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_MP3_BITRATE_INVALID = 0xF
+_MP3_RATE_INVALID = 0x3
+
+
+class AssetError(Exception):
+    pass
+
+
+def validate_png(path: Path) -> None:
+    """Raise :class:`AssetError` unless ``path`` is a structurally complete PNG."""
+    with open(path, "rb") as f:
+        if f.read(8) != PNG_SIGNATURE:
+            raise AssetError(f"{path.name}: missing PNG signature")
+        first = True
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise AssetError(f"{path.name}: truncated before IEND")
+            length, kind = struct.unpack(">I4s", header)
+            if first and kind != b"IHDR":
+                raise AssetError(f"{path.name}: first chunk is {kind!r}, not IHDR")
+            first = False
+            crc = zlib.crc32(kind)
+            remaining = length
+            while remaining:
+                block = f.read(min(remaining, CHUNK_SIZE))
+                if not block:
+                    raise AssetError(f"{path.name}: truncated inside {kind.decode('latin-1')} chunk")
+                crc = zlib.crc32(block, crc)
+                remaining -= len(block)
+            stored = f.read(4)
+            if len(stored) < 4 or struct.unpack(">I", stored)[0] != crc:
+                raise AssetError(f"{path.name}: CRC mismatch in {kind.decode('latin-1')} chunk")
+            if kind == b"IEND":
+                return
+
+
+def validate_mp3(path: Path) -> None:
+    """Raise :class:`AssetError` unless ``path`` starts with a valid MPEG audio frame."""
+    with open(path, "rb") as f:
+        head = f.read(10)
+        offset = 0
+        if head[:3] == b"ID3" and len(head) == 10:
+            # ID3v2 sizes are four 7-bit "syncsafe" bytes.
+            size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            offset = 10 + size + (10 if head[5] & 0x10 else 0)
+        f.seek(offset)
+        window = f.read(4096)
+    for i in range(len(window) - 3):
+        if window[i] != 0xFF or window[i + 1] & 0xE0 != 0xE0:
+            continue
+        version = (window[i + 1] >> 3) & 0x3
+        layer = (window[i + 1] >> 1) & 0x3
+        bitrate = window[i + 2] >> 4
+        rate = (window[i + 2] >> 2) & 0x3
+        if version != 1 and layer != 0 and bitrate != _MP3_BITRATE_INVALID and rate != _MP3_RATE_INVALID:
+            return
+    raise AssetError(f"{path.name}: no MPEG audio frame found")
+
+
+def _fsync_dir(directory: Path) -> None:
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _default_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# mkstemp creates 0600 files; committed assets get the mode a plain open()
+# would have given them, so a web server running as another user can read them.
+_DEFAULT_MODE = _default_mode()
+
+
+def commit(tmp: Path, destination: Path) -> None:
+    """Move ``tmp`` over ``destination``, keeping the destination's mode if it exists."""
+    try:
+        mode = stat.S_IMODE(destination.stat().st_mode)
+    except FileNotFoundError:
+        mode = _DEFAULT_MODE
+    with open(tmp, "rb+") as f:
+        os.fsync(f.fileno())
+    os.chmod(tmp, mode)
+    os.replace(tmp, destination)
+    _fsync_dir(destination.parent)
+
+
+def validate_for(path: Path, destination: Path) -> None:
+    suffix = destination.suffix.lower()
+    if suffix == ".png":
+        validate_png(path)
+    elif suffix == ".mp3":
+        validate_mp3(path)
+
+
+def atomic_write_bytes(destination: Path, data: bytes) -> None:
+    """Write ``data`` to ``destination`` via a validated, fsync'd temp file."""
+    fd, tmp = tempfile.mkstemp(dir=destination.parent, prefix=f".{destination.name}.", suffix=".tmp")
+    tmp = Path(tmp)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        validate_for(tmp, destination)
+        commit(tmp, destination)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def atomic_copy(source: Path, destination: Path) -> None:
+    """Copy ``source`` over ``destination`` without ever exposing a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=destination.parent, prefix=f".{destination.name}.", suffix=".tmp")
+    tmp = Path(tmp)
+    try:
+        with os.fdopen(fd, "wb") as out, open(source, "rb") as src:
+            while block := src.read(CHUNK_SIZE):
+                out.write(block)
+        validate_for(tmp, destination)
+        commit(tmp, destination)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
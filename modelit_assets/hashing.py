@@ -0,0 +1,14 @@
+"""File content hashing shared by the cache, analyzer and validators."""
+
+import hashlib
+from pathlib import Path
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(CHUNK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
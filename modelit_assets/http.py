@@ -0,0 +1,45 @@
+"""Process-wide HTTP clients.
+
+Every command talks to the same few hosts, so one pooled
+:class:`requests.Session` (and one OpenAI client) is created on first use
+and reused afterwards, keeping TLS connections alive across calls. The
+imports happen inside the factories so commands that never touch the
+network do not pay for them.
+"""
+
+import threading
+
+from . import config
+
+POOL_SIZE = 16
+
+_lock = threading.Lock()
+_session = None
+_openai_client = None
+
+
+def get_session():
+    """Return the shared :class:`requests.Session`."""
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def openai_client(max_retries: int = 5):
+    """Return the shared OpenAI client, keyed from ``OPENAI_API_KEY``."""
+    global _openai_client
+    with _lock:
+        if _openai_client is None:
+            from openai import OpenAI
+
+            api_key = config.require("OPENAI_API_KEY", "call the OpenAI API")
+            _openai_client = OpenAI(api_key=api_key, max_retries=max_retries)
+        return _openai_client
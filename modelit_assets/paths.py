@@ -0,0 +1,10 @@
+"""Well-known locations in the repository."""
+
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+IMAGES_DIR = BASE_DIR / "images"
+SCENES_DIR = IMAGES_DIR / "scenes"
+AUDIO_DIR = BASE_DIR / "audio"
+VOICE_DIR = AUDIO_DIR / "voice"
+CACHE_DIR = BASE_DIR / ".cache"
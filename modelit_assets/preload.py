@@ -0,0 +1,137 @@
+"""Prefetch manifest computed from the story's navigation graph.
+
+Every screen the game can show (scene, learning moment, choice, choice
+feedback) is a node whose outgoing edges follow index.html: scenes advance in
+order, choices branch evenly across their options, boss-level game-overs send
+the player back to the start of the chapter, and correct answers move on to
+``option.next``. For each node, the assets needed in the next ``depth`` steps
+are listed with the probability of being needed, the step at which they are
+first needed and their size, most likely first.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .paths import BASE_DIR
+from .story import (
+    choice_voice_id,
+    feedback_voice_id,
+    learning_voice_id,
+    scene_image,
+    scene_voice_id,
+    voice_path,
+)
+
+ENDING = "ending"
+PRELOAD_FILE = BASE_DIR / "preload-manifest.json"
+
+
+@dataclass
+class Node:
+    assets: list[str]
+    edges: list[tuple[str, float]] = field(default_factory=list)
+
+
+def _after_scene(chapter: dict, index: int) -> str:
+    if index < len(chapter["scenes"]) - 1:
+        return f"ch{chapter['id']}_scene{index + 1}"
+    if chapter.get("choice"):
+        return f"ch{chapter['id']}_choice"
+    return ENDING
+
+
+def story_graph(story: dict) -> dict[str, Node]:
+    chapters = {chapter["id"]: chapter for chapter in story["chapters"]}
+    graph = {ENDING: Node([])}
+    for chapter_id, chapter in chapters.items():
+        for index, scene in enumerate(chapter["scenes"]):
+            key = f"ch{chapter_id}_scene{index}"
+            image = scene_image(chapter, scene)
+            images = [image] if image else []
+            following = _after_scene(chapter, index)
+            dialogue = images + [voice_path(scene_voice_id(chapter_id, index))]
+            if scene.get("learning"):
+                learning = f"{key}_learning"
+                graph[key] = Node(dialogue, [(learning, 1.0)])
+                graph[learning] = Node(
+                    images + [voice_path(learning_voice_id(chapter_id, index))],
+                    [(following, 1.0)],
+                )
+            else:
+                graph[key] = Node(dialogue, [(following, 1.0)])
+
+        choice = chapter.get("choice")
+        if not choice:
+            continue
+        options = choice["options"]
+        graph[f"ch{chapter_id}_choice"] = Node(
+            [voice_path(choice_voice_id(chapter_id))],
+            [(f"ch{chapter_id}_option{i}", 1.0 / len(options)) for i in range(len(options))],
+        )
+        for i, option in enumerate(options):
+            if option.get("gameOver"):
+                target = f"ch{chapter_id}_scene0"
+            elif option.get("next") in chapters:
+                target = f"ch{option['next']}_scene0"
+            else:
+                target = ENDING
+            graph[f"ch{chapter_id}_option{i}"] = Node(
+                [voice_path(feedback_voice_id(chapter, i))],
+                [(target, 1.0)],
+            )
+    return graph
+
+
+def _asset_kind(path: str) -> str:
+    return "audio" if path.startswith("audio/") else "image"
+
+
+def lookahead(graph: dict[str, Node], start: str, depth: int) -> dict[str, tuple[float, int]]:
+    """Return ``{asset: (probability, first step)}`` for the next ``depth`` steps."""
+    loaded = set(graph[start].assets)
+    found: dict[str, tuple[float, int]] = {}
+    frontier = {start: 1.0}
+    for step in range(1, depth + 1):
+        reached = defaultdict(float)
+        for node, probability in frontier.items():
+            for target, weight in graph[node].edges:
+                reached[target] += probability * weight
+        for node, probability in reached.items():
+            for asset in graph[node].assets:
+                if asset in loaded:
+                    continue
+                best, first = found.get(asset, (0.0, step))
+                found[asset] = (max(best, min(probability, 1.0)), min(first, step))
+        frontier = reached
+    return found
+
+
+def preload_manifest(story: dict, depth: int = 3, base_dir: Path = BASE_DIR, mapping: dict | None = None) -> dict:
+    graph = story_graph(story)
+    keys = {path: key for key, path in (mapping or {}).items()}
+    sizes = {}
+
+    def size_of(asset: str) -> int | None:
+        if asset not in sizes:
+            path = base_dir / asset
+            sizes[asset] = path.stat().st_size if path.exists() else None
+        return sizes[asset]
+
+    nodes = {}
+    for key in graph:
+        entries = []
+        for asset, (probability, step) in lookahead(graph, key, depth).items():
+            entry = {
+                "url": asset,
+                "kind": _asset_kind(asset),
+                "probability": round(probability, 4),
+                "step": step,
+                "bytes": size_of(asset),
+            }
+            if asset in keys:
+                entry["key"] = keys[asset]
+            entries.append(entry)
+        entries.sort(key=lambda e: (-e["probability"], e["step"], e["bytes"] or 0, e["url"]))
+        nodes[key] = entries
+    return {"depth": depth, "nodes": nodes}
@@ -0,0 +1,79 @@
+"""Downscale-before-upload preprocessing for vision requests.
+
+The consistency prompt only needs a few sentences about the character, so
+full 1024px PNGs are resized to ``max_edge`` and re-encoded as JPEG or WebP
+before being base64'd. Derived bytes are cached under ``.cache/vision`` by
+source hash and settings, so repeat runs skip the resize entirely.
+"""
+
+import base64
+import io
+from dataclasses import dataclass
+from pathlib import Path
+
+from .files import atomic_write_bytes
+from .hashing import sha256_file
+from .paths import CACHE_DIR
+
+VISION_CACHE = CACHE_DIR / "vision"
+MIME_TYPES = {"jpeg": "image/jpeg", "webp": "image/webp", "png": "image/png"}
+
+
+@dataclass(frozen=True)
+class PreprocessOptions:
+    max_edge: int = 768
+    format: str = "jpeg"
+    quality: int = 80
+
+    @property
+    def suffix(self) -> str:
+        return "jpg" if self.format == "jpeg" else self.format
+
+
+@dataclass
+class PreparedImage:
+    data: bytes
+    mime: str
+    source_bytes: int
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.source_bytes - len(self.data)
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime};base64,{base64.b64encode(self.data).decode('utf-8')}"
+
+
+def _render(path: Path, options: PreprocessOptions) -> bytes:
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image = image.convert("RGB")
+        image.thumbnail((options.max_edge, options.max_edge), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format=options.format.upper(), quality=options.quality, optimize=True)
+    return buffer.getvalue()
+
+
+def prepare_image(
+    path: Path,
+    options: PreprocessOptions | None = None,
+    *,
+    digest: str | None = None,
+    cache_dir: Path = VISION_CACHE,
+) -> PreparedImage:
+    """Return the bytes to upload for ``path``; ``options=None`` sends the original."""
+    source_bytes = path.stat().st_size
+    if options is None:
+        return PreparedImage(path.read_bytes(), "image/png", source_bytes)
+
+    digest = digest or sha256_file(path)
+    cached = cache_dir / f"{digest}-{options.max_edge}-q{options.quality}.{options.suffix}"
+    if cached.exists():
+        data = cached.read_bytes()
+    else:
+        data = _render(path, options)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(cached, data)
+    return PreparedImage(data, MIME_TYPES[options.format], source_bytes)
@@ -0,0 +1,189 @@
+"""Declarative scene prompts and incremental regeneration plans.
+
+scene-prompts.json holds everything needed to rebuild a scene image:
+
+* ``fragments`` - shared prompt text such as the character design sheets,
+* ``profiles`` - a prompt ``template`` plus the model ``request``, its price
+  and typical latency,
+* ``scenes`` - per scene key (the keys of scene-image-mapping.json, which
+  also gives the output path) the scene description for each profile.
+
+Every generated image depends on the fragments its template names, the
+template, the model request and its own description. Those dependencies are
+hashed, and scene-prompts.lock.json records the hashes that produced each
+output, so after an edit :func:`plan` regenerates exactly the scenes whose
+inputs changed.
+"""
+
+import hashlib
+import json
+import math
+import string
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .files import atomic_write_bytes
+from .paths import BASE_DIR
+from .story import MAPPING_FILE, load_mapping
+
+PROMPTS_FILE = BASE_DIR / "scene-prompts.json"
+LOCK_FILE = BASE_DIR / "scene-prompts.lock.json"
+SCENE_FIELD = "scene"
+
+
+class PromptManifestError(ValueError):
+    pass
+
+
+def _digest(value) -> str:
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def template_fields(template: str) -> list[str]:
+    return [name for _, name, _, _ in string.Formatter().parse(template) if name]
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    title: str
+    request_title: str
+    template: str
+    request: dict
+    cost_per_image: float = 0.0
+    seconds_per_image: float = 15.0
+
+
+@dataclass(frozen=True)
+class ScenePrompt:
+    key: str
+    profile: Profile
+    output: str
+    payload: dict
+    deps: dict[str, str]
+
+
+@dataclass
+class PromptManifest:
+    fragments: dict[str, str]
+    profiles: dict[str, Profile]
+    scenes: dict[str, dict]
+
+    @classmethod
+    def load(cls, path: Path = PROMPTS_FILE) -> "PromptManifest":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        profiles = {name: Profile(name=name, **spec) for name, spec in data.get("profiles", {}).items()}
+        manifest = cls(data.get("fragments", {}), profiles, data.get("scenes", {}))
+        manifest.check()
+        return manifest
+
+    def check(self) -> None:
+        for profile in self.profiles.values():
+            if "model" not in profile.request:
+                raise PromptManifestError(f"profile {profile.name!r}: request has no model")
+            for name in template_fields(profile.template):
+                if name != SCENE_FIELD and name not in self.fragments:
+                    raise PromptManifestError(f"profile {profile.name!r}: unknown fragment {{{name}}}")
+        for key, scene in self.scenes.items():
+            for name in scene:
+                if name != "output" and name not in self.profiles:
+                    raise PromptManifestError(f"scene {key!r}: unknown profile {name!r}")
+
+    def resolve(self, profile_name: str, mapping: dict) -> list[ScenePrompt]:
+        """Every scene that has a description for ``profile_name``, with its dependency hashes."""
+        if profile_name not in self.profiles:
+            raise PromptManifestError(f"unknown profile {profile_name!r}")
+        profile = self.profiles[profile_name]
+        fragments = [name for name in template_fields(profile.template) if name != SCENE_FIELD]
+        shared = {f"fragment:{name}": _digest(self.fragments[name]) for name in fragments}
+        shared[f"template:{profile.name}"] = _digest(profile.template)
+        shared[f"request:{profile.name}"] = _digest(profile.request)
+
+        prompts = []
+        for key, scene in self.scenes.items():
+            if profile_name not in scene:
+                continue
+            output = scene.get("output") or mapping.get(key)
+            if not output:
+                raise PromptManifestError(f"scene {key!r} is not in {MAPPING_FILE.name} and has no output")
+            description = scene[profile_name]
+            prompt = profile.template.format(**{name: self.fragments[name] for name in fragments}, scene=description)
+            deps = dict(shared)
+            deps[f"scene:{key}"] = _digest(description)
+            prompts.append(ScenePrompt(key, profile, output, {**profile.request, "prompt": prompt}, deps))
+        return prompts
+
+
+def load_lock(path: Path = LOCK_FILE) -> dict:
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {}
+
+
+def save_lock(lock: dict, path: Path = LOCK_FILE) -> None:
+    ordered = {output: lock[output] for output in sorted(lock)}
+    atomic_write_bytes(path, (json.dumps(ordered, indent=2) + "\n").encode("utf-8"))
+
+
+def record(lock: dict, scene: ScenePrompt) -> None:
+    lock[scene.output] = {"scene": scene.key, "profile": scene.profile.name, "deps": scene.deps}
+
+
+def stale_reasons(scene: ScenePrompt, lock: dict, base_dir: Path = BASE_DIR) -> list[str]:
+    if not (base_dir / scene.output).exists():
+        return ["missing output"]
+    entry = lock.get(scene.output)
+    if entry is None:
+        return ["no lock entry"]
+    if entry["profile"] != scene.profile.name:
+        return [f"profile {entry['profile']} -> {scene.profile.name}"]
+    return [f"{node} changed" for node, value in scene.deps.items() if entry["deps"].get(node) != value]
+
+
+@dataclass
+class PlanItem:
+    scene: ScenePrompt
+    reasons: list[str]
+
+
+@dataclass
+class Plan:
+    profile: Profile
+    build: list[PlanItem] = field(default_factory=list)
+    current: list[ScenePrompt] = field(default_factory=list)
+
+    @property
+    def cost(self) -> float:
+        return len(self.build) * self.profile.cost_per_image
+
+    def estimated_seconds(self, workers: int, requests_per_second: float = 1.0, candidates: int = 1) -> float:
+        """Latency-bound with ``workers`` in flight, but never faster than the rate limit allows."""
+        count = len(self.build) * candidates
+        if not count:
+            return 0.0
+        return max(math.ceil(count / workers) * self.profile.seconds_per_image, count / requests_per_second)
+
+
+def plan(
+    manifest: PromptManifest,
+    profile_name: str,
+    *,
+    lock: dict,
+    mapping: dict | None = None,
+    base_dir: Path = BASE_DIR,
+    only: set[str] | None = None,
+    force: bool = False,
+) -> Plan:
+    """Split the profile's scenes into those to regenerate (with reasons) and those up to date."""
+    scenes = manifest.resolve(profile_name, mapping if mapping is not None else load_mapping())
+    result = Plan(manifest.profiles[profile_name])
+    for scene in scenes:
+        if only is not None and scene.key not in only:
+            continue
+        reasons = ["forced"] if force else stale_reasons(scene, lock, base_dir)
+        if reasons:
+            result.build.append(PlanItem(scene, reasons))
+        else:
+            result.current.append(scene)
+    return result
@@ -0,0 +1,98 @@
+"""Token-bucket limiter that follows the provider's rate-limit headers."""
+
+import threading
+import time
+
+
+def _parse_reset(value: str, now: float) -> float | None:
+    """Turn an ``X-RateLimit-Reset`` value into an absolute ``time.time()``.
+
+    OpenRouter sends epoch milliseconds; other providers send epoch seconds
+    or a relative number of seconds, so all three are accepted.
+    """
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    if reset > 1e12:
+        return reset / 1000.0
+    if reset > 1e9:
+        return reset
+    return now + reset
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    ``rate`` tokens are added per second up to ``capacity``. Responses can
+    tighten the bucket through :meth:`update_from_headers`, and 429s can pause
+    every caller through :meth:`pause_until`.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._window_rate = rate
+        self._window_until = 0.0
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _current_rate(self, now: float) -> float:
+        return self._window_rate if now < self._window_until else self.rate
+
+    def _refill(self, now: float) -> None:
+        rate = self._current_rate(now)
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Block until a token is available; return the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                pause = self._paused_until - now
+                if pause <= 0 and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                if pause > 0:
+                    delay = pause
+                else:
+                    delay = (1 - self._tokens) / self._current_rate(now)
+            time.sleep(delay)
+            waited += delay
+
+    def pause_until(self, wall_time: float) -> None:
+        """Stop handing out tokens until ``wall_time`` (a ``time.time()`` value)."""
+        with self._lock:
+            until = time.monotonic() + max(0.0, wall_time - time.time())
+            self._paused_until = max(self._paused_until, until)
+
+    def update_from_headers(self, headers) -> None:
+        """Adjust to ``X-RateLimit-Remaining``/``X-RateLimit-Reset`` from a response.
+
+        The remaining budget is spread evenly over the rest of the window (the
+        configured ``rate`` applies again once it resets), and an exhausted
+        budget pauses the bucket until the reset.
+        """
+        try:
+            remaining = float(headers.get("X-RateLimit-Remaining"))
+        except (TypeError, ValueError):
+            return
+        reset = _parse_reset(headers.get("X-RateLimit-Reset"), time.time())
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, remaining)
+            if reset is not None and remaining > 0:
+                window = reset - time.time()
+                if window > 0:
+                    self._window_rate = min(self.rate, remaining / window)
+                    self._window_until = now + window
+
+        if remaining <= 0 and reset is not None:
+            self.pause_until(reset)
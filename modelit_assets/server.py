@@ -0,0 +1,461 @@
+"""Small asyncio static file server for testing the game over real HTTP.
+
+It is meant to look like production hosting, unlike ``file://``:
+
+* ``Range`` requests (single range, ``If-Range``) so ``speak()`` and the
+  background music can seek into MP3s,
+* strong ``ETag`` validators plus ``Last-Modified``, answering
+  ``If-None-Match``/``If-Modified-Since`` with 304,
+* ``.br``/``.gz`` siblings (as written by ``modelit-assets build``) are
+  served with ``Content-Encoding`` when the client accepts them,
+* ``Cache-Control`` chosen by path from :data:`CACHE_RULES`,
+* one access-log line per request with status, bytes, time to headers and
+  total time,
+* an optional :class:`Throttle` that models one student's share of a
+  classroom connection. Every connection shares the same bandwidth and
+  each response gets the profile's latency.
+
+Dotfiles such as ``.env`` are never served.
+
+    modelit-assets serve --dist --throttle classroom
+"""
+
+import argparse
+import asyncio
+import email.utils
+import hashlib
+import mimetypes
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from .paths import BASE_DIR
+
+DEFAULT_PORT = 8000
+CHUNK_SIZE = 64 * 1024
+KEEPALIVE_TIMEOUT = 15.0
+MAX_HEADERS = 100
+IMMUTABLE = "public, max-age=31536000, immutable"
+# First match wins; paths are URL paths such as "/audio/voice/ch0_scene0.mp3".
+CACHE_RULES = (
+    (re.compile(r"\.[0-9a-f]{10}\.\w+$"), IMMUTABLE),
+    (re.compile(r"(/|\.html?)$"), "no-cache"),
+    (re.compile(r"^/(images|audio)/"), "public, max-age=3600"),
+)
+DEFAULT_CACHE_CONTROL = "no-cache"
+# Preferred first. Each is served only if the sibling exists and is newer than the source.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+CONTENT_TYPES = {
+    ".js": "text/javascript; charset=utf-8",
+    ".json": "application/json; charset=utf-8",
+    ".mp3": "audio/mpeg",
+    ".webp": "image/webp",
+    ".svg": "image/svg+xml",
+}
+REASONS = {
+    200: "OK",
+    206: "Partial Content",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    416: "Range Not Satisfiable",
+    500: "Internal Server Error",
+}
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@dataclass(frozen=True)
+class ThrottleProfile:
+    bits_per_second: float
+    latency: float
+
+
+THROTTLE_PROFILES = {
+    # ~30 students sharing a 50 Mbit/s school uplink.
+    "classroom": ThrottleProfile(1.5e6, 0.08),
+    "3g": ThrottleProfile(750e3, 0.3),
+    "slow": ThrottleProfile(256e3, 0.5),
+}
+
+
+class Throttle:
+    """A single simulated link shared by every connection.
+
+    Bytes are queued on one virtual wire. A write waits until the link
+    would have finished transmitting it, so concurrent downloads split the
+    bandwidth the way they would on a real connection.
+    """
+
+    def __init__(self, profile: ThrottleProfile):
+        self.bytes_per_second = profile.bits_per_second / 8
+        self.latency = profile.latency
+        self._free_at = 0.0
+
+    async def transmit(self, size: int) -> None:
+        now = time.monotonic()
+        self._free_at = max(now, self._free_at) + size / self.bytes_per_second
+        await asyncio.sleep(self._free_at - now)
+
+
+def parse_throttle(value: str) -> ThrottleProfile:
+    """``classroom``/``3g``/``slow`` or ``KBITS[:LATENCY_MS]``, e.g. ``2000:50``."""
+    if value in THROTTLE_PROFILES:
+        return THROTTLE_PROFILES[value]
+    rate, _, latency = value.partition(":")
+    try:
+        profile = ThrottleProfile(float(rate) * 1000, float(latency or 0) / 1000)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected one of {', '.join(THROTTLE_PROFILES)} or KBITS[:LATENCY_MS], got {value!r}"
+        ) from None
+    if profile.bits_per_second <= 0:
+        raise argparse.ArgumentTypeError("throttle bandwidth must be positive")
+    return profile
+
+
+def cache_control(url_path: str) -> str:
+    for pattern, value in CACHE_RULES:
+        if pattern.search(url_path):
+            return value
+    return DEFAULT_CACHE_CONTROL
+
+
+def content_type(path: Path) -> str:
+    known = CONTENT_TYPES.get(path.suffix.lower())
+    if known:
+        return known
+    guessed = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    return f"{guessed}; charset=utf-8" if guessed.startswith("text/") else guessed
+
+
+def accepted_encodings(header: str | None) -> set[str]:
+    """Codings with a non-zero q-value in ``Accept-Encoding``."""
+    accepted = set()
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None | bool:
+    """Return ``(start, end)`` inclusive, ``None`` to ignore the header, or ``False`` if unsatisfiable."""
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0 or size == 0:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return False
+    return start, end
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison, as ``If-None-Match`` requires."""
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+class _ETags:
+    """Strong ETags from file content, cached by ``(mtime_ns, size)``."""
+
+    def __init__(self):
+        self._cache: dict[Path, tuple[int, int, str]] = {}
+
+    @staticmethod
+    def _hash(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return f'"{digest.hexdigest()[:32]}"'
+
+    async def get(self, path: Path, stat) -> str:
+        cached = self._cache.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        etag = await asyncio.to_thread(self._hash, path)
+        self._cache[path] = (stat.st_mtime_ns, stat.st_size, etag)
+        return etag
+
+
+@dataclass
+class _Request:
+    method: str
+    target: str
+    version: str
+    headers: dict[str, str]
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+class StaticServer:
+    def __init__(
+        self,
+        root: Path = BASE_DIR,
+        *,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        throttle: ThrottleProfile | None = None,
+        log=print,
+        telemetry=None,
+    ):
+        self.root = root.resolve()
+        self.host = host
+        self.port = port
+        self.throttle = Throttle(throttle) if throttle else None
+        self.log = log
+        self.telemetry = telemetry
+        self.etags = _ETags()
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> "StaticServer":
+        self._server = await asyncio.start_server(self._connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def resolve(self, url_path: str) -> Path | None:
+        """Map a URL path to a file under the root, or ``None``."""
+        parts = [part for part in url_path.split("/") if part]
+        if any(part.startswith(".") or "\\" in part for part in parts):
+            return None
+        path = self.root.joinpath(*parts).resolve()
+        if not path.is_relative_to(self.root):
+            return None
+        if path.is_dir():
+            path = path / "index.html"
+        return path if path.is_file() else None
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> _Request | None:
+        line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+            raise ValueError("malformed request line")
+        headers = {}
+        for _ in range(MAX_HEADERS + 1):
+            line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+            if line in (b"\r\n", b"\n", b""):
+                return _Request(parts[0], parts[1], parts[2], headers)
+            name, sep, value = line.decode("latin-1").partition(":")
+            if not sep:
+                raise ValueError("malformed header")
+            headers[name.strip().lower()] = value.strip()
+        raise ValueError("too many headers")
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = (writer.get_extra_info("peername") or ("?",))[0]
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self._simple(writer, 400, head=False, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                keep_alive = await self._respond(request, writer, peer)
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _simple(self, writer, status: int, *, head: bool, keep_alive: bool, headers: dict | None = None) -> int:
+        body = f"{status} {REASONS[status]}\n".encode("ascii")
+        headers = {"Content-Type": "text/plain; charset=utf-8", "Content-Length": str(len(body)), **(headers or {})}
+        await self._write_head(writer, status, headers, keep_alive)
+        if not head:
+            writer.write(body)
+            await writer.drain()
+        return 0 if head else len(body)
+
+    async def _write_head(self, writer, status: int, headers: dict, keep_alive: bool) -> None:
+        if self.throttle and self.throttle.latency:
+            await asyncio.sleep(self.throttle.latency)
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}"]
+        headers = {
+            "Date": email.utils.formatdate(usegmt=True),
+            "Server": "modelit-assets",
+            "Connection": "keep-alive" if keep_alive else "close",
+            **headers,
+        }
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+    async def _send_file(self, writer, path: Path, start: int, length: int) -> None:
+        with open(path, "rb") as f:
+            if self.throttle is None:
+                await asyncio.get_running_loop().sendfile(writer.transport, f, start, length)
+                return
+            f.seek(start)
+            remaining = length
+            while remaining:
+                chunk = f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                await self.throttle.transmit(len(chunk))
+                writer.write(chunk)
+                await writer.drain()
+                remaining -= len(chunk)
+
+    async def _respond(self, request: _Request, writer: asyncio.StreamWriter, peer: str) -> bool:
+        started = time.perf_counter()
+        url_path = unquote(urlsplit(request.target).path) or "/"
+        keep_alive = request.keep_alive
+        head = request.method == "HEAD"
+        status, sent, coding = 500, 0, None
+        ttfb = None
+        try:
+            if request.method not in ("GET", "HEAD"):
+                status = 405
+                sent = await self._simple(writer, 405, head=False, keep_alive=keep_alive, headers={"Allow": "GET, HEAD"})
+                return keep_alive
+            path = self.resolve(url_path)
+            if path is None:
+                status = 404
+                sent = await self._simple(writer, 404, head=head, keep_alive=keep_alive)
+                return keep_alive
+
+            source_stat = path.stat()
+            served, stat = path, source_stat
+            siblings = False
+            accepted = accepted_encodings(request.headers.get("accept-encoding"))
+            for name, suffix in ENCODINGS:
+                variant = path.with_name(path.name + suffix)
+                if not variant.is_file():
+                    continue
+                variant_stat = variant.stat()
+                if variant_stat.st_mtime_ns < source_stat.st_mtime_ns:
+                    continue
+                siblings = True
+                if coding is None and name in accepted:
+                    coding, served, stat = name, variant, variant_stat
+
+            etag = await self.etags.get(served, stat)
+            headers = {
+                "ETag": etag,
+                "Last-Modified": email.utils.formatdate(source_stat.st_mtime, usegmt=True),
+                "Cache-Control": cache_control(url_path),
+                "Accept-Ranges": "bytes",
+            }
+            if siblings:
+                headers["Vary"] = "Accept-Encoding"
+
+            if self._not_modified(request.headers, etag, source_stat.st_mtime):
+                status = 304
+                await self._write_head(writer, 304, headers, keep_alive)
+                return keep_alive
+
+            headers["Content-Type"] = content_type(path)
+            if coding:
+                headers["Content-Encoding"] = coding
+            size = stat.st_size
+            start, length = 0, size
+            status = 200
+            wanted = request.headers.get("range")
+            if wanted and self._if_range_ok(request.headers.get("if-range"), etag, source_stat.st_mtime):
+                span = parse_range(wanted, size)
+                if span is False:
+                    status = 416
+                    sent = await self._simple(
+                        writer, 416, head=head, keep_alive=keep_alive, headers={"Content-Range": f"bytes */{size}"}
+                    )
+                    return keep_alive
+                if span is not None:
+                    status = 206
+                    start, length = span[0], span[1] - span[0] + 1
+                    headers["Content-Range"] = f"bytes {span[0]}-{span[1]}/{size}"
+            headers["Content-Length"] = str(length)
+            await self._write_head(writer, status, headers, keep_alive)
+            ttfb = time.perf_counter() - started
+            if not head and length:
+                await self._send_file(writer, served, start, length)
+                sent = length
+            return keep_alive
+        except (FileNotFoundError, PermissionError):
+            # The file vanished or became unreadable between stat and open.
+            if ttfb is None:
+                status = 500
+                sent = await self._simple(writer, 500, head=head, keep_alive=False)
+            return False
+        finally:
+            self._log(request, peer, status, sent, coding, ttfb, time.perf_counter() - started)
+
+    @staticmethod
+    def _not_modified(headers: dict, etag: str, mtime: float) -> bool:
+        if "if-none-match" in headers:
+            return etag_matches(headers["if-none-match"], etag)
+        since = headers.get("if-modified-since")
+        if since:
+            try:
+                return int(mtime) <= email.utils.parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    @staticmethod
+    def _if_range_ok(value: str | None, etag: str, mtime: float) -> bool:
+        """``If-Range`` needs a strong match, so a changed file is sent whole."""
+        if not value:
+            return True
+        if value.startswith('"'):
+            return value == etag
+        try:
+            return int(mtime) == email.utils.parsedate_to_datetime(value).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    def _log(self, request: _Request, peer: str, status: int, sent: int, coding, ttfb, total: float) -> None:
+        ttfb_ms = f"{ttfb * 1000:.1f}" if ttfb is not None else "-"
+        self.log(
+            f'{peer} "{request.method} {request.target}" {status} {sent}B {coding or "identity"} '
+            f"ttfb={ttfb_ms}ms total={total * 1000:.1f}ms"
+        )
+        if self.telemetry is not None:
+            self.telemetry.record(
+                "serve",
+                request.target,
+                status=status,
+                ttfb=ttfb,
+                duration=total,
+                bytes_sent=sent,
+            )
@@ -0,0 +1,248 @@
+"""Read ``STORY_DATA`` from story-data.js without a JavaScript runtime.
+
+story-data.js is a plain object literal (unquoted keys, single/double
+quoted strings, comments, trailing commas), so a small recursive-descent
+parser is enough. The voice naming helpers mirror ``getVoiceFile()`` and
+``makeChoice()`` in index.html and ``buildTasks()`` in
+tools/generate_openai_tts.cjs.
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from .paths import BASE_DIR
+
+STORY_FILE = BASE_DIR / "story-data.js"
+MAPPING_FILE = BASE_DIR / "scene-image-mapping.json"
+VOICE_PREFIX = "audio/voice"
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+_IDENTIFIER = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*")
+_NUMBER = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_LITERALS = {"true": True, "false": False, "null": None, "undefined": None}
+
+
+class StoryParseError(ValueError):
+    pass
+
+
+class _Parser:
+    def __init__(self, text: str, pos: int = 0):
+        self.text = text
+        self.pos = pos
+
+    def error(self, message: str) -> StoryParseError:
+        line = self.text.count("\n", 0, self.pos) + 1
+        return StoryParseError(f"story-data.js line {line}: {message}")
+
+    def skip(self) -> None:
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char.isspace():
+                self.pos += 1
+            elif text.startswith("//", self.pos):
+                end = text.find("\n", self.pos)
+                self.pos = len(text) if end == -1 else end + 1
+            elif text.startswith("/*", self.pos):
+                end = text.find("*/", self.pos + 2)
+                if end == -1:
+                    raise self.error("unterminated comment")
+                self.pos = end + 2
+            else:
+                return
+
+    def expect(self, char: str) -> None:
+        self.skip()
+        if not self.text.startswith(char, self.pos):
+            raise self.error(f"expected {char!r}")
+        self.pos += 1
+
+    def value(self):
+        self.skip()
+        if self.pos >= len(self.text):
+            raise self.error("unexpected end of input")
+        char = self.text[self.pos]
+        if char == "{":
+            return self.object()
+        if char == "[":
+            return self.array()
+        if char in "\"'`":
+            return self.string()
+        match = _NUMBER.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            number = match.group()
+            return float(number) if any(c in number for c in ".eE") else int(number)
+        match = _IDENTIFIER.match(self.text, self.pos)
+        if match and match.group() in _LITERALS:
+            self.pos = match.end()
+            return _LITERALS[match.group()]
+        raise self.error(f"unexpected {char!r}")
+
+    def string(self) -> str:
+        quote = self.text[self.pos]
+        self.pos += 1
+        out = []
+        while True:
+            if self.pos >= len(self.text):
+                raise self.error("unterminated string")
+            char = self.text[self.pos]
+            if char == quote:
+                self.pos += 1
+                return "".join(out)
+            if quote == "`" and self.text.startswith("${", self.pos):
+                raise self.error("template substitutions are not supported")
+            if char == "\\":
+                escaped = self.text[self.pos + 1]
+                if escaped == "u":
+                    out.append(chr(int(self.text[self.pos + 2 : self.pos + 6], 16)))
+                    self.pos += 6
+                    continue
+                if escaped == "\n":
+                    self.pos += 2
+                    continue
+                out.append(_ESCAPES.get(escaped, escaped))
+                self.pos += 2
+                continue
+            out.append(char)
+            self.pos += 1
+
+    def key(self) -> str:
+        self.skip()
+        if self.text[self.pos] in "\"'":
+            return self.string()
+        match = _IDENTIFIER.match(self.text, self.pos)
+        if not match:
+            raise self.error("expected a property name")
+        self.pos = match.end()
+        return match.group()
+
+    def object(self) -> dict:
+        self.expect("{")
+        result = {}
+        while True:
+            self.skip()
+            if self.text.startswith("}", self.pos):
+                self.pos += 1
+                return result
+            name = self.key()
+            self.expect(":")
+            result[name] = self.value()
+            self.skip()
+            if self.text.startswith(",", self.pos):
+                self.pos += 1
+            elif not self.text.startswith("}", self.pos):
+                raise self.error("expected ',' or '}'")
+
+    def array(self) -> list:
+        self.expect("[")
+        result = []
+        while True:
+            self.skip()
+            if self.text.startswith("]", self.pos):
+                self.pos += 1
+                return result
+            result.append(self.value())
+            self.skip()
+            if self.text.startswith(",", self.pos):
+                self.pos += 1
+            elif not self.text.startswith("]", self.pos):
+                raise self.error("expected ',' or ']'")
+
+
+def parse_story(source: str) -> dict:
+    match = re.search(r"\bSTORY_DATA\s*=", source)
+    if not match:
+        raise StoryParseError("STORY_DATA assignment not found in story-data.js")
+    return _Parser(source, match.end()).value()
+
+
+def load_story(path: Path = STORY_FILE) -> dict:
+    return parse_story(path.read_text(encoding="utf-8"))
+
+
+def load_mapping(path: Path = MAPPING_FILE) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def is_boss(chapter: dict) -> bool:
+    return "BOSS" in (chapter.get("title") or "")
+
+
+def scene_image(chapter: dict, scene: dict) -> str | None:
+    return scene.get("image") or chapter.get("image")
+
+
+def scene_voice_id(chapter_id: int, scene_index: int) -> str:
+    return f"ch{chapter_id}_scene{scene_index}"
+
+
+def learning_voice_id(chapter_id: int, scene_index: int) -> str:
+    if chapter_id == 10 and scene_index == 3:
+        return f"ch{chapter_id}_learning_final"
+    return f"ch{chapter_id}_learning"
+
+
+def choice_voice_id(chapter_id: int) -> str:
+    return f"ch{chapter_id}_choice"
+
+
+def feedback_voice_id(chapter: dict, option_index: int) -> str:
+    option = chapter["choice"]["options"][option_index]
+    if option.get("voiceKey"):
+        key = option["voiceKey"]
+    elif option.get("gameOver"):
+        key = f"gameover{option_index + 1}"
+    elif is_boss(chapter):
+        key = "correct"
+    else:
+        key = f"feedback{option_index + 1}"
+    return f"ch{chapter['id']}_{key}"
+
+
+def voice_path(voice_id: str) -> str:
+    return f"{VOICE_PREFIX}/{voice_id}.mp3"
+
+
+def clean_text(text: str) -> str:
+    """Match ``cleanText()`` in the TTS tools: no HTML, emoji or runs of whitespace."""
+    text = re.sub(r"<[^>]*>", "", text)
+    text = re.sub("[\U0001F300-\U0001FAFF\U0001F1E6-\U0001F1FF\u2600-\u27BF\uFE0F\u200D]", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+@dataclass(frozen=True)
+class VoiceLine:
+    voice_id: str
+    chapter: int
+    kind: str
+    text: str
+
+    @property
+    def path(self) -> str:
+        return voice_path(self.voice_id)
+
+
+def voice_lines(story: dict) -> list[VoiceLine]:
+    """Every narrated line, in story order, keyed the way the game looks it up."""
+    lines = {}
+    for chapter in story["chapters"]:
+        chapter_id = chapter["id"]
+        for index, scene in enumerate(chapter["scenes"]):
+            voice_id = scene_voice_id(chapter_id, index)
+            lines[voice_id] = VoiceLine(voice_id, chapter_id, "scene", clean_text(scene["text"]))
+            if scene.get("learning"):
+                voice_id = learning_voice_id(chapter_id, index)
+                text = scene["learning"].get("content") or scene["text"]
+                lines[voice_id] = VoiceLine(voice_id, chapter_id, "learning", clean_text(text))
+        if chapter.get("choice"):
+            voice_id = choice_voice_id(chapter_id)
+            lines[voice_id] = VoiceLine(voice_id, chapter_id, "choice", clean_text(chapter["choice"]["question"]))
+            for index, option in enumerate(chapter["choice"]["options"]):
+                voice_id = feedback_voice_id(chapter, index)
+                kind = "gameover" if option.get("gameOver") else "feedback"
+                lines[voice_id] = VoiceLine(voice_id, chapter_id, kind, clean_text(option["feedback"]))
+    return list(lines.values())
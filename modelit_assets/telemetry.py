@@ -0,0 +1,200 @@
+"""Per-request run telemetry: a JSONL trace plus a Prometheus textfile.
+
+Each API call, download attempt and cache hit becomes one :class:`Span`
+appended to the trace as it finishes. A span records:
+
+* ``queue_wait`` - time spent queued for a worker and the rate limiter,
+* ``ttfb`` - time until the response headers arrived,
+* ``transfer`` - time spent reading the body,
+* bytes in each direction, HTTP status, attempt number, and billed cost or
+  token usage when the provider reports it.
+
+When the run finishes, :meth:`Recorder.finish` writes per-kind counters and
+p50/p95/p99 summaries in the node_exporter textfile-collector format and
+returns the lines for the console summary.
+"""
+
+import json
+import math
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .files import atomic_write_bytes
+from .paths import CACHE_DIR
+
+TELEMETRY_DIR = CACHE_DIR / "telemetry"
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+@dataclass
+class Span:
+    kind: str
+    name: str
+    attempt: int = 1
+    status: int | None = None
+    queue_wait: float = 0.0
+    ttfb: float | None = None
+    transfer: float | None = None
+    duration: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    cost: float | None = None
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+    error: str = ""
+    started: float = 0.0
+    run: str = ""
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Linear-interpolated percentile (numpy's default method)."""
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def _quantiles(values: list[float]) -> str:
+    if not values:
+        return "n/a"
+    return "/".join(f"{percentile(values, q):.2f}" for q in QUANTILES) + "s"
+
+
+def _labels(**labels) -> str:
+    inner = ",".join(f'{key}="{str(value).replace(chr(34), chr(39))}"' for key, value in labels.items())
+    return "{" + inner + "}"
+
+
+class Recorder:
+    """Thread-safe span sink for one command run."""
+
+    def __init__(self, command: str, *, trace_file: Path | None = None, metrics_file: Path | None = None):
+        self.command = command
+        self.run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.trace_file = trace_file or TELEMETRY_DIR / f"{command}-{self.run_id}.jsonl"
+        self.metrics_file = metrics_file or TELEMETRY_DIR / f"modelit_{command.replace('-', '_')}.prom"
+        self.spans: list[Span] = []
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.trace_file.parent.mkdir(parents=True, exist_ok=True)
+        self._trace = open(self.trace_file, "a", encoding="utf-8")
+
+    def record(self, kind: str, name: str, **fields) -> Span:
+        span = Span(kind, name, run=self.run_id, **fields)
+        if not span.started:
+            span.started = time.time() - span.duration
+        line = json.dumps(asdict(span)) + "\n"
+        with self._lock:
+            self.spans.append(span)
+            self._trace.write(line)
+            self._trace.flush()
+        return span
+
+    @property
+    def billed_cost(self) -> float | None:
+        costs = [span.cost for span in self.spans if span.cost is not None]
+        return sum(costs) if costs else None
+
+    def _by_kind(self) -> dict[str, list[Span]]:
+        groups: dict[str, list[Span]] = {}
+        for span in self.spans:
+            groups.setdefault(span.kind, []).append(span)
+        return groups
+
+    def metrics(self) -> str:
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list[tuple[dict, float]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(**labels)} {value:.6g}")
+
+        groups = self._by_kind()
+        command = {"command": self.command}
+        counts: dict[tuple[str, str], int] = {}
+        for span in self.spans:
+            status = "error" if span.error or span.status is None else str(span.status)
+            counts[span.kind, status] = counts.get((span.kind, status), 0) + 1
+        metric(
+            "modelit_requests_total",
+            "counter",
+            "Requests by kind and HTTP status.",
+            [({**command, "kind": kind, "status": status}, n) for (kind, status), n in sorted(counts.items())],
+        )
+        for field_name, help_text in (
+            ("duration", "Request duration."),
+            ("ttfb", "Time to first byte."),
+            ("queue_wait", "Time queued for a worker or the rate limiter."),
+        ):
+            name = f"modelit_request_{field_name}_seconds"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for kind, spans in sorted(groups.items()):
+                values = [getattr(span, field_name) for span in spans if getattr(span, field_name) is not None]
+                if not values:
+                    continue
+                labels = {**command, "kind": kind}
+                for q in QUANTILES:
+                    lines.append(f"{name}{_labels(**labels, quantile=q)} {percentile(values, q):.6g}")
+                lines.append(f"{name}_sum{_labels(**labels)} {sum(values):.6g}")
+                lines.append(f"{name}_count{_labels(**labels)} {len(values)}")
+        metric(
+            "modelit_transfer_bytes_total",
+            "counter",
+            "Payload bytes by kind and direction.",
+            [
+                ({**command, "kind": kind, "direction": direction}, sum(getattr(s, f"bytes_{direction}") for s in spans))
+                for kind, spans in sorted(groups.items())
+                for direction in ("sent", "received")
+            ],
+        )
+        metric(
+            "modelit_retries_total",
+            "counter",
+            "Attempts beyond the first.",
+            [({**command, "kind": kind}, sum(1 for s in spans if s.attempt > 1)) for kind, spans in sorted(groups.items())],
+        )
+        metric(
+            "modelit_billed_cost_usd_total",
+            "counter",
+            "Cost reported by the provider.",
+            [({**command}, self.billed_cost or 0.0)],
+        )
+        metric("modelit_run_duration_seconds", "gauge", "Wall time of the last run.", [(command, time.time() - self.started)])
+        metric("modelit_run_timestamp_seconds", "gauge", "When the last run finished.", [(command, time.time())])
+        return "\n".join(lines) + "\n"
+
+    def summary_lines(self) -> list[str]:
+        lines = []
+        for kind, spans in sorted(self._by_kind().items()):
+            durations = [s.duration for s in spans]
+            ttfbs = [s.ttfb for s in spans if s.ttfb is not None]
+            waits = [s.queue_wait for s in spans]
+            errors = sum(1 for s in spans if s.error or (s.status or 200) >= 400)
+            lines.append(
+                f"{kind}: {len(spans)} calls, {errors} errors; p50/p95/p99 duration {_quantiles(durations)}, "
+                f"ttfb {_quantiles(ttfbs)}, queue {_quantiles(waits)}; "
+                f"{sum(s.bytes_sent for s in spans) // 1024} KB sent, {sum(s.bytes_received for s in spans) // 1024} KB received"
+            )
+        tokens_in = sum(s.input_tokens or 0 for s in self.spans)
+        tokens_out = sum(s.output_tokens or 0 for s in self.spans)
+        if tokens_in or tokens_out:
+            lines.append(f"tokens: {tokens_in} in, {tokens_out} out")
+        if self.billed_cost is not None:
+            lines.append(f"billed: ${self.billed_cost:.4f} (provider-reported)")
+        return lines
+
+    def finish(self) -> list[str]:
+        """Close the trace, write the textfile and return the summary lines."""
+        with self._lock:
+            self._trace.close()
+        self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.metrics_file, self.metrics().encode("utf-8"))
+        return self.summary_lines()
@@ -0,0 +1,156 @@
+"""Reference-driven asset validation against a committed hash manifest.
+
+The reference index lists every asset the game can request: scene and
+choice images from story-data.js, every path in scene-image-mapping.json,
+every voice clip implied by ``getVoiceFile()``'s naming scheme and the
+background music. Each referenced file must exist and decode (PNG chunk CRCs,
+MP3 frame sync) and match its SHA-256/size in ``asset-manifest.json``.
+
+Hashes are cached locally by mtime and size, so a run only re-reads files
+that were touched since the last one.
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .files import AssetError, atomic_write_bytes, validate_mp3, validate_png
+from .hashing import sha256_file
+from .paths import BASE_DIR, CACHE_DIR
+from .story import load_mapping, load_story, scene_image, voice_lines
+
+MANIFEST_FILE = BASE_DIR / "asset-manifest.json"
+STAT_CACHE_FILE = CACHE_DIR / "asset-stat-cache.json"
+MUSIC_FILE = "audio/background_music.mp3"
+SCANNED_DIRS = (("images/scenes", "*.png"), ("audio/voice", "*.mp3"))
+
+
+def check_decodes(path: Path) -> str | None:
+    try:
+        if path.suffix.lower() == ".png":
+            validate_png(path)
+        elif path.suffix.lower() == ".mp3":
+            validate_mp3(path)
+    except (AssetError, OSError) as exc:
+        return str(exc)
+    return None
+
+
+def reference_index(story: dict, mapping: dict) -> dict[str, list[str]]:
+    """Return ``{relative path: [where it is referenced]}``."""
+    refs: dict[str, list[str]] = {}
+
+    def add(path: str | None, source: str) -> None:
+        if path:
+            refs.setdefault(path, []).append(source)
+
+    for chapter in story["chapters"]:
+        chapter_id = chapter["id"]
+        for index, scene in enumerate(chapter["scenes"]):
+            add(scene_image(chapter, scene), f"story-data.js ch{chapter_id} scene {index}")
+        if chapter.get("choice"):
+            add(chapter["choice"].get("image"), f"story-data.js ch{chapter_id} choice")
+    for key, path in mapping.items():
+        add(path, f"scene-image-mapping.json {key}")
+    for line in voice_lines(story):
+        add(line.path, f"getVoiceFile() {line.voice_id}")
+    add(MUSIC_FILE, "initBackgroundMusic()")
+    return refs
+
+
+class StatCache:
+    """Local ``{path: [mtime_ns, size, sha256, decode error]}`` cache."""
+
+    def __init__(self, path: Path = STAT_CACHE_FILE):
+        self.path = path
+        self.entries = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        self.hashed = 0
+        self.dirty = False
+
+    def lookup(self, relative: str, full: Path) -> tuple[str, int, str | None]:
+        stat = full.stat()
+        cached = self.entries.get(relative)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2], cached[1], cached[3]
+        digest = sha256_file(full)
+        error = check_decodes(full)
+        self.entries[relative] = [stat.st_mtime_ns, stat.st_size, digest, error]
+        self.hashed += 1
+        self.dirty = True
+        return digest, stat.st_size, error
+
+    def save(self) -> None:
+        if self.dirty:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(self.path, json.dumps(self.entries, sort_keys=True).encode("utf-8"))
+
+
+@dataclass
+class ValidationReport:
+    referenced: int = 0
+    hashed: int = 0
+    missing: dict[str, list[str]] = field(default_factory=dict)
+    broken: dict[str, str] = field(default_factory=dict)
+    changed: dict[str, tuple[str, str]] = field(default_factory=dict)
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unreferenced: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.broken or self.changed or self.added or self.removed)
+
+
+def load_manifest(path: Path = MANIFEST_FILE) -> dict:
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {}
+
+
+def write_manifest(current: dict, path: Path = MANIFEST_FILE) -> None:
+    ordered = {name: current[name] for name in sorted(current)}
+    atomic_write_bytes(path, (json.dumps(ordered, indent=2) + "\n").encode("utf-8"))
+
+
+def validate(
+    base_dir: Path = BASE_DIR,
+    *,
+    manifest_file: Path = MANIFEST_FILE,
+    stat_cache: StatCache | None = None,
+    story: dict | None = None,
+    mapping: dict | None = None,
+) -> tuple[ValidationReport, dict]:
+    """Check every referenced asset; return the report and the current manifest."""
+    refs = reference_index(
+        story if story is not None else load_story(base_dir / "story-data.js"),
+        mapping if mapping is not None else load_mapping(base_dir / "scene-image-mapping.json"),
+    )
+    stat_cache = stat_cache or StatCache()
+    expected = load_manifest(manifest_file)
+    report = ValidationReport(referenced=len(refs))
+    current = {}
+
+    for relative in sorted(refs):
+        full = base_dir / relative
+        if not full.is_file():
+            report.missing[relative] = refs[relative]
+            continue
+        digest, size, error = stat_cache.lookup(relative, full)
+        current[relative] = {"sha256": digest, "size": size}
+        if error:
+            report.broken[relative] = error
+        if relative not in expected:
+            report.added.append(relative)
+        elif expected[relative]["sha256"] != digest:
+            report.changed[relative] = (expected[relative]["sha256"], digest)
+
+    report.removed = sorted(set(expected) - set(refs))
+    for directory, pattern in SCANNED_DIRS:
+        for path in sorted((base_dir / directory).glob(pattern)):
+            relative = path.relative_to(base_dir).as_posix()
+            if relative not in refs:
+                report.unreferenced.append(relative)
+
+    report.hashed = stat_cache.hashed
+    stat_cache.save()
+    return report, current
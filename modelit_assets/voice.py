@@ -0,0 +1,227 @@
+"""Incremental TTS for the narrated lines in story-data.js.
+
+:func:`~modelit_assets.story.voice_lines` yields every line under the id
+that ``getVoiceFile()`` looks up. ``audio/voice/voice-manifest.json`` records
+the hash of the text each clip was synthesized from and the voice used. A
+line is synthesized again only when its text or voice changed or its clip
+is missing. Editing one sentence in the story therefore regenerates one
+clip, and a desynced clip is visible in ``plan()``.
+
+Backends are small classes with a ``voice`` identity string and a
+``synthesize(text) -> bytes`` method. :data:`BACKENDS` holds OpenAI and
+Google Cloud TTS, the two services the old ``tools/generate_*_tts.cjs``
+scripts used, plus :class:`StubTTS`. The stub writes silent MP3 frames
+sized to the text, for tests and benchmarks that must not touch the network.
+"""
+
+import base64
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from . import config
+from .files import AssetError, atomic_write_bytes
+from .hashing import sha256_file
+from .paths import BASE_DIR, VOICE_DIR
+from .story import VoiceLine
+
+MANIFEST_FILE = VOICE_DIR / "voice-manifest.json"
+# One MPEG-1 Layer III frame header (128 kbps, 44.1 kHz) plus silence, ~26 ms.
+MP3_FRAME = b"\xff\xfb\x90\x64" + bytes(413)
+GOOGLE_TTS_URL = "https://texttospeech.googleapis.com/v1/text:synthesize"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class TTSError(Exception):
+    pass
+
+
+class StubTTS:
+    """Deterministic, offline backend: about 2.5 words per second of silence."""
+
+    name = "stub"
+
+    def __init__(self, voice: str = "silence"):
+        self.voice = f"stub/{voice}"
+
+    def synthesize(self, text: str) -> bytes:
+        seconds = max(1.0, len(text.split()) / 2.5)
+        return MP3_FRAME * round(seconds / 0.026)
+
+
+class OpenAITTS:
+    name = "openai"
+
+    def __init__(self, voice: str | None = None, model: str | None = None):
+        self.model = model or config.get("OPENAI_TTS_MODEL", "gpt-4o-mini-tts")
+        self.voice = f"{self.model}/{voice or config.get('OPENAI_VOICE', 'nova')}"
+        self._voice_name = self.voice.split("/", 1)[1]
+
+    def synthesize(self, text: str) -> bytes:
+        from openai import OpenAIError
+
+        from .http import openai_client
+
+        try:
+            response = openai_client().audio.speech.create(
+                model=self.model, voice=self._voice_name, input=text, response_format="mp3"
+            )
+        except OpenAIError as exc:
+            raise TTSError(f"OpenAI TTS failed: {exc}") from exc
+        return response.content
+
+
+class GoogleTTS:
+    name = "google"
+
+    def __init__(self, voice: str | None = None, speaking_rate: float = 1.0):
+        self.voice_name = voice or "en-US-Neural2-F"
+        self.speaking_rate = speaking_rate
+        self.voice = f"google/{self.voice_name}@{speaking_rate:g}"
+
+    def synthesize(self, text: str) -> bytes:
+        import requests
+
+        from .http import get_session
+
+        payload = {
+            "input": {"text": text},
+            "voice": {"languageCode": self.voice_name[:5], "name": self.voice_name},
+            "audioConfig": {"audioEncoding": "MP3", "speakingRate": self.speaking_rate},
+        }
+        key = config.require("GOOGLE_TTS_API_KEY", "synthesize voice clips with Google TTS")
+        try:
+            response = get_session().post(GOOGLE_TTS_URL, params={"key": key}, json=payload, timeout=60)
+        except requests.RequestException as exc:
+            raise TTSError(f"Google TTS request failed: {exc}") from exc
+        if response.status_code != 200:
+            raise TTSError(f"Google TTS failed: HTTP {response.status_code} {response.text[:200]}")
+        try:
+            return base64.b64decode(response.json()["audioContent"])
+        except (ValueError, KeyError, TypeError) as exc:
+            raise TTSError(f"Google TTS returned no audio: {response.text[:200]}") from exc
+
+
+BACKENDS = {"openai": OpenAITTS, "google": GoogleTTS, "stub": StubTTS}
+
+
+def load_manifest(path: Path = MANIFEST_FILE) -> dict:
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {}
+
+
+def save_manifest(manifest: dict, path: Path = MANIFEST_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ordered = {voice_id: manifest[voice_id] for voice_id in sorted(manifest)}
+    atomic_write_bytes(path, (json.dumps(ordered, indent=2, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+def stale_reasons(line: VoiceLine, entry: dict | None, voice: str, out_dir: Path) -> list[str]:
+    """Why ``line`` needs synthesizing; empty when its clip is current."""
+    if not (out_dir / f"{line.voice_id}.mp3").exists():
+        return ["missing clip"]
+    if entry is None:
+        return ["no manifest entry"]
+    reasons = []
+    if entry.get("text_hash") != text_hash(line.text):
+        reasons.append("text changed")
+    if entry.get("voice") != voice:
+        reasons.append(f"voice {entry.get('voice')} -> {voice}")
+    return reasons
+
+
+@dataclass
+class VoicePlan:
+    build: list[tuple[VoiceLine, list[str]]]
+    current: list[VoiceLine]
+    orphans: list[str]
+
+
+def plan(
+    lines: list[VoiceLine],
+    manifest: dict,
+    *,
+    voice: str,
+    out_dir: Path = VOICE_DIR,
+    only: set[str] | None = None,
+    force: bool = False,
+) -> VoicePlan:
+    build, current = [], []
+    for line in lines:
+        if only and line.voice_id not in only:
+            continue
+        reasons = ["forced"] if force else stale_reasons(line, manifest.get(line.voice_id), voice, out_dir)
+        if reasons:
+            build.append((line, reasons))
+        else:
+            current.append(line)
+    known = {line.voice_id for line in lines}
+    orphans = sorted(path.stem for path in out_dir.glob("*.mp3") if path.stem not in known)
+    return VoicePlan(build, current, orphans)
+
+
+def record(manifest: dict, line: VoiceLine, voice: str, clip: Path) -> None:
+    manifest[line.voice_id] = {
+        "text_hash": text_hash(line.text),
+        "voice": voice,
+        "file": clip.relative_to(BASE_DIR).as_posix() if clip.is_relative_to(BASE_DIR) else str(clip),
+        "bytes": clip.stat().st_size,
+        "sha256": sha256_file(clip),
+        "text": line.text,
+    }
+
+
+@dataclass
+class SynthesisReport:
+    built: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def synthesize_lines(
+    backend,
+    lines: list[VoiceLine],
+    manifest: dict,
+    *,
+    out_dir: Path = VOICE_DIR,
+    manifest_file: Path = MANIFEST_FILE,
+    workers: int = 4,
+    on_built: Callable[[VoiceLine, int], None] | None = None,
+) -> SynthesisReport:
+    """Synthesize ``lines`` in parallel and record each clip in ``manifest``.
+
+    The manifest is saved even when some lines fail, so a rerun only retries those.
+    """
+    report = SynthesisReport()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    def synthesize(line: VoiceLine) -> Path:
+        clip = out_dir / f"{line.voice_id}.mp3"
+        data = backend.synthesize(line.text)
+        # Validated as MP3 before it replaces anything, so a bad response never clobbers a good clip.
+        atomic_write_bytes(clip, data)
+        return clip
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(synthesize, line): line for line in lines}
+            for future in as_completed(futures):
+                line = futures[future]
+                try:
+                    clip = future.result()
+                except (TTSError, AssetError, OSError) as exc:
+                    report.failed[line.voice_id] = str(exc)
+                    continue
+                record(manifest, line, backend.voice, clip)
+                report.built.append(line.voice_id)
+                if on_built:
+                    on_built(line, clip.stat().st_size)
+    finally:
+        save_manifest(manifest, manifest_file)
+    return report
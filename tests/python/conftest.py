@@ -0,0 +1,72 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+
+@pytest.fixture
+def scene_images(tmp_path):
+    """Three small, distinct scene PNGs."""
+    directory = tmp_path / "scenes"
+    directory.mkdir()
+    paths = []
+    for number in range(3):
+        path = directory / f"ch{number}_scene1.png"
+        Image.new("RGB", (32, 32), (40 * number, 120, 200)).save(path)
+        paths.append(path)
+    return paths
+
+
+class StubResponses:
+    """``client.responses`` as the code documents it: ``create(...)`` returning ``output_text`` and ``usage``."""
+
+    def __init__(self, fail_on: set[int] = frozenset()):
+        self.calls = 0
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def create(self, *, model: str, input: list) -> SimpleNamespace:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call in self.fail_on:
+            raise RuntimeError(f"stub failure on call {call}")
+        assert input[0]["content"][1]["image_url"].startswith("data:image/")
+        return SimpleNamespace(
+            output_text=f" analysis {call} from {model} ",
+            usage=SimpleNamespace(input_tokens=100, output_tokens=20),
+        )
+
+
+class RawStubResponses(StubResponses):
+    """Adds the OpenAI SDK's ``with_raw_response`` wrapper on top of :class:`StubResponses`."""
+
+    def __init__(self, fail_on: set[int] = frozenset(), retries_taken: int = 0):
+        super().__init__(fail_on)
+        outer = self
+
+        class WithRaw:
+            def create(self, **kwargs):
+                parsed = outer.create(**kwargs)
+                return SimpleNamespace(
+                    parse=lambda: parsed, retries_taken=retries_taken, status_code=200, content=b"x" * 64
+                )
+
+        self.with_raw_response = WithRaw()
+
+
+@pytest.fixture
+def stub_client():
+    return SimpleNamespace(responses=StubResponses())
+
+
+@pytest.fixture
+def raw_stub_client():
+    return SimpleNamespace(responses=RawStubResponses(retries_taken=2))
+
+
+@pytest.fixture
+def flaky_client():
+    """Fails its first request."""
+    return SimpleNamespace(responses=StubResponses(fail_on={1}))
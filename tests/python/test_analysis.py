@@ -0,0 +1,107 @@
+import json
+from PIL import Image
+
+from modelit_assets.analysis import analysis_entry, analyze_image, flag_terms, load_results, run_analysis
+from modelit_assets.hashing import sha256_file
+from modelit_assets.telemetry import Recorder
+
+
+def recorder(tmp_path) -> Recorder:
+    return Recorder("test", trace_file=tmp_path / "trace.jsonl", metrics_file=tmp_path / "metrics.prom")
+
+
+def test_plain_client_matching_the_documented_contract(stub_client, scene_images, tmp_path):
+    telemetry = recorder(tmp_path)
+    entry = analyze_image(stub_client, scene_images[0], telemetry=telemetry)
+    telemetry.finish()
+    assert entry["image"] == "ch0_scene1.png"
+    assert entry["analysis"] == "analysis 1 from gpt-4.1-mini"
+    assert len(entry["sha256"]) == 64
+    span = json.loads((tmp_path / "trace.jsonl").read_text().splitlines()[0])
+    assert span["status"] == 200 and span["attempt"] == 1 and span["input_tokens"] == 100
+
+
+def test_raw_response_client_reports_retries(raw_stub_client, scene_images, tmp_path):
+    telemetry = recorder(tmp_path)
+    entry = analyze_image(raw_stub_client, scene_images[0], telemetry=telemetry)
+    telemetry.finish()
+    assert entry["analysis"] == "analysis 1 from gpt-4.1-mini"
+    span = json.loads((tmp_path / "trace.jsonl").read_text().splitlines()[0])
+    assert span["attempt"] == 3 and span["bytes_received"] == 64
+
+
+def run(client, paths, tmp_path, **kwargs):
+    kwargs.setdefault("workers", 2)
+    return run_analysis(
+        client,
+        paths,
+        preprocess=None,
+        analysis_file=tmp_path / "analysis.json",
+        checkpoint_file=tmp_path / "analysis.checkpoint.jsonl",
+        **kwargs,
+    )
+
+
+def test_run_skips_images_whose_hash_is_unchanged(stub_client, scene_images, tmp_path):
+    first = run(stub_client, scene_images, tmp_path)
+    assert len(first.analyzed) == 3 and stub_client.responses.calls == 3
+    assert not (tmp_path / "analysis.checkpoint.jsonl").exists()
+
+    second = run(stub_client, scene_images, tmp_path)
+    assert second.analyzed == [] and sorted(second.skipped) == [p.name for p in scene_images]
+    assert stub_client.responses.calls == 3
+
+    Image.new("RGB", (32, 32), "red").save(scene_images[1])
+    third = run(stub_client, scene_images, tmp_path)
+    assert [e["image"] for e in third.analyzed] == [scene_images[1].name]
+    assert stub_client.responses.calls == 4
+    results = load_results(tmp_path / "analysis.json", tmp_path / "missing.jsonl")
+    assert results[scene_images[1].name]["sha256"] == sha256_file(scene_images[1])
+
+
+def test_run_resumes_from_checkpoint(stub_client, scene_images, tmp_path):
+    checkpoint = tmp_path / "analysis.checkpoint.jsonl"
+    done = analysis_entry(scene_images[0].name, sha256_file(scene_images[0]), "from an interrupted run")
+    # The interrupted run crashed halfway through appending its second line.
+    checkpoint.write_text(json.dumps(done) + "\n" + '{"image": "ch1_sc', encoding="utf-8")
+
+    result = run(stub_client, scene_images, tmp_path)
+    assert result.skipped == [scene_images[0].name]
+    assert stub_client.responses.calls == 2
+    assert not checkpoint.exists()
+    saved = {e["image"]: e for e in json.loads((tmp_path / "analysis.json").read_text(encoding="utf-8"))}
+    assert saved[scene_images[0].name]["analysis"] == "from an interrupted run"
+    assert set(saved) == {p.name for p in scene_images}
+
+
+def test_failed_images_are_retried_on_the_next_run(flaky_client, scene_images, tmp_path):
+    first = run(flaky_client, scene_images, tmp_path, workers=1)
+    assert len(first.failed) == 1 and len(first.analyzed) == 2
+
+    second = run(flaky_client, scene_images, tmp_path)
+    assert list(first.failed) == [e["image"] for e in second.analyzed]
+    assert len(second.skipped) == 2
+
+
+def test_flag_terms_ignore_quoted_and_capitalised_labels():
+    assert flag_terms('Clear visual cues like the glowing "ON" and "OFF" indicators.') == []
+    assert flag_terms("A switch marked OFF sits on the bench.") == []
+    assert flag_terms("The panel reads “off” in green.") == []
+    assert flag_terms("Her coat colour feels off compared with the reference.") == ["off"]
+    assert flag_terms("There are no inconsistencies or anything that feels off.") == []
+    assert flag_terms("The hairstyle is a slight inconsistency with the brief.") == ["inconsist"]
+
+
+def test_negation_only_hides_the_term_it_governs():
+    assert flag_terms("The hair is not in a bun, which feels off.") == ["off"]
+    assert flag_terms(
+        "The character appears consistent, without the badge, which is a deviation from the reference."
+    ) == ["deviation"]
+    assert flag_terms("There are no noticeable inconsistencies or elements that would seem off for this age group.") == []
+    assert flag_terms("Nothing in the scene feels inappropriate or off for a middle school audience.") == []
+
+
+def test_hyphenated_compounds():
+    assert flag_terms("She wears an off-white coat over a teal shirt.") == []
+    assert flag_terms("A hands-off demo with a cut-off timer.") == []
+    assert flag_terms("Her face looks off-model in this frame.") == ["off"]
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from openai import OpenAI
+
+from modelit_assets import analysis_batch
+from modelit_assets.analysis_batch import custom_id, run_batch
+from modelit_assets.fake_openrouter import FakeOpenRouter
+from modelit_assets.hashing import sha256_file
+
+
+@pytest.fixture
+def fake():
+    with FakeOpenRouter(batch_duration=0.3) as server:
+        yield server
+
+
+@pytest.fixture
+def batch_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis_batch, "BATCH_DIR", tmp_path / "batches")
+    return {
+        "state_file": tmp_path / "batches" / "current.json",
+        "analysis_file": tmp_path / "analysis.json",
+        "checkpoint_file": tmp_path / "analysis.checkpoint.jsonl",
+    }
+
+
+def client_for(fake) -> OpenAI:
+    return OpenAI(api_key="test", base_url=fake.openai_base_url, max_retries=0)
+
+
+class Killed(BaseException):
+    pass
+
+
+def test_killed_batch_resumes_from_saved_job_id(fake, batch_files, scene_images):
+    def kill(batch):
+        raise Killed
+
+    with pytest.raises(Killed):
+        run_batch(client_for(fake), scene_images, preprocess=None, interval=0.05, on_status=kill, **batch_files)
+    state = json.loads(batch_files["state_file"].read_text(encoding="utf-8"))
+    assert state["batch_id"] == "batch_1"
+    assert not batch_files["analysis_file"].exists()
+
+    # A fresh process: the image list is ignored in favour of the saved job.
+    resumed = run_batch(client_for(fake), [], preprocess=None, interval=0.05, **batch_files)
+    assert resumed.resumed and resumed.batch_id == "batch_1" and resumed.status == "completed"
+    assert fake.stats["batches"] == 1
+    assert not batch_files["state_file"].exists()
+    assert not list((batch_files["state_file"].parent).glob("*.jsonl"))
+
+    saved = {e["image"]: e for e in json.loads(batch_files["analysis_file"].read_text(encoding="utf-8"))}
+    assert set(saved) == {p.name for p in scene_images}
+    for path in scene_images:
+        assert saved[path.name]["sha256"] == sha256_file(path)
+        assert "Dr. Maya" in saved[path.name]["analysis"]
+
+
+def test_detached_submit_then_merge(fake, batch_files, scene_images):
+    detached = run_batch(client_for(fake), scene_images, preprocess=None, detach=True, **batch_files)
+    assert detached.detached and detached.batch_id == "batch_1"
+    state = json.loads(batch_files["state_file"].read_text(encoding="utf-8"))
+    assert set(state["requests"]) == {custom_id(p.name, sha256_file(p)) for p in scene_images}
+
+    merged = run_batch(client_for(fake), scene_images, preprocess=None, interval=0.05, **batch_files)
+    assert merged.resumed and len(merged.analyzed) == 3 and fake.stats["batches"] == 1
+
+    # Everything is current now, so nothing is submitted.
+    again = run_batch(client_for(fake), scene_images, preprocess=None, **batch_files)
+    assert again.batch_id is None and len(again.skipped) == 3 and fake.stats["batches"] == 1
+
+
+def test_failed_lines_are_reported_by_image(batch_files, scene_images):
+    with FakeOpenRouter(batch_duration=0.1, error_rate=1.0) as fake:
+        run = run_batch(client_for(fake), scene_images, preprocess=None, interval=0.05, **batch_files)
+    assert run.analyzed == []
+    assert set(run.failed) == {p.name for p in scene_images}
+    assert all(message.startswith("HTTP 500") for message in run.failed.values())
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+from PIL import Image
+
+from modelit_assets.analysis_store import AnalysisStore, StoreError
+from modelit_assets.hashing import sha256_file
+from modelit_assets.validation import StatCache
+
+
+@pytest.fixture
+def files(tmp_path):
+    return {"analysis_file": tmp_path / "analysis.json", "checkpoint_file": tmp_path / "analysis.checkpoint.jsonl"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with AnalysisStore(tmp_path / "store.sqlite3") as opened:
+        yield opened
+
+
+def write(path, entries) -> None:
+    path.write_text(json.dumps(entries), encoding="utf-8")
+
+
+def entries_for(scene_images) -> list[dict]:
+    first, second, third = scene_images
+    return [
+        {"image": first.name, "sha256": sha256_file(first), "analysis": "A tidy lab. The coat colour feels off."},
+        {"image": second.name, "sha256": "0" * 64, "analysis": "Her hairstyle is an inconsistency with the bun."},
+        {"image": third.name, "analysis": "A calm greenhouse with glowing plants and no inconsistencies."},
+        {"image": "ch4_scene1.png", "sha256": "1" * 64, "analysis": "A deleted scene; the badge is a deviation."},
+    ]
+
+
+def refresh(store, scene_images, tmp_path) -> None:
+    cache = StatCache(tmp_path / "stat-cache.json")
+    store.refresh_images(scene_images[0].parent, cache, base_dir=tmp_path)
+    assert cache.path.exists()
+
+
+def names(rows) -> list[str]:
+    return [row.image for row in rows]
+
+
+def test_sync_only_reloads_changed_files(store, files, scene_images):
+    write(files["analysis_file"], entries_for(scene_images))
+    assert store.sync(**files) == 4
+    assert store.sync(**files) == 0
+
+    # A later review round: one analysis changes, arriving through the checkpoint.
+    updated = dict(entries_for(scene_images)[1], analysis="Her hair is now in the specified bun.")
+    files["checkpoint_file"].write_text(json.dumps(updated) + "\n", encoding="utf-8")
+    assert store.sync(**files) == 1
+
+    latest = list(store.query())
+    assert len(latest) == 4 and all(row.latest for row in latest)
+    history = [row for row in store.query(history=True) if row.image == scene_images[1].name]
+    assert [row.latest for row in history] == [True, False]
+    assert history[1].flags[0][0] == "inconsist"
+
+
+def test_flag_and_chapter_filters(store, files, scene_images):
+    write(files["analysis_file"], entries_for(scene_images))
+    store.sync(**files)
+    assert names(store.query(flagged=True)) == ["ch0_scene1.png", "ch1_scene1.png", "ch4_scene1.png"]
+    assert names(store.query(terms=["off"])) == ["ch0_scene1.png"]
+    assert names(store.query(terms=["inconsist", "deviation"])) == ["ch1_scene1.png", "ch4_scene1.png"]
+    assert names(store.query(chapter=2)) == ["ch2_scene1.png"]
+    assert names(store.query(limit=2)) == ["ch0_scene1.png", "ch1_scene1.png"]
+    (row,) = store.query(terms=["off"])
+    assert row.flags == [("off", "The coat colour feels off")]
+    with pytest.raises(StoreError):
+        list(store.query(terms=["offish"]))
+
+
+def test_states_follow_the_images_on_disk(store, files, scene_images, tmp_path):
+    write(files["analysis_file"], entries_for(scene_images))
+    store.sync(**files)
+    refresh(store, scene_images, tmp_path)
+    assert names(store.query(state="current")) == ["ch0_scene1.png"]
+    assert names(store.query(state="stale")) == ["ch1_scene1.png"]
+    assert names(store.query(state="unhashed")) == ["ch2_scene1.png"]
+    assert names(store.query(state="missing")) == ["ch4_scene1.png"]
+
+    Image.new("RGB", (32, 32), "red").save(scene_images[0])
+    refresh(store, scene_images, tmp_path)
+    assert names(store.query(state="stale")) == ["ch0_scene1.png", "ch1_scene1.png"]
+    with pytest.raises(StoreError):
+        list(store.query(state="old"))
+
+
+def test_full_text_match(store, files, scene_images):
+    if not store.fts:
+        pytest.skip("SQLite built without FTS5")
+    write(files["analysis_file"], entries_for(scene_images))
+    store.sync(**files)
+    assert names(store.query(match="NEAR(hairstyle bun)")) == ["ch1_scene1.png"]
+    assert names(store.query(match="glow*")) == ["ch2_scene1.png"]
+    with pytest.raises(StoreError):
+        list(store.query(match='"unbalanced'))
@@ -0,0 +1,123 @@
+import json
+import os
+import shutil
+import subprocess
+import wave
+
+import pytest
+
+from modelit_assets import audio
+from modelit_assets.audio import MUSIC, SPEECH, AudioToolError, optimize_audio, size_report
+
+
+@pytest.fixture
+def fake_ffmpeg(monkeypatch):
+    """Replace the ffmpeg calls with a transcode that records its inputs."""
+    calls = []
+
+    def transcode(source, target, profile):
+        calls.append(source.name)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(b"OggS" + source.read_bytes()[:10])
+        return {"output": target.name, "output_bytes": target.stat().st_size, "duration_in": 2.0, "duration_out": 1.5}
+
+    monkeypatch.setattr(audio, "require_tools", lambda: None)
+    monkeypatch.setattr(audio, "transcode", transcode)
+    return calls
+
+
+@pytest.fixture
+def clips(tmp_path):
+    paths = []
+    for name in ("ch1_line0.mp3", "ch1_line1.mp3"):
+        path = tmp_path / "voice" / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(name.encode() * 20)
+        paths.append(path)
+    return paths
+
+
+def jobs(tmp_path, clips, profile=SPEECH):
+    return [(clip, tmp_path / "opus" / f"{clip.stem}.opus", profile) for clip in clips]
+
+
+def test_speech_profile_trims_both_ends_before_normalizing():
+    filters = SPEECH.filters().split(",")
+    assert filters[0].startswith("silenceremove")
+    assert filters[1:4] == ["areverse", filters[0], "areverse"]
+    assert filters[-1] == "loudnorm=I=-16:TP=-1.5:LRA=11"
+    assert MUSIC.filters() == "loudnorm=I=-20:TP=-1.5:LRA=11"
+
+
+def test_missing_ffmpeg_is_reported(monkeypatch):
+    monkeypatch.setattr(audio.shutil, "which", lambda tool: None)
+    with pytest.raises(AudioToolError, match="ffmpeg and ffprobe not found"):
+        audio.require_tools()
+
+
+def test_unchanged_sources_are_skipped(tmp_path, clips, fake_ffmpeg):
+    manifest_file = tmp_path / "opus" / "manifest.json"
+
+    report = optimize_audio(jobs(tmp_path, clips), manifest_file=manifest_file, workers=2)
+    assert sorted(entry["source"] for entry in report.built) == sorted(str(clip) for clip in clips)
+
+    report = optimize_audio(jobs(tmp_path, clips), manifest_file=manifest_file, workers=2)
+    assert report.built == [] and len(report.unchanged) == 2
+
+    # Touched but identical content is still current.
+    os.utime(clips[0], ns=(0, 0))
+    clips[1].write_bytes(b"new take" * 20)
+    report = optimize_audio(jobs(tmp_path, clips), manifest_file=manifest_file, workers=2)
+    assert [entry["source"] for entry in report.built] == [str(clips[1])]
+    assert fake_ffmpeg.count("ch1_line1.mp3") == 2 and fake_ffmpeg.count("ch1_line0.mp3") == 1
+
+    # A different profile, or a deleted output, transcodes again.
+    report = optimize_audio(jobs(tmp_path, clips, MUSIC), manifest_file=manifest_file, workers=2)
+    assert len(report.built) == 2
+    (tmp_path / "opus" / "ch1_line0.opus").unlink()
+    report = optimize_audio(jobs(tmp_path, clips, MUSIC), manifest_file=manifest_file, workers=2)
+    assert [entry["source"] for entry in report.built] == [str(clips[0])]
+
+    manifest = json.loads(manifest_file.read_text())
+    assert size_report(manifest) == {
+        "files": 2,
+        "bytes_in": sum(clip.stat().st_size for clip in clips),
+        "bytes_out": sum(entry["output_bytes"] for entry in manifest.values()),
+        "duration_in": 4.0,
+        "duration_out": 3.0,
+    }
+
+
+def test_failures_are_reported_per_file(tmp_path, clips, fake_ffmpeg, monkeypatch):
+    def transcode(source, target, profile):
+        raise AudioToolError(f"{source.name}: Invalid data found when processing input")
+
+    monkeypatch.setattr(audio, "transcode", transcode)
+    report = optimize_audio(jobs(tmp_path, clips[:1]), manifest_file=tmp_path / "manifest.json")
+
+    assert report.failed == {str(clips[0]): "ch1_line0.mp3: Invalid data found when processing input"}
+    assert json.loads((tmp_path / "manifest.json").read_text()) == {}
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None, reason="needs ffmpeg")
+def test_transcode_trims_leading_and_trailing_silence(tmp_path):
+    source = tmp_path / "line.wav"
+    rate = 48000
+    high, low = (8000).to_bytes(2, "little", signed=True), (-8000).to_bytes(2, "little", signed=True)
+    tone = (high * 40 + low * 40) * (rate // 80)  # one second of a 600 Hz square wave
+    with wave.open(str(source), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\0\0" * rate + tone + b"\0\0" * rate)
+
+    described = audio.transcode(source, tmp_path / "line.opus", SPEECH)
+
+    assert described["duration_in"] == pytest.approx(3.0, abs=0.05)
+    assert described["duration_out"] < 2.0
+    codec = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "stream=codec_name", "-of", "csv=p=0", str(tmp_path / "line.opus")],
+        capture_output=True,
+        text=True,
+    )
+    assert codec.stdout.strip() == "opus"
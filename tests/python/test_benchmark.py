@@ -0,0 +1,28 @@
+from dataclasses import asdict
+
+from modelit_assets.benchmark import BenchSettings, append_history, load_baseline, load_record
+
+
+def record(settings: BenchSettings, seconds: float) -> dict:
+    return {
+        "timestamp": f"run-{seconds}",
+        "settings": asdict(settings),
+        "results": [{"phase": "download", "scenes": 49, "seconds": seconds}],
+    }
+
+
+def test_history_lookups(tmp_path):
+    history = tmp_path / "history.jsonl"
+    slow = BenchSettings(latency=0.5)
+    append_history(record(BenchSettings(), 1.0), history)
+    append_history(record(slow, 2.0), history)
+    append_history(record(BenchSettings(), 3.0), history)
+    append_history(record(slow, 4.0), history)
+    history.write_text(history.read_text() + "\n\n")
+
+    assert load_baseline(BenchSettings(), history)["timestamp"] == "run-3.0"
+    assert load_baseline(BenchSettings(workers=2), history) is None
+    # --baseline takes a whole history file and compares with its last run.
+    assert load_record(history)["timestamp"] == "run-4.0"
+    (tmp_path / "empty.jsonl").write_text("\n")
+    assert load_record(tmp_path / "empty.jsonl") is None
@@ -0,0 +1,72 @@
+import os
+
+from modelit_assets.cache import GenerationCache, cache_key, payload_key
+from modelit_assets.engine import GenerationEngine, ImageJob
+from modelit_assets.fake_openrouter import FakeOpenRouter, make_png
+
+PAYLOAD = {"model": "test/fake", "prompt": "a lighthouse at dusk", "size": "1024x1024", "n": 1}
+
+
+def stored(tmp_path, cache: GenerationCache, data: bytes) -> str:
+    source = tmp_path / "source.png"
+    source.write_bytes(data)
+    key = payload_key(PAYLOAD)
+    cache.put(key, source, {"filename": "scene.png"})
+    return key
+
+
+def test_key_covers_every_field_that_changes_the_image():
+    base = cache_key("m", "prompt", "1024x1024", "high")
+    assert cache_key("m", "prompt", "1024x1024", "high") == base
+    assert cache_key("m2", "prompt", "1024x1024", "high") != base
+    assert cache_key("m", "prompt!", "1024x1024", "high") != base
+    assert cache_key("m", "prompt", "512x512", "high") != base
+    assert cache_key("m", "prompt", "1024x1024", "low") != base
+    assert payload_key({**PAYLOAD, "n": 4}) == payload_key(PAYLOAD)
+
+
+def test_hit_returns_entry_and_refreshes_mtime(tmp_path):
+    cache = GenerationCache(tmp_path / "cache")
+    key = stored(tmp_path, cache, make_png(seed=1))
+    path = cache.path_for(key)
+    os.utime(path, (1_000_000, 1_000_000))
+
+    assert cache.get(key) == path
+    assert path.read_bytes() == make_png(seed=1)
+    assert path.stat().st_mtime > 1_000_000
+
+
+def test_miss_returns_none(tmp_path):
+    cache = GenerationCache(tmp_path / "cache")
+    stored(tmp_path, cache, make_png(seed=1))
+
+    assert cache.get(cache_key("test/fake", "another prompt")) is None
+
+
+def test_corrupt_entry_is_dropped(tmp_path):
+    cache = GenerationCache(tmp_path / "cache")
+    key = stored(tmp_path, cache, make_png(seed=1)[:-20])
+
+    assert cache.get(key) is None
+    assert not cache.path_for(key).exists()
+    assert not cache.path_for(key).with_suffix(".json").exists()
+
+
+def test_engine_serves_hits_and_regenerates_corrupt_entries(tmp_path):
+    cache = GenerationCache(tmp_path / "cache")
+    (tmp_path / "out").mkdir()
+    job = ImageJob("scene.png", PAYLOAD)
+    with FakeOpenRouter() as fake:
+        def run():
+            engine = GenerationEngine("test", tmp_path / "out", base_url=fake.base_url, timeout=10, cache=cache)
+            return engine.run([job])
+
+        first = run()
+        second = run()
+        cache.path_for(payload_key(PAYLOAD)).write_bytes(b"\x89PNG\r\n\x1a\n")
+        third = run()
+        generations = fake.stats["generations"]
+
+    assert (first.cache_hits, second.cache_hits, third.cache_hits) == (0, 1, 0)
+    assert generations == 2
+    assert cache.get(payload_key(PAYLOAD)) is not None
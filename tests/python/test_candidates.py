@@ -0,0 +1,150 @@
+import base64
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from modelit_assets.candidates import SELECTION_FILE, BestOfN, Candidate, ambiguity, escalate, keep_winner
+from modelit_assets.engine import JobResult
+from modelit_assets.prompts import Profile, ScenePrompt
+
+PROFILE = Profile("test", "Test", "Test", "{scene}", {"model": "test/fake"})
+
+
+def scene(key: str) -> ScenePrompt:
+    return ScenePrompt(key, PROFILE, f"images/scenes/{key}.png", {"model": "test/fake", "prompt": key}, {})
+
+
+def candidate(name: str, score: float, present: bool = True) -> Candidate:
+    return Candidate(Path(name), score, score, present)
+
+
+class StubScorer:
+    """Scores candidate N as the N-th entry of ``scores``."""
+
+    def __init__(self, scores: list[float]):
+        self.scores = scores
+
+    def score(self, paths: list[Path]) -> list[Candidate]:
+        scored = [candidate(str(path), self.scores[int(path.stem) - 1]) for path in paths]
+        return sorted(scored, key=lambda c: c.score)
+
+
+def test_ambiguity():
+    assert ambiguity([]) == (None, [])
+    clear = [candidate("1", 0.1), candidate("2", 0.3)]
+    assert ambiguity(clear) == (None, [])
+
+    close = [candidate("1", 0.1), candidate("2", 0.12), candidate("3", 0.4)]
+    reason, contenders = ambiguity(close, margin=0.05)
+    assert reason == "1 candidate(s) within 0.05 of the best score"
+    assert contenders == close[:2]
+
+    poor = [candidate("1", 0.6), candidate("2", 0.9)]
+    assert ambiguity(poor, threshold=0.5) == ("best score 0.60 >= 0.50", poor)
+
+    split = [candidate("1", 0.1), candidate("2", 0.4, present=False)]
+    assert ambiguity(split)[0] == "candidates disagree on whether the character is shown"
+
+
+def test_best_of_n_selects_once_every_candidate_is_in(tmp_path):
+    best_of = BestOfN(
+        [scene("ch1_scene1"), scene("ch2_scene1")],
+        3,
+        scorer=StubScorer([0.3, 0.1, 0.2]),
+        run="run1",
+        root=tmp_path / "candidates",
+        base_dir=tmp_path,
+    )
+    assert len(best_of.jobs) == 6
+    assert best_of.jobs[0].filename == "candidates/ch1_scene1/run1/1.png"
+
+    first = [job for job in best_of.jobs if "ch1_scene1" in job.filename]
+    assert best_of.add(JobResult(first[0], True)) is None
+    assert best_of.add(JobResult(first[1], False, error="HTTP 500")) is None
+    selection = best_of.add(JobResult(first[2], True))
+    assert selection.failed == [first[1].filename]
+    assert [c.path.name for c in selection.candidates] == ["3.png", "1.png"]
+    assert selection.ambiguous is None
+
+    # A second run keeps the first run's candidates.
+    again = BestOfN(
+        [scene("ch1_scene1")], 3, scorer=StubScorer([0.1, 0.2, 0.3]), run="run2", root=tmp_path / "candidates", base_dir=tmp_path
+    )
+    assert again.jobs[0].filename == "candidates/ch1_scene1/run2/1.png"
+    assert (tmp_path / "candidates" / "ch1_scene1" / "run1").is_dir()
+
+
+class FlagClient:
+    """Vision stub: flags the images in ``flagged`` and fails for images it does not know."""
+
+    def __init__(self, flagged: set[str], encoded: dict[str, str]):
+        self.responses = self
+        self.flagged = flagged
+        self.encoded = encoded
+
+    def create(self, *, model: str, input: list) -> SimpleNamespace:
+        image_url = input[0]["content"][1]["image_url"]
+        name = next((name for name, data in self.encoded.items() if data in image_url), None)
+        if name is None:
+            raise RuntimeError("vision request failed")
+        text = "The hairstyle is an inconsistency." if name in self.flagged else "On-model and friendly."
+        return SimpleNamespace(output_text=text, usage=None)
+
+
+@pytest.fixture
+def candidate_images(tmp_path):
+    directory = tmp_path / "candidates" / "ch1_scene1" / "run1"
+    directory.mkdir(parents=True)
+    encoded = {}
+    for number, colour in enumerate(("red", "green", "blue"), start=1):
+        path = directory / f"{number}.png"
+        Image.new("RGB", (16, 16), colour).save(path)
+        encoded[path.name] = base64.b64encode(path.read_bytes()).decode("ascii")
+    return directory, encoded
+
+
+def test_escalate_prefers_the_contender_without_flags(candidate_images):
+    directory, encoded = candidate_images
+    contenders = [Candidate(directory / "1.png", 0.10, 0.1, True), Candidate(directory / "2.png", 0.12, 0.1, True)]
+    selection = SimpleNamespace(candidates=list(contenders), contenders=contenders, escalated=False)
+
+    errors = escalate(FlagClient({"1.png"}, encoded), [selection], workers=1)
+    assert errors == {}
+    assert selection.escalated
+    assert selection.candidates[0].path.name == "2.png"
+    assert selection.candidates[1].flags == ["inconsist"]
+
+
+def test_escalate_keeps_the_local_winner_when_an_analysis_fails(candidate_images):
+    directory, encoded = candidate_images
+    contenders = [Candidate(directory / "1.png", 0.10, 0.1, True), Candidate(directory / "3.png", 0.11, 0.1, True)]
+    selection = SimpleNamespace(candidates=list(contenders), contenders=contenders, escalated=False)
+    client = FlagClient(set(), {"1.png": encoded["1.png"]})
+    errors = escalate(client, [selection], workers=1)
+    assert list(errors) == [str(directory / "3.png")]
+    assert not selection.escalated and selection.candidates[0].path.name == "1.png"
+
+
+def test_keep_winner_writes_the_scene_and_selection(candidate_images, tmp_path):
+    directory, _ = candidate_images
+    (tmp_path / "images" / "scenes").mkdir(parents=True)
+    selection = SimpleNamespace(
+        scene=scene("ch1_scene1"),
+        candidates=[
+            Candidate(directory / "2.png", 0.1, 0.1, True, "On-model.", []),
+            Candidate(directory / "1.png", 0.2, 0.1, True),
+        ],
+        ambiguous="1 candidate(s) within 0.05 of the best score",
+        escalated=True,
+        failed=[],
+    )
+    selection.winner = selection.candidates[0]
+    output = keep_winner(selection, base_dir=tmp_path, analysis_file=tmp_path / "analysis.json")
+    assert output.read_bytes() == (directory / "2.png").read_bytes()
+    record = json.loads((directory / SELECTION_FILE).read_text(encoding="utf-8"))
+    assert record["winner"] == "2.png" and record["escalated"]
+    saved = json.loads((tmp_path / "analysis.json").read_text(encoding="utf-8"))
+    assert saved[0]["image"] == "ch1_scene1.png" and saved[0]["analysis"] == "On-model."
@@ -0,0 +1,98 @@
+import json
+import time
+
+import pytest
+import requests
+
+from modelit_assets.catalog import CatalogError, ModelCatalog, check_model, load_catalog
+from modelit_assets.fake_openrouter import FakeOpenRouter
+
+
+def model(model_id, *, output=("image", "text"), prompt=0.0, completion=0.0, image=0.0):
+    return {
+        "id": model_id,
+        "architecture": {"input_modalities": ["text"], "output_modalities": list(output)},
+        "pricing": {"prompt": str(prompt), "completion": str(completion), "image": str(image)},
+    }
+
+
+@pytest.fixture
+def session():
+    session = requests.Session()
+    session.statuses = []
+    session.hooks["response"].append(lambda response, *args, **kwargs: session.statuses.append(response.status_code))
+    return session
+
+
+def test_cheapest_image_model_is_ranked_by_image_price():
+    catalog = ModelCatalog.from_payload(
+        {
+            "models": [
+                model("cheap-tokens/expensive-images", prompt=1e-7, completion=1e-7, image=0.04),
+                model("pricey-tokens/cheap-images", prompt=3e-6, completion=1e-5, image=0.002),
+                model("text/only", output=("text",), prompt=1e-8),
+            ]
+        }
+    )
+
+    assert catalog.cheapest("image").id == "pricey-tokens/cheap-images"
+    assert [m.id for m in catalog.query(output="image")] == [
+        "pricey-tokens/cheap-images",
+        "cheap-tokens/expensive-images",
+    ]
+    # Text output is still ranked per token.
+    assert [m.id for m in catalog.query(output="text")] == [
+        "text/only",
+        "cheap-tokens/expensive-images",
+        "pricey-tokens/cheap-images",
+    ]
+
+
+def test_expired_cache_is_revalidated_with_a_304(tmp_path, session):
+    path = tmp_path / "models.json"
+    with FakeOpenRouter() as fake:
+        first = load_catalog(session, base_url=fake.base_url, path=path)
+        etag = json.loads(path.read_text())["etag"]
+
+        # Within the TTL the network is not touched at all.
+        load_catalog(session, base_url=fake.base_url, path=path)
+        assert session.statuses == [200]
+
+        cached = json.loads(path.read_text())
+        cached["fetched_at"] = time.time() - 7 * 24 * 3600
+        path.write_text(json.dumps(cached))
+        second = load_catalog(session, base_url=fake.base_url, path=path, ttl=60)
+
+        load_catalog(session, base_url=fake.base_url, path=path, force=True)
+
+    assert session.statuses == [200, 304, 200]
+    assert etag and json.loads(path.read_text())["etag"] == etag
+    assert sorted(second.models) == sorted(first.models)
+    assert time.time() - second.fetched_at < 60
+
+
+def test_stale_copy_is_used_when_the_network_is_down(tmp_path, session):
+    path = tmp_path / "models.json"
+    with FakeOpenRouter() as fake:
+        load_catalog(session, base_url=fake.base_url, path=path)
+        url = fake.base_url
+
+    catalog = load_catalog(session, base_url=url, path=path, ttl=0, timeout=2)
+    assert "openai/gpt-4.1-mini" in catalog.models
+
+    with pytest.raises(CatalogError, match="Could not fetch"):
+        load_catalog(session, base_url=url, path=tmp_path / "none.json", timeout=2)
+    with pytest.raises(CatalogError, match="No cached model catalog"):
+        load_catalog(offline=True, path=tmp_path / "none.json")
+
+
+def test_check_model_suggests_alternatives():
+    catalog = ModelCatalog.from_payload(
+        {"models": [model("google/gemini-2.5-flash-image", image=0.001), model("openai/gpt-4.1-mini", output=("text",))]}
+    )
+
+    assert check_model(catalog, "google/gemini-2.5-flash-image", "image").id == "google/gemini-2.5-flash-image"
+    with pytest.raises(CatalogError, match="Did you mean: google/gemini-2.5-flash-image"):
+        check_model(catalog, "google/gemini-2.5-flash-imag", "image")
+    with pytest.raises(CatalogError, match="Cheapest image-output model: google/gemini-2.5-flash-image"):
+        check_model(catalog, "openai/gpt-4.1-mini", "image")
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from modelit_assets.chunks import INDEX_FILE, join_story, rewrite_paths, split_story, verify, write_chunks
+from modelit_assets.story import STORY_FILE, load_story
+
+STORY = {
+    "title": "Test",
+    "chapters": [
+        {
+            "id": 0,
+            "title": "Start",
+            "concept": "Intro",
+            "image": "images/scenes/ch0.png",
+            "scenes": [
+                {"text": "Hello"},
+                {"text": "Again", "image": "images/scenes/ch0_b.png", "learning": {"content": "Models simplify."}},
+                {"text": "Back"},
+            ],
+            "choice": {
+                "question": "Pick?",
+                "image": "images/scenes/ch0_choice.png",
+                "options": [{"text": "A", "feedback": "Wrong", "gameOver": True}, {"text": "B", "feedback": "Right", "next": 1}],
+            },
+        },
+        {"id": 1, "title": "BOSS: End", "concept": "Outro", "scenes": [{"text": "Bye", "image": "images/scenes/ch1.png"}]},
+    ],
+}
+
+
+def test_one_chunk_per_chapter_with_its_own_assets():
+    chunks = split_story(STORY)
+
+    assert list(chunks.files) == ["story/ch0.json", "story/ch1.json"]
+    for chapter, entry in zip(STORY["chapters"], chunks.index["chapters"]):
+        assert json.loads(chunks.files[entry["file"]]) == chapter
+        assert entry["bytes"] == len(chunks.files[entry["file"]])
+    first, last = chunks.index["chapters"]
+    # Chapter images appear once each, in order, ending with the choice image.
+    assert first["images"] == ["images/scenes/ch0.png", "images/scenes/ch0_b.png", "images/scenes/ch0_choice.png"]
+    assert first["voices"] == [
+        "audio/voice/ch0_scene0.mp3",
+        "audio/voice/ch0_scene1.mp3",
+        "audio/voice/ch0_learning.mp3",
+        "audio/voice/ch0_scene2.mp3",
+        "audio/voice/ch0_choice.mp3",
+        "audio/voice/ch0_gameover1.mp3",
+        "audio/voice/ch0_feedback2.mp3",
+    ]
+    assert (first["boss"], last["boss"]) == (False, True)
+    assert last["images"] == ["images/scenes/ch1.png"]
+    assert last["voices"] == ["audio/voice/ch1_scene0.mp3"]
+    assert chunks.index["story"] == {"title": "Test"}
+    assert b" " not in chunks.index_bytes.replace(b"BOSS: End", b"")
+
+
+def test_renames_and_names_apply_to_chunks_and_index():
+    renames = {"images/scenes/ch1.png": "images/scenes/ch1.abc.png"}
+    chunks = split_story(STORY, renames=renames, name=lambda logical, data: logical.replace(".json", f".{len(data)}.json"))
+
+    entry = chunks.index["chapters"][1]
+    assert chunks.names["story/ch1.json"] == entry["file"] == f"story/ch1.{entry['bytes']}.json"
+    assert entry["images"] == ["images/scenes/ch1.abc.png"]
+    assert b"images/scenes/ch1.abc.png" in chunks.files[entry["file"]]
+    assert verify(rewrite_paths(STORY, renames), chunks) == []
+    assert verify(STORY, chunks) == ["chapter 1 does not round-trip"]
+
+
+def test_tampered_or_missing_chunks_are_reported():
+    chunks = split_story(STORY)
+    index = json.loads(chunks.index_bytes)
+
+    tampered = {**chunks.files, "story/ch1.json": chunks.files["story/ch1.json"].replace(b"Bye", b"Hi!")}
+    with pytest.raises(ValueError, match="story/ch1.json: content does not match"):
+        join_story(index, tampered.__getitem__)
+
+    del chunks.files["story/ch0.json"]
+    assert verify(STORY, chunks) == ["'story/ch0.json'"]
+
+
+def test_write_chunks_only_touches_changed_files(tmp_path):
+    changed = write_chunks(split_story(STORY), tmp_path)
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in changed) == ["story/ch0.json", "story/ch1.json", INDEX_FILE]
+
+    assert write_chunks(split_story(STORY), tmp_path) == []
+
+    edited = {**STORY, "chapters": [STORY["chapters"][0], {**STORY["chapters"][1], "title": "BOSS: Finale"}]}
+    changed = write_chunks(split_story(edited), tmp_path)
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in changed) == ["story/ch1.json", INDEX_FILE]
+
+
+@pytest.mark.skipif(not STORY_FILE.exists(), reason="needs story-data.js")
+def test_real_story_round_trips():
+    story = load_story()
+    chunks = split_story(story)
+
+    assert verify(story, chunks) == []
+    assert [entry["id"] for entry in chunks.index["chapters"]] == [chapter["id"] for chapter in story["chapters"]]
@@ -0,0 +1,21 @@
+import subprocess
+import sys
+
+from modelit_assets.commands.voice import BACKEND_NAMES
+from modelit_assets.voice import BACKENDS
+
+
+def test_building_the_parser_skips_command_dependencies():
+    script = (
+        "import sys\n"
+        "from modelit_assets.cli import build_parser\n"
+        "build_parser()\n"
+        "print(' '.join(sorted(m for m in sys.modules if m.startswith('modelit_assets.'))))\n"
+    )
+    loaded = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout.split()
+    for module in ("voice", "analysis", "derivatives", "audio", "preload", "consistency"):
+        assert f"modelit_assets.{module}" not in loaded
+
+
+def test_voice_backend_choices_match_the_backends():
+    assert sorted(BACKEND_NAMES) == sorted(BACKENDS)
@@ -0,0 +1,62 @@
+import numpy as np
+from PIL import Image
+
+from modelit_assets.consistency import PALETTE_KEYS, TOLERANCE, ConsistencyIndex, build_index, character_palette
+
+SKIN = {"skin": np.array([[120, 70, 40], [160, 110, 80]])}
+OTHER_SKIN = {"skin": np.array([[10, 10, 10], [20, 20, 20]])}
+
+
+def scenes(tmp_path, count=3):
+    paths = []
+    for number in range(count):
+        path = tmp_path / f"ch{number}_scene1.png"
+        Image.new("RGB", (64, 64), (140, 90, 60 + number * 40)).save(path)
+        paths.append(path)
+    return paths
+
+
+def test_unchanged_images_are_not_decoded_again(tmp_path):
+    paths, index_file = scenes(tmp_path), tmp_path / "index.npz"
+    _, decoded = build_index(paths, index_file=index_file, palette=SKIN)
+    assert decoded == 3
+    index, decoded = build_index(paths, index_file=index_file, palette=SKIN)
+    assert decoded == 0
+    assert index.coverage[0, 0] == 1.0
+
+
+def test_palette_change_discards_the_index(tmp_path):
+    paths, index_file = scenes(tmp_path), tmp_path / "index.npz"
+    build_index(paths, index_file=index_file, palette=SKIN)
+    index, decoded = build_index(paths, index_file=index_file, palette=OTHER_SKIN)
+    assert decoded == 3
+    assert index.coverage[0, 0] == 0.0
+
+
+def test_tolerance_change_discards_the_index(tmp_path, monkeypatch):
+    paths, index_file = scenes(tmp_path), tmp_path / "index.npz"
+    build_index(paths, index_file=index_file, palette=SKIN)
+    monkeypatch.setattr("modelit_assets.consistency.TOLERANCE", TOLERANCE + 8)
+    _, decoded = build_index(paths, index_file=index_file, palette=SKIN)
+    assert decoded == 3
+
+
+def test_index_written_without_a_fingerprint_is_rebuilt(tmp_path):
+    paths, index_file = scenes(tmp_path), tmp_path / "index.npz"
+    build_index(paths, index_file=index_file, palette=SKIN)
+    legacy = ConsistencyIndex.load(index_file)
+    legacy.settings = ""
+    legacy.save(index_file)
+    _, decoded = build_index(paths, index_file=index_file, palette=SKIN)
+    assert decoded == 3
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_character_ref_ranges_are_named_after_their_colour():
+    palette = character_palette()
+
+    # Only the colours with a hex range in character_ref; the white coat has none.
+    assert sorted(palette) == sorted(PALETTE_KEYS) == ["hair", "shirt", "skin"]
+    assert palette["skin"].tolist() == [[0x8B, 0x5A, 0x3C], [0xA6, 0x7C, 0x52]]
+    assert palette["hair"].tolist() == [[0x1A, 0x1A, 0x17], [0x3D, 0x28, 0x1A]]
+    assert palette["shirt"].tolist() == [[0x00, 0xC4, 0xB4], [0x20, 0xD4, 0xE4]]
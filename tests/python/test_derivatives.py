@@ -0,0 +1,127 @@
+import json
+import os
+
+import pytest
+from PIL import Image
+
+from modelit_assets.derivatives import (
+    DerivativeSettings,
+    avif_supported,
+    build_derivatives,
+    srcset_mapping,
+)
+
+SETTINGS = DerivativeSettings(widths=(160, 320, 960), formats=("webp",), quality=60)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    scenes = tmp_path / "scenes"
+    scenes.mkdir()
+    paths = []
+    for n, colour in enumerate(("teal", "orange")):
+        path = scenes / f"ch{n}_scene1.png"
+        Image.new("RGB", (640, 400), colour).save(path)
+        paths.append(path)
+    return paths
+
+
+def build(tmp_path, sources, settings=SETTINGS, **kwargs):
+    kwargs.setdefault("workers", 2)
+    return build_derivatives(
+        sources,
+        settings,
+        output_dir=tmp_path / "responsive",
+        manifest_file=tmp_path / "responsive" / "manifest.json",
+        **kwargs,
+    )
+
+
+def test_every_width_and_format_is_rendered(tmp_path, sources):
+    formats = ("webp", "avif") if avif_supported() else ("webp",)
+    settings = DerivativeSettings(widths=(160, 320, 960), formats=formats, quality=60)
+
+    manifest, report = build(tmp_path, sources, settings)
+
+    assert sorted(report.built) == ["ch0_scene1.png", "ch1_scene1.png"]
+    entry = manifest["sources"]["ch0_scene1.png"]
+    assert (entry["width"], entry["height"]) == (640, 400)
+    # Widths above the source are clamped to it rather than upscaled.
+    expected = [(width, fmt) for width in (160, 320, 640) for fmt in formats]
+    assert [(o["width"], o["format"]) for o in entry["outputs"]] == expected
+    for output in entry["outputs"]:
+        path = tmp_path / "responsive" / output["path"]
+        assert path.name == f"ch0_scene1-{output['width']}.{output['format']}"
+        assert output["bytes"] == path.stat().st_size
+        with Image.open(path) as image:
+            assert image.format == output["format"].upper()
+            assert image.size == (output["width"], output["height"])
+    assert not list((tmp_path / "responsive").glob(".*.tmp"))
+
+
+def test_rebuild_only_touches_changed_sources(tmp_path, sources):
+    build(tmp_path, sources)
+
+    _, report = build(tmp_path, sources)
+    assert report.built == []
+    assert sorted(report.unchanged) == ["ch0_scene1.png", "ch1_scene1.png"]
+
+    # Touched but identical: not re-rendered.
+    os.utime(sources[0], ns=(0, 0))
+    _, report = build(tmp_path, sources)
+    assert report.built == []
+    manifest = json.loads((tmp_path / "responsive" / "manifest.json").read_text())
+    assert manifest["sources"]["ch0_scene1.png"]["mtime_ns"] == 0
+
+    Image.new("RGB", (640, 400), "navy").save(sources[1])
+    _, report = build(tmp_path, sources)
+    assert report.built == ["ch1_scene1.png"]
+
+
+def test_new_settings_rebuild_everything(tmp_path, sources):
+    build(tmp_path, sources)
+
+    _, report = build(tmp_path, sources, DerivativeSettings(widths=(160,), formats=("webp",), quality=60))
+
+    assert sorted(report.built) == ["ch0_scene1.png", "ch1_scene1.png"]
+
+
+def test_removed_sources_lose_their_outputs(tmp_path, sources):
+    build(tmp_path, sources)
+
+    manifest, report = build(tmp_path, sources[:1])
+
+    assert report.removed == ["ch1_scene1.png"]
+    assert list(manifest["sources"]) == ["ch0_scene1.png"]
+    assert not list((tmp_path / "responsive").glob("ch1_scene1-*"))
+
+
+def test_srcset_mapping_orders_sources_by_format_and_width():
+    outputs = [
+        {"path": f"ch1_scene1-{width}.{fmt}", "width": width, "height": width // 2, "format": fmt, "bytes": 1}
+        for fmt in ("webp", "avif")
+        for width in (768, 480)
+    ]
+    manifest = {"sources": {"ch1_scene1.png": {"width": 1024, "height": 512, "outputs": outputs}}}
+
+    mapping = srcset_mapping(manifest, {"chapter1_scene1": "images/scenes/ch1_scene1.png"})
+
+    assert mapping == {
+        "chapter1_scene1": {
+            "src": "images/scenes/ch1_scene1.png",
+            "width": 1024,
+            "height": 512,
+            "sources": [
+                {
+                    "type": "image/avif",
+                    "srcset": "images/scenes/responsive/ch1_scene1-480.avif 480w, "
+                    "images/scenes/responsive/ch1_scene1-768.avif 768w",
+                },
+                {
+                    "type": "image/webp",
+                    "srcset": "images/scenes/responsive/ch1_scene1-480.webp 480w, "
+                    "images/scenes/responsive/ch1_scene1-768.webp 768w",
+                },
+            ],
+        }
+    }
@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+import json
+import re
+
+import pytest
+
+from modelit_assets.dist import build_dist, hashed_name, inject_runtime, rewrite_dynamic, rewrite_quoted
+from modelit_assets.fake_openrouter import make_png
+from modelit_assets.validation import StatCache
+
+STORY_SOURCE = """// test story
+const STORY_DATA = {
+    title: "Test",
+    chapters: [
+        {
+            id: 0, title: "Start", concept: "Intro", image: "images/scenes/ch0.png",
+            scenes: [{ text: "Hello <b>there</b>" }, { text: "Learn", learning: { content: "Models simplify." } }],
+            choice: {
+                question: "Pick one?",
+                options: [
+                    { text: "A", feedback: "Wrong", gameOver: true },
+                    { text: "B", feedback: "Right", next: 1 },
+                ],
+            },
+        },
+        { id: 1, title: "BOSS: End", concept: "Outro", scenes: [{ text: "Bye", image: "images/scenes/ch1.png" }] },
+    ],
+};
+"""
+
+PAGE = """<html>
+<head>
+    <link rel="icon" href="images/icon.png">
+    <script src="story-data.js"></script>
+</head>
+<body>
+    <img src="images/scenes/ch0.png" alt="">
+    <a href="https://example.com/images/scenes/ch0.png">source</a>
+    <script>
+        function getVoiceFile(ch) { return `audio/voice/ch${ch}_choice.mp3`; }
+    </script>
+</body>
+</html>
+"""
+
+
+@pytest.fixture
+def site(tmp_path):
+    base = tmp_path / "site"
+    files = {
+        "story-data.js": STORY_SOURCE.encode(),
+        "index.html": PAGE.encode(),
+        "scene-image-mapping.json": json.dumps(
+            {"chapter0": "images/scenes/ch0.png", "chapter1": "images/scenes/ch1.png"}
+        ).encode(),
+        "images/scenes/ch0.png": make_png(seed=0),
+        "images/scenes/ch1.png": make_png(seed=1),
+        "images/icon.png": make_png(16, 16, seed=2),
+        "audio/voice/ch0_choice.mp3": b"\xff\xfb" + bytes(200),
+    }
+    for relative, data in files.items():
+        (base / relative).parent.mkdir(parents=True, exist_ok=True)
+        (base / relative).write_bytes(data)
+    return base
+
+
+def build(tmp_path, site):
+    return build_dist(site, tmp_path / "dist", stat_cache=StatCache(tmp_path / "stat-cache.json"))
+
+
+def digest(path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def test_hashed_name_keeps_directory_and_suffix():
+    assert hashed_name("images/a.b.png", "0123456789abcdef") == "images/a.b.0123456789.png"
+
+
+def test_rewrites_only_known_quoted_paths():
+    renames = {"images/a.png": "images/a.1.png"}
+    text = """x = "images/a.png"; y = 'images/a.png'; z = "images/b.png"; w = "images/a.png?v=2";"""
+
+    assert rewrite_quoted(text, renames) == (
+        """x = "images/a.1.png"; y = 'images/a.1.png'; z = "images/b.png"; w = "images/a.png?v=2";"""
+    )
+
+
+def test_runtime_paths_go_through_asset_url():
+    text, prefixes = rewrite_dynamic("new Audio(`audio/voice/ch${ch}_${key}.mp3`); const s = `${a}b`;")
+
+    assert text == "new Audio(assetUrl(`audio/voice/ch${ch}_${key}.mp3`)); const s = `${a}b`;"
+    assert prefixes == {"audio/voice/"}
+    html = inject_runtime("<head>\n    <script src=a.js></script>", {"audio/voice/x.mp3": "audio/voice/x.1.mp3"})
+    assert html.index("window.ASSET_MANIFEST") < html.index("<script src=a.js>")
+
+
+def test_build_hashes_assets_and_rewrites_references(tmp_path, site):
+    manifest, report = build(tmp_path, site)
+    dist = tmp_path / "dist"
+
+    for relative in ("images/scenes/ch0.png", "images/icon.png", "audio/voice/ch0_choice.mp3"):
+        expected = hashed_name(relative, digest(site / relative))
+        assert manifest[relative]["file"] == expected
+        assert (dist / expected).read_bytes() == (site / relative).read_bytes()
+    assert "audio/background_music.mp3" in report.missing
+    assert report.chunk_problems == []
+
+    html = (dist / "index.html").read_text()
+    story_file = manifest["story-data.js"]["file"]
+    assert re.fullmatch(r"story-data\.[0-9a-f]{10}\.js", story_file)
+    assert f'<script src="{story_file}">' in html
+    assert f'href="{manifest["images/icon.png"]["file"]}"' in html
+    assert f'<img src="{manifest["images/scenes/ch0.png"]["file"]}"' in html
+    assert 'href="https://example.com/images/scenes/ch0.png"' in html
+    assert "return assetUrl(`audio/voice/ch${ch}_choice.mp3`)" in html
+    runtime = json.loads(re.search(r"window\.ASSET_MANIFEST = (\{.*\});", html).group(1))
+    assert runtime == {"audio/voice/ch0_choice.mp3": manifest["audio/voice/ch0_choice.mp3"]["file"]}
+
+    story = (dist / story_file).read_text()
+    assert manifest["images/scenes/ch1.png"]["file"] in story and '"images/scenes/ch1.png"' not in story
+    mapping = json.loads((dist / manifest["scene-image-mapping.json"]["file"]).read_text())
+    assert mapping == {"chapter0": manifest["images/scenes/ch0.png"]["file"], "chapter1": manifest["images/scenes/ch1.png"]["file"]}
+
+    assert gzip.decompress((dist / "index.html.gz").read_bytes()) == (dist / "index.html").read_bytes()
+    assert "gzip" in manifest["index.html"]["encodings"]
+    assert "encodings" not in manifest["images/icon.png"]
+    assert json.loads((dist / "asset-manifest.json").read_text()) == manifest
+
+
+def test_rebuild_is_incremental_and_prunes_old_names(tmp_path, site):
+    first, _ = build(tmp_path, site)
+
+    _, report = build(tmp_path, site)
+    assert report.written == [] and report.pruned == []
+
+    (site / "images/scenes/ch1.png").write_bytes(make_png(seed=9))
+    second, report = build(tmp_path, site)
+
+    old, new = first["images/scenes/ch1.png"]["file"], second["images/scenes/ch1.png"]["file"]
+    assert old != new
+    assert new in report.written and old in report.pruned
+    assert not (tmp_path / "dist" / old).exists()
+    # Files that reference the image get new names too; untouched assets keep theirs.
+    assert second["story-data.js"]["file"] != first["story-data.js"]["file"]
+    assert second["images/scenes/ch0.png"] == first["images/scenes/ch0.png"]
+    assert "index.html" in report.written
@@ -0,0 +1,98 @@
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from modelit_assets import download as download_module
+from modelit_assets.download import DownloadError, download, partial_path
+from modelit_assets.fake_openrouter import FakeOpenRouter, make_png
+from modelit_assets.files import AssetError
+
+IMAGE = make_png(256, 256, seed=7)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(download_module, "time", SimpleNamespace(sleep=lambda s: None, perf_counter=time.perf_counter))
+
+
+@pytest.fixture
+def session():
+    with requests.Session() as opened:
+        yield opened
+
+
+def test_dropped_connections_resume_with_range(session, tmp_path):
+    random.seed(3)
+    with FakeOpenRouter(drop_rate=0.6) as fake:
+        url = fake.add_image("scene", IMAGE)
+        destination = tmp_path / "scene.png"
+        assert download(session, url, destination, max_attempts=20) == len(IMAGE)
+    assert destination.read_bytes() == IMAGE
+    assert fake.stats["dropped"] > 0
+    assert not partial_path(url, destination).exists()
+
+
+def test_partial_from_a_killed_run_is_resumed(session, tmp_path):
+    with FakeOpenRouter() as fake:
+        url = fake.add_image("scene", IMAGE)
+        destination = tmp_path / "scene.png"
+        half = len(IMAGE) // 2
+        partial_path(url, destination).write_bytes(IMAGE[:half])
+        seen = []
+        original = session.get
+
+        def get(url, headers=None, **kwargs):
+            seen.append(headers)
+            return original(url, headers=headers, **kwargs)
+
+        session.get = get
+        assert download(session, url, destination) == len(IMAGE)
+    assert seen == [{"Range": f"bytes={half}-"}]
+    assert destination.read_bytes() == IMAGE
+
+
+def test_complete_partial_answered_with_416_is_committed(session, tmp_path):
+    with FakeOpenRouter() as fake:
+        url = fake.add_image("scene", IMAGE)
+        destination = tmp_path / "scene.png"
+        partial_path(url, destination).write_bytes(IMAGE)
+        assert download(session, url, destination) == len(IMAGE)
+        assert destination.read_bytes() == IMAGE
+
+        # A partial longer than the image is not this file: dropped and fetched again.
+        partial_path(url, destination).write_bytes(IMAGE + b"junk")
+        assert download(session, url, destination) == len(IMAGE)
+        assert destination.read_bytes() == IMAGE
+
+
+def test_resumed_bytes_that_fail_the_crc_check_are_refetched(session, tmp_path):
+    other = make_png(256, 256, seed=8)
+    with FakeOpenRouter() as fake:
+        url = fake.add_image("scene", IMAGE)
+        destination = tmp_path / "scene.png"
+        partial_path(url, destination).write_bytes(other[: len(other) // 2])
+        assert download(session, url, destination) == len(IMAGE)
+        assert fake.stats["downloads"] == 2
+    assert destination.read_bytes() == IMAGE
+
+
+def test_corrupt_download_leaves_the_existing_asset(session, tmp_path):
+    corrupt = bytearray(IMAGE)
+    corrupt[100] ^= 0xFF
+    with FakeOpenRouter() as fake:
+        url = fake.add_image("scene", bytes(corrupt))
+        destination = tmp_path / "scene.png"
+        destination.write_bytes(IMAGE)
+        with pytest.raises(AssetError):
+            download(session, url, destination)
+    assert destination.read_bytes() == IMAGE
+    assert not partial_path(url, destination).exists()
+
+
+def test_missing_image_is_a_download_error(session, tmp_path):
+    with FakeOpenRouter() as fake:
+        with pytest.raises(DownloadError, match="404"):
+            download(session, f"{fake.url}/files/nothing.png", tmp_path / "scene.png")
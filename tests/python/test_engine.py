@@ -0,0 +1,88 @@
+import json
+import random
+import time
+from email.utils import formatdate
+
+import pytest
+
+from modelit_assets import engine
+from modelit_assets.engine import GenerationEngine, ImageJob, retry_after_seconds
+from modelit_assets.fake_openrouter import FakeOpenRouter
+from modelit_assets.ratelimit import TokenBucket
+from modelit_assets.telemetry import Recorder
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    # Retry-After and the rate-limit headers still apply; only the jitter is skipped.
+    monkeypatch.setattr(engine, "backoff_delay", lambda attempt: 0.01)
+
+
+def jobs(count: int) -> list[ImageJob]:
+    return [ImageJob(f"scene{n}.png", {"model": "test/fake", "prompt": f"scene {n}", "n": 1}) for n in range(count)]
+
+
+def make_engine(fake, tmp_path, **kwargs) -> GenerationEngine:
+    settings = {"max_workers": 4, "requests_per_second": 100, "burst": 8, **kwargs}
+    (tmp_path / "out").mkdir(exist_ok=True)
+    return GenerationEngine("test", tmp_path / "out", base_url=fake.base_url, timeout=10, **settings)
+
+
+def spans(tmp_path) -> list[dict]:
+    return [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+
+
+def test_rate_limited_requests_are_retried_after_the_window(tmp_path):
+    recorder = Recorder("test", trace_file=tmp_path / "trace.jsonl", metrics_file=tmp_path / "metrics.prom")
+    with FakeOpenRouter(rate_limit=2, window=0.5) as fake:
+        summary = make_engine(fake, tmp_path, telemetry=recorder).run(jobs(6))
+    recorder.finish()
+
+    assert summary.succeeded == 6 and fake.stats["generations"] == 6
+    assert fake.stats["rate_limited"] > 0
+    # Six requests at two per half-second window cannot finish inside the second window.
+    assert summary.elapsed >= 1.0
+    generations = [s for s in spans(tmp_path) if s["kind"] == "generation"]
+    assert sum(s["status"] == 429 for s in generations) == fake.stats["rate_limited"]
+    retried = {s["name"] for s in generations if s["status"] == 429}
+    assert all(r.attempts > 1 for r in summary.results if r.job.filename in retried)
+
+
+def test_server_errors_are_retried_until_they_succeed(tmp_path):
+    random.seed(1)
+    with FakeOpenRouter(error_rate=0.5) as fake:
+        summary = make_engine(fake, tmp_path, max_retries=30).run(jobs(8))
+    assert summary.succeeded == 8
+    assert sum(r.attempts - 1 for r in summary.results) == fake.stats["errors"]
+
+
+def test_retries_give_up_after_max_retries(tmp_path):
+    with FakeOpenRouter(error_rate=1.0) as fake:
+        summary = make_engine(fake, tmp_path, max_retries=2).run(jobs(1))
+    (result,) = summary.results
+    assert not result.ok and result.attempts == 3 and "503" in result.error
+    assert fake.stats["errors"] == 3
+    assert not (tmp_path / "out" / "scene0.png").exists()
+
+
+def test_retry_after_seconds():
+    assert retry_after_seconds({"Retry-After": "1.5"}) == 1.5
+    assert retry_after_seconds({"Retry-After": "-3"}) == 0.0
+    assert 8 <= retry_after_seconds({"Retry-After": formatdate(time.time() + 10, usegmt=True)}) <= 10
+    assert retry_after_seconds({"Retry-After": "soon"}) is None
+    assert retry_after_seconds({}) is None
+
+
+def test_exhausted_budget_pauses_the_bucket_until_reset():
+    bucket = TokenBucket(100, 8)
+    reset_ms = int((time.time() + 0.3) * 1000)
+    bucket.update_from_headers({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset_ms)})
+    assert bucket.acquire() >= 0.2
+
+
+def test_remaining_budget_is_spread_over_the_window():
+    bucket = TokenBucket(100, 8)
+    # Two requests left in a 0.2 s window: ten per second until it resets.
+    bucket.update_from_headers({"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": "0.2"})
+    assert bucket.acquire() == 0.0 and bucket.acquire() == 0.0
+    assert bucket.acquire() >= 0.05
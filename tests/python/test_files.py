@@ -0,0 +1,31 @@
+import os
+import stat
+
+from modelit_assets.files import atomic_copy, atomic_write_bytes
+
+
+def mode(path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def test_new_files_get_the_umask_mode_not_mkstemp_0600(tmp_path):
+    umask = os.umask(0)
+    os.umask(umask)
+    target = tmp_path / "manifest.json"
+    atomic_write_bytes(target, b"{}")
+    assert mode(target) == 0o666 & ~umask
+
+
+def test_rewrites_keep_the_existing_mode(tmp_path):
+    target = tmp_path / "page.html"
+    target.write_bytes(b"old")
+    target.chmod(0o640)
+    atomic_write_bytes(target, b"new")
+    assert mode(target) == 0o640
+    assert target.read_bytes() == b"new"
+
+    source = tmp_path / "source.txt"
+    source.write_bytes(b"copied")
+    atomic_copy(source, target)
+    assert mode(target) == 0o640
+    assert target.read_bytes() == b"copied"
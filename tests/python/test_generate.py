@@ -0,0 +1,31 @@
+import pytest
+
+from modelit_assets import prompts
+from modelit_assets.cli import main
+
+
+@pytest.fixture
+def lock_file(tmp_path, monkeypatch):
+    path = tmp_path / "scene-prompts.lock.json"
+    monkeypatch.setattr(prompts, "LOCK_FILE", path)
+    return path
+
+
+def test_generate_refuses_to_run_without_a_lock(lock_file, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(["generate", "characters", "--skip-model-check"])
+    assert "modelit-assets generate characters --adopt" in str(exc.value)
+    assert not lock_file.exists()
+
+
+def test_dry_run_warns_about_a_missing_lock(lock_file, capsys):
+    assert main(["generate", "characters", "--dry-run", "--skip-model-check"]) == 0
+    assert "--adopt" in capsys.readouterr().out
+
+
+def test_adopt_writes_the_lock(lock_file, capsys):
+    assert main(["generate", "characters", "--adopt"]) == 0
+    assert lock_file.exists()
+    capsys.readouterr()
+    assert main(["generate", "characters", "--dry-run", "--skip-model-check"]) == 0
+    assert "--adopt" not in capsys.readouterr().out
@@ -0,0 +1,94 @@
+import pytest
+
+from modelit_assets.preload import ENDING, lookahead, preload_manifest, story_graph
+from modelit_assets.story import STORY_FILE, load_story
+
+STORY = {
+    "chapters": [
+        {
+            "id": 1,
+            "title": "Chapter 1",
+            "image": "images/scenes/ch1.png",
+            "scenes": [
+                {"text": "Hello", "image": "images/scenes/ch1_a.png"},
+                {"text": "Learn", "learning": "A model is a simplification."},
+            ],
+            "choice": {
+                "options": [
+                    {"text": "Wrong", "gameOver": True},
+                    {"text": "Right", "next": 2},
+                ]
+            },
+        },
+        {"id": 2, "title": "Chapter 2", "image": "images/scenes/ch2.png", "scenes": [{"text": "The end"}]},
+    ]
+}
+
+
+def test_graph_follows_the_game_flow():
+    graph = story_graph(STORY)
+
+    edges = {key: node.edges for key, node in graph.items()}
+    assert edges == {
+        ENDING: [],
+        "ch1_scene0": [("ch1_scene1", 1.0)],
+        "ch1_scene1": [("ch1_scene1_learning", 1.0)],
+        "ch1_scene1_learning": [("ch1_choice", 1.0)],
+        "ch1_choice": [("ch1_option0", 0.5), ("ch1_option1", 0.5)],
+        "ch1_option0": [("ch1_scene0", 1.0)],
+        "ch1_option1": [("ch2_scene0", 1.0)],
+        "ch2_scene0": [(ENDING, 1.0)],
+    }
+    assert graph["ch1_scene1"].assets == ["images/scenes/ch1.png", "audio/voice/ch1_scene1.mp3"]
+    assert graph["ch1_scene1_learning"].assets == ["images/scenes/ch1.png", "audio/voice/ch1_learning.mp3"]
+    assert graph["ch1_option0"].assets == ["audio/voice/ch1_gameover1.mp3"]
+    assert graph["ch1_option1"].assets == ["audio/voice/ch1_feedback2.mp3"]
+
+
+def test_lookahead_skips_assets_already_on_screen():
+    found = lookahead(story_graph(STORY), "ch1_scene1", 2)
+
+    # ch1.png is shown by the starting scene, so only the new voice lines are needed.
+    assert found == {"audio/voice/ch1_learning.mp3": (1.0, 1), "audio/voice/ch1_choice.mp3": (1.0, 2)}
+
+
+def test_manifest_orders_by_probability_step_and_size(tmp_path):
+    (tmp_path / "images/scenes").mkdir(parents=True)
+    (tmp_path / "images/scenes/ch1_a.png").write_bytes(b"x" * 300)
+    (tmp_path / "images/scenes/ch2.png").write_bytes(b"x" * 100)
+    mapping = {"chapter2": "images/scenes/ch2.png"}
+
+    manifest = preload_manifest(STORY, depth=4, base_dir=tmp_path, mapping=mapping)
+
+    assert manifest["depth"] == 4
+    assert manifest["nodes"][ENDING] == []
+    assert manifest["nodes"]["ch1_scene1"] == [
+        {"url": "audio/voice/ch1_learning.mp3", "kind": "audio", "probability": 1.0, "step": 1, "bytes": None},
+        {"url": "audio/voice/ch1_choice.mp3", "kind": "audio", "probability": 1.0, "step": 2, "bytes": None},
+        {"url": "audio/voice/ch1_feedback2.mp3", "kind": "audio", "probability": 0.5, "step": 3, "bytes": None},
+        {"url": "audio/voice/ch1_gameover1.mp3", "kind": "audio", "probability": 0.5, "step": 3, "bytes": None},
+        {"url": "audio/voice/ch1_scene0.mp3", "kind": "audio", "probability": 0.5, "step": 4, "bytes": None},
+        {"url": "audio/voice/ch2_scene0.mp3", "kind": "audio", "probability": 0.5, "step": 4, "bytes": None},
+        {
+            "url": "images/scenes/ch2.png",
+            "kind": "image",
+            "probability": 0.5,
+            "step": 4,
+            "bytes": 100,
+            "key": "chapter2",
+        },
+        {"url": "images/scenes/ch1_a.png", "kind": "image", "probability": 0.5, "step": 4, "bytes": 300},
+    ]
+
+
+@pytest.mark.skipif(not STORY_FILE.exists(), reason="needs story-data.js")
+def test_real_story_graph_is_closed():
+    story = load_story()
+    graph = story_graph(story)
+
+    for key, node in graph.items():
+        assert all(target in graph for target, _ in node.edges), key
+        if key != ENDING:
+            assert sum(weight for _, weight in node.edges) == pytest.approx(1.0), key
+    for entries in preload_manifest(story)["nodes"].values():
+        assert all(0 < entry["probability"] <= 1 for entry in entries)
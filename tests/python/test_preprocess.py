@@ -0,0 +1,69 @@
+import io
+
+import pytest
+from PIL import Image
+
+from modelit_assets import preprocess
+from modelit_assets.preprocess import PreprocessOptions, prepare_image
+
+
+@pytest.fixture
+def large_png(tmp_path):
+    path = tmp_path / "ch1_scene1.png"
+    Image.effect_noise((1024, 640), 60).convert("RGB").save(path)
+    return path
+
+
+def decoded(data: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
+
+
+@pytest.mark.parametrize("fmt, mime", [("jpeg", "image/jpeg"), ("webp", "image/webp")])
+def test_longest_edge_is_downscaled_and_reencoded(tmp_path, large_png, fmt, mime):
+    prepared = prepare_image(large_png, PreprocessOptions(max_edge=256, format=fmt), cache_dir=tmp_path / "vision")
+
+    image = decoded(prepared.data)
+    assert image.format == fmt.upper()
+    assert image.size == (256, 160)
+    assert prepared.mime == mime
+    assert prepared.data_url.startswith(f"data:{mime};base64,")
+    assert prepared.saved_bytes == large_png.stat().st_size - len(prepared.data) > 0
+
+
+def test_small_images_are_not_upscaled(tmp_path):
+    path = tmp_path / "small.png"
+    Image.new("RGB", (100, 50), "teal").save(path)
+
+    prepared = prepare_image(path, PreprocessOptions(max_edge=768), cache_dir=tmp_path / "vision")
+
+    assert decoded(prepared.data).size == (100, 50)
+
+
+def test_without_options_the_original_is_sent(tmp_path, large_png):
+    prepared = prepare_image(large_png, None, cache_dir=tmp_path / "vision")
+
+    assert prepared.data == large_png.read_bytes()
+    assert prepared.mime == "image/png"
+    assert prepared.saved_bytes == 0
+    assert not (tmp_path / "vision").exists()
+
+
+def test_repeat_runs_reuse_the_cached_render(tmp_path, large_png, monkeypatch):
+    options = PreprocessOptions(max_edge=256)
+    first = prepare_image(large_png, options, cache_dir=tmp_path / "vision")
+    assert [p.name.split("-", 1)[1] for p in (tmp_path / "vision").iterdir()] == ["256-q80.jpg"]
+
+    def no_render(path, options):
+        raise AssertionError("rendered again")
+
+    monkeypatch.setattr(preprocess, "_render", no_render)
+    assert prepare_image(large_png, options, cache_dir=tmp_path / "vision").data == first.data
+
+    # Other settings, or a changed source, miss the cache.
+    with pytest.raises(AssertionError, match="rendered again"):
+        prepare_image(large_png, PreprocessOptions(max_edge=128), cache_dir=tmp_path / "vision")
+    Image.new("RGB", (1024, 640), "navy").save(large_png)
+    with pytest.raises(AssertionError, match="rendered again"):
+        prepare_image(large_png, options, cache_dir=tmp_path / "vision")
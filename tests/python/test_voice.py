@@ -0,0 +1,118 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from modelit_assets.cli import main
+from modelit_assets.story import VoiceLine, load_story, voice_lines
+from modelit_assets.voice import (
+    MANIFEST_FILE,
+    GoogleTTS,
+    StubTTS,
+    TTSError,
+    load_manifest,
+    plan,
+    record,
+    synthesize_lines,
+    text_hash,
+)
+
+LINES = [
+    VoiceLine("ch1_scene1", 1, "scene", "Dr. Maya checks the readings."),
+    VoiceLine("ch1_scene2", 1, "scene", "The cells glow brighter than before."),
+    VoiceLine("ch1_choice", 1, "choice", "What should Maya test next?"),
+]
+
+
+class QuotaStub(StubTTS):
+    """Fails the line about glowing cells."""
+
+    def synthesize(self, text: str) -> bytes:
+        if "glow" in text:
+            raise TTSError("quota exceeded")
+        return super().synthesize(text)
+
+
+@pytest.fixture(scope="module")
+def first_line():
+    return voice_lines(load_story())[0]
+
+
+def test_voice_refuses_to_overwrite_clips_without_a_manifest(tmp_path, first_line, capsys):
+    clip = tmp_path / f"{first_line.voice_id}.mp3"
+    clip.write_bytes(b"committed clip")
+    with pytest.raises(SystemExit) as exc:
+        main(["voice", "--backend", "stub", "--out", str(tmp_path)])
+    assert "modelit-assets voice --backend stub --adopt" in str(exc.value)
+    assert clip.read_bytes() == b"committed clip"
+
+    assert main(["voice", "--backend", "stub", "--out", str(tmp_path), "--dry-run"]) == 0
+    assert "--adopt" in capsys.readouterr().out
+
+
+def test_adopt_then_synthesize_only_what_changed(tmp_path, first_line, capsys):
+    clip = tmp_path / f"{first_line.voice_id}.mp3"
+    clip.write_bytes(b"committed clip")
+    assert main(["voice", "--backend", "stub", "--out", str(tmp_path), "--adopt"]) == 0
+    manifest = json.loads((tmp_path / MANIFEST_FILE.name).read_text(encoding="utf-8"))
+    assert list(manifest) == [first_line.voice_id]
+
+    only = ["--only", first_line.voice_id]
+    assert main(["voice", "--backend", "stub", "--out", str(tmp_path), *only]) == 0
+    assert clip.read_bytes() == b"committed clip"
+    assert main(["voice", "--backend", "stub", "--out", str(tmp_path), "--force", *only]) == 0
+    assert clip.read_bytes() != b"committed clip"
+    assert "COMPLETE: 1 synthesized" in capsys.readouterr().out
+
+
+def test_synthesize_records_clips_and_skips_current_ones(tmp_path):
+    manifest_file = tmp_path / MANIFEST_FILE.name
+    backend = StubTTS()
+    first = plan(LINES, {}, voice=backend.voice, out_dir=tmp_path)
+    assert [reasons for _, reasons in first.build] == [["missing clip"]] * 3
+
+    pending = [line for line, _ in first.build]
+    report = synthesize_lines(backend, pending, {}, out_dir=tmp_path, manifest_file=manifest_file)
+    assert sorted(report.built) == sorted(line.voice_id for line in LINES) and not report.failed
+    manifest = load_manifest(manifest_file)
+    assert manifest["ch1_scene1"]["text_hash"] == text_hash(LINES[0].text)
+    assert manifest["ch1_scene1"]["voice"] == "stub/silence"
+    assert manifest["ch1_scene1"]["bytes"] == (tmp_path / "ch1_scene1.mp3").stat().st_size
+
+    edited = [LINES[0], VoiceLine("ch1_scene2", 1, "scene", "The cells glow."), LINES[2]]
+    again = plan(edited, manifest, voice=backend.voice, out_dir=tmp_path)
+    assert [(line.voice_id, reasons) for line, reasons in again.build] == [("ch1_scene2", ["text changed"])]
+    assert len(again.current) == 2
+
+    other = plan(LINES, manifest, voice=StubTTS("whisper").voice, out_dir=tmp_path, only={"ch1_choice"})
+    assert [reasons for _, reasons in other.build] == [["voice stub/silence -> stub/whisper"]]
+    (tmp_path / "ch9_scene9.mp3").write_bytes(b"")
+    assert plan(LINES, manifest, voice=backend.voice, out_dir=tmp_path).orphans == ["ch9_scene9"]
+
+
+def test_failed_lines_keep_the_rest_of_the_manifest(tmp_path):
+    manifest_file = tmp_path / MANIFEST_FILE.name
+    report = synthesize_lines(QuotaStub(), LINES, {}, out_dir=tmp_path, manifest_file=manifest_file)
+    assert report.failed == {"ch1_scene2": "quota exceeded"}
+    assert sorted(load_manifest(manifest_file)) == ["ch1_choice", "ch1_scene1"]
+    retry = plan(LINES, load_manifest(manifest_file), voice=StubTTS().voice, out_dir=tmp_path)
+    assert [line.voice_id for line, _ in retry.build] == ["ch1_scene2"]
+
+
+def test_adopted_clips_count_as_current(tmp_path):
+    clip = tmp_path / "ch1_scene1.mp3"
+    clip.write_bytes(StubTTS().synthesize("an existing clip"))
+    manifest = {}
+    stale = plan(LINES[:1], manifest, voice="openai/nova", out_dir=tmp_path)
+    assert stale.build[0][1] == ["no manifest entry"]
+    record(manifest, LINES[0], "openai/nova", clip)
+    assert plan(LINES[:1], manifest, voice="openai/nova", out_dir=tmp_path).current == LINES[:1]
+
+
+def test_google_response_without_audio_is_a_tts_error(monkeypatch):
+    response = SimpleNamespace(status_code=200, text="{}", json=lambda: {})
+    session = SimpleNamespace(post=lambda *args, **kwargs: response)
+    monkeypatch.setenv("GOOGLE_TTS_API_KEY", "test")
+    monkeypatch.setattr("modelit_assets.http.get_session", lambda: session)
+    with pytest.raises(TTSError, match="no audio"):
+        GoogleTTS().synthesize("Hello")
@@ -0,0 +1,15 @@
+"""Compute per-screen prefetch lists from story-data.js.
+
+Same as ``python -m modelit_assets preload``.
+"""
+
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from modelit_assets.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main(["preload", *sys.argv[1:]]))
@@ -1,22 +1,16 @@
-import os
-import requests
+"""List Gemini models from the cached OpenRouter catalog.
 
-API_KEY = os.getenv("OPENROUTER_API_KEY")
+Same as ``python -m modelit_assets models --filter gemini``; pass other
+``models`` options to query by modality, price or context size.
+"""
 
-if not API_KEY:
-    raise SystemExit("OPENROUTER_API_KEY required")
+import sys
+from pathlib import Path
 
-HEADERS = {
-    "Authorization": f"Bearer {API_KEY}",
-    "HTTP-Referer": "https://modelit.local",
-    "X-Title": "ModelIt Image Regeneration",
-}
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
 
-response = requests.get("https://openrouter.ai/api/v1/models", headers=HEADERS, timeout=60)
-response.raise_for_status()
+from modelit_assets.cli import main  # noqa: E402
 
-data = response.json()
-
-for model in data.get("data", []):
-    if "gemini" in model["id"].lower():
-        print(model["id"])
+if __name__ == "__main__":
+    sys.exit(main(["models", "--filter", "gemini", *sys.argv[1:]]))
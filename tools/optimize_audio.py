@@ -0,0 +1,15 @@
+"""Transcode voice clips and music to trimmed, normalized Opus.
+
+Same as ``python -m modelit_assets audio``.
+"""
+
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from modelit_assets.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main(["audio", *sys.argv[1:]]))
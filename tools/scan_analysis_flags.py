@@ -1,19 +1,15 @@
-import json
+"""Print vision-analysis results that mention consistency problems.
+
+Same as ``python -m modelit_assets flags``.
+"""
+
+import sys
 from pathlib import Path
 
-analysis_path = Path("images/scene_analysis.json")
-data = json.loads(analysis_path.read_text(encoding="utf-8"))
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
 
-flags = []
-for entry in data:
-    text = entry["analysis"].lower()
-    if any(word in text for word in ["inconsist", "deviation", "off"]):
-        flags.append(entry)
+from modelit_assets.cli import main  # noqa: E402
 
-print(f"Found {len(flags)} potential consistency notes.")
-for entry in flags:
-    print("\n", entry["image"])
-    lines = entry["analysis"].split("\n")
-    print("  " + lines[0])
-    if len(lines) > 1:
-        print("  " + lines[1])
+if __name__ == "__main__":
+    sys.exit(main(["flags", *sys.argv[1:]]))
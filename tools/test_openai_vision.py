@@ -1,14 +1,17 @@
-import base64
+import sys
 from pathlib import Path
 
-from openai import OpenAI
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-client = OpenAI()
+from modelit_assets.http import openai_client  # noqa: E402
+from modelit_assets.preprocess import PreprocessOptions, prepare_image  # noqa: E402
+
+client = openai_client()
 
 img_path = Path("images/scenes/ch0_scene1_maya_intro.png")
 
-with open(img_path, "rb") as f:
-    encoded = base64.b64encode(f.read()).decode("utf-8")
+prepared = prepare_image(img_path, PreprocessOptions())
+print(f"Sending {len(prepared.data) // 1024} KB (saved {prepared.saved_bytes // 1024} KB)")
 
 prompt = "Describe the main character's appearance and setting."
 
@@ -21,7 +24,7 @@ response = client.responses.create(
                 {"type": "input_text", "text": prompt},
                 {
                     "type": "input_image",
-                    "image_url": f"data:image/png;base64,{encoded}",
+                    "image_url": prepared.data_url,
                 },
             ],
         }